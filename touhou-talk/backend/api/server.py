@@ -130,6 +130,9 @@ class _Deps(TypedDict):
 
     # ★追加：conversation_id(UUID) を user_id+session_key から取得/作成
     get_or_create_conversation_id: Any
+    # conversation_id の確定と直近履歴の取得を 1 文で行う
+    open_session_with_history: Any
+    PoolError: Any
 
     LongTermMemory: Any  # Optional (None if unavailable)
     
@@ -170,6 +173,7 @@ def _get_deps() -> _Deps:
     from memory.session import SessionMemory
     from memory.salience import SalienceEvaluator
     from memory.boundary import BoundaryEvaluator, BoundaryResult
+    from memory.markers import scan as scan_markers
 
     # ---- db
     # server.py は `read_messages` 前提なので、messages_reader.py 側は必ず read_messages を提供している必要がある
@@ -178,6 +182,8 @@ def _get_deps() -> _Deps:
     # ★追加：conversation_id(UUID) の取得/生成（DBに任せる）
     # ここで UUID を Python 側生成しない
     from db.conversation_reader import get_or_create_conversation_id
+    from db.session_reader import open_session_with_history
+    from psycopg2.pool import PoolError
 
     # ---- prompt
     from prompt.builder import PromptBuilder
@@ -226,6 +232,7 @@ def _get_deps() -> _Deps:
         "SalienceEvaluator": SalienceEvaluator,
         "BoundaryEvaluator": BoundaryEvaluator,
         "BoundaryResult": BoundaryResult,
+        "scan_markers": scan_markers,
         "PromptBuilder": PromptBuilder,
         "LLMClient": LLMClient,
         "OutputRepair": OutputRepair,
@@ -236,6 +243,8 @@ def _get_deps() -> _Deps:
 
         # ★追加
         "get_or_create_conversation_id": get_or_create_conversation_id,
+        "open_session_with_history": open_session_with_history,
+        "PoolError": PoolError,
 
         "LongTermMemory": LongTermMemory,
 
@@ -518,14 +527,23 @@ def _load_context_messages_from_db(
     deps: _Deps,
     *,
     conversation_id: str,
-    limit: int = 12
+    limit: int = 12,
+    messages: Optional[List[Dict[str, Any]]] = None,
 ) -> List[Dict[str, str]]:
+    """
+    messages が渡されたら（open_session_with_history で取得済み）それを使い、
+    None のときだけ DB から読み直す。
+    """
     read_messages = deps["read_messages"]
+    PoolError = deps["PoolError"]
 
     try:
-        # messages_reader の引数名は session_id のままでも良いが、
-        # ここで渡す値は UUID(conversation_id) に統一する
-        msgs = read_messages(session_id=conversation_id, limit=limit)
+        if messages is not None:
+            msgs = messages
+        else:
+            # messages_reader の引数名は session_id のままでも良いが、
+            # ここで渡す値は UUID(conversation_id) に統一する
+            msgs = read_messages(session_id=conversation_id, limit=limit)
         if not isinstance(msgs, list):
             return []
 
@@ -547,6 +565,9 @@ def _load_context_messages_from_db(
             out.append({"role": role, "content": content.strip()})
 
         return out
+    except PoolError:
+        # pool 枯渇は履歴なしで黙って続けず、呼び出し側に返す
+        raise
     except Exception as e:
         # DB が落ちても chat 自体は落とさない
         logger.exception("DB context load failed: %s", e)
@@ -590,6 +611,7 @@ def chat(
 
     SalienceEvaluator = deps["SalienceEvaluator"]
     BoundaryEvaluator = deps["BoundaryEvaluator"]
+    scan_markers = deps["scan_markers"]
 
     PromptBuilder = deps["PromptBuilder"]
     LLMClient = deps["LLMClient"]
@@ -612,6 +634,8 @@ def chat(
 
     # ★追加：conversation_id 取得/生成
     get_or_create_conversation_id = deps["get_or_create_conversation_id"]
+    open_session_with_history = deps["open_session_with_history"]
+    PoolError = deps["PoolError"]
 
     # =========================
     # 0. conversation_id(UUID) 確定（DB文脈の唯一キー）
@@ -626,12 +650,27 @@ def chat(
     #   その UUID(conversation_id) を DB 文脈キーとして以後使う
     #
     # ※ session_key の切り方は運用で変えて良いが、ここでは固定 "default" にする
+    #
+    # conversation の確定と直近履歴（8. で使う）を 1 回の round-trip で取る。
+    # 失敗したら従来どおり conversation だけ確定し、履歴は 8. で読み直す
     
-    conversation_id = get_or_create_conversation_id(
-    user_id=user_id,
-    character_id=character_id,
-    session_key="default",
-    )
+    try:
+        conversation_id, session_messages = open_session_with_history(
+            user_id=user_id,
+            character_id=character_id,
+            session_key="default",
+            limit=12,
+        )
+    except PoolError:
+        raise
+    except Exception as e:
+        logger.exception("DB session open failed: %s", e)
+        conversation_id = get_or_create_conversation_id(
+            user_id=user_id,
+            character_id=character_id,
+            session_key="default",
+        )
+        session_messages = None
         # =========================
     # 0.5 UploadFile → AttachmentRef
     # =========================
@@ -801,12 +840,16 @@ def chat(
     # 4. Salience 判定
     # =========================
 
+    # salience / boundary のマーカー語判定は同じ text なので1回だけ走査する
+    marker_hits = scan_markers(text)
+
     salience_eval = _singleton("SalienceEvaluator", lambda: SalienceEvaluator())
     salience = salience_eval.evaluate(
         text,
         role="user",
         intent_kind=getattr(intent, "kind", "chat"),
         is_metaphor=bool(getattr(intent_raw, "is_metaphor", False)),
+        hits=marker_hits,
     )
 
     # =========================
@@ -819,6 +862,7 @@ def chat(
         intent=intent,
         salience=salience,
         user_text=text,
+        hits=marker_hits,
     )
 
     # =========================
@@ -871,6 +915,7 @@ def chat(
         deps,
         conversation_id=conversation_id,
         limit=12,
+        messages=session_messages,
     )
 
     # =========================
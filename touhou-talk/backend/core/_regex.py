@@ -0,0 +1,28 @@
+# persona_core/core/_regex.py
+"""
+_regex.py
+===========================
+optional な google-re2（DFA エンジン）の読み込みを1か所にまとめる。
+
+re2 が無い / 別パッケージ（pyre2 等：RE2::Set を持たない）の場合は
+RE2 = None になり、compile_fast は標準 re で compile する。
+
+re2 で compile してよいパターンの条件（呼び出し側で守ること）：
+- 先読み・後読み・後方参照を使わない（re2 は非対応）
+- \\b など意味が re と異なる構文に頼らない
+- sub の置換は callable か空文字に限る
+  （re2 の sub は非 ASCII の置換文字列を正しく扱えない）
+"""
+
+import re
+
+try:  # optional: google-re2（DFA エンジン。無ければ標準 re で走査する）
+    import re2 as RE2
+    RE2.Set.SearchSet
+except (ImportError, AttributeError):
+    RE2 = None
+
+
+def compile_fast(pattern: str):
+    """re2 があれば re2 で、無ければ標準 re で compile する。"""
+    return (RE2 or re).compile(pattern)
\ No newline at end of file
@@ -73,11 +73,8 @@ class DocumentResult:
         if not self.executed or not self.text:
             return ""
 
-        lines = []
-        lines.append(f"（{self.filename} / {self.filetype}）")
-        lines.append(self.text)
-
-        return "\n".join(lines)
+        # 見出し1行＋本文だけなので、list を作らず1回で組み立てる
+        return f"（{self.filename} / {self.filetype}）\n{self.text}"
 
 
 class DocumentExecutorBase(ABC):
@@ -33,10 +33,24 @@ from typing import Any, Dict, Optional, List
 
 from .base import DocumentExecutorBase
 
-try:
-    from docx import Document
-except Exception:
-    Document = None
+# python-docx は重いので、DOCX が来た時点で初めて import する
+_UNSET = object()
+_document_cls: Any = _UNSET
+
+
+def _get_document_cls() -> Any:
+    """
+    docx.Document を返す（未導入なら None）。
+    import は初回呼び出し時の一度だけ。
+    """
+    global _document_cls
+    if _document_cls is _UNSET:
+        try:
+            from docx import Document
+        except Exception:
+            Document = None
+        _document_cls = Document
+    return _document_cls
 
 
 class DOCXExecutor(DocumentExecutorBase):
@@ -73,6 +87,7 @@ class DOCXExecutor(DocumentExecutorBase):
         7) 長さ制限
         """
 
+        Document = _get_document_cls()
         if Document is None:
             raise RuntimeError(
                 "python-docx is not installed. "
@@ -31,10 +31,24 @@ from typing import Any, Dict, Optional, List
 
 from .base import DocumentExecutorBase
 
-try:
-    from PyPDF2 import PdfReader
-except Exception as e:  # import 時点で落ちるのを防ぐ
-    PdfReader = None
+# PyPDF2 は重いので、PDF が来た時点で初めて import する
+_UNSET = object()
+_pdf_reader_cls: Any = _UNSET
+
+
+def _get_pdf_reader() -> Any:
+    """
+    PyPDF2.PdfReader を返す（未導入なら None）。
+    import は初回呼び出し時の一度だけ。
+    """
+    global _pdf_reader_cls
+    if _pdf_reader_cls is _UNSET:
+        try:
+            from PyPDF2 import PdfReader
+        except Exception:  # import 時点で落ちるのを防ぐ
+            PdfReader = None
+        _pdf_reader_cls = PdfReader
+    return _pdf_reader_cls
 
 
 class PDFExecutor(DocumentExecutorBase):
@@ -69,6 +83,7 @@ class PDFExecutor(DocumentExecutorBase):
         6) 長さ制限
         """
 
+        PdfReader = _get_pdf_reader()
         if PdfReader is None:
             raise RuntimeError(
                 "PyPDF2 is not installed. "
@@ -96,7 +96,7 @@ def execute_vision(
             "filename": meta.filename,
             "ext": meta.ext,
             "size_bytes": meta.size_bytes,
-            "sha256": meta.sha256,
+            "sha256": att.sha256_hex(),
         })
 
     # -------------------------
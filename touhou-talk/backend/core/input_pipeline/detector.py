@@ -18,10 +18,11 @@ InputEnvelope を受け取り、
 
 from __future__ import annotations
 
+import bisect
 import re
 from dataclasses import dataclass
 from enum import Enum
-from typing import List
+from typing import Dict, List, Tuple
 
 from core.input_pipeline.envelope import (
     InputEnvelope,
@@ -70,7 +71,7 @@ class AttachmentRole(str, Enum):
     PRIMARY = "primary"    # 添付が主役
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class DetectionResult:
     """
     detector の最終出力。
@@ -83,67 +84,51 @@ class DetectionResult:
 
 
 # =========================
-# メイン判定関数
+# ルール表（import 時に一度だけ評価）
 # =========================
+#
+# 判定ルールの入力は (添付の有無, テキスト長の区分, URL の有無) だけで
+# 決まるため、全組み合わせを事前に評価して表にしておく。
+# テキスト長の区分境界はルール中の閾値（20 / 50 / 200）と一致させること。
 
-def detect_input(envelope: InputEnvelope) -> DetectionResult:
-    """
-    InputEnvelope から入力の性質を判定する。
-
-    判定はスコアリングではなく、
-    説明可能なルールベースのみを用いる。
-    """
-
-    reasons: List[str] = []
-
-    # -------------------------
-    # 入力タイプの事実ベース推定
-    # -------------------------
-    input_type: InputType = infer_input_type_from_envelope(envelope)
-    reasons.append(f"inferred_input_type={input_type.value}")
-
-    text: str = envelope.text.strip()
-    has_text: bool = bool(text)
-    has_attachments: bool = len(envelope.attachments) > 0
-    text_len: int = len(text)
+_TEXT_LEN_BOUNDS = (20, 50, 200)
 
-    contains_url: bool = _text_contains_url(text)
-    if contains_url:
-        reasons.append("text_contains_url=true")
 
-    # -------------------------
-    # 添付の内訳を把握
-    # -------------------------
-    image_count = 0
-    non_image_count = 0
+def _text_len_bucket(text_len: int) -> int:
+    # 区分 i は _TEXT_LEN_BOUNDS[i-1] <= text_len < _TEXT_LEN_BOUNDS[i]
+    return bisect.bisect_right(_TEXT_LEN_BOUNDS, text_len)
 
-    for att in envelope.attachments:
-        if att.meta.kind == AttachmentKind.image:
-            image_count += 1
-        else:
-            non_image_count += 1
 
-    if image_count:
-        reasons.append(f"image_count={image_count}")
-    if non_image_count:
-        reasons.append(f"file_count={non_image_count}")
+def _apply_rules(
+    *,
+    has_attachments: bool,
+    text_len: int,
+    contains_url: bool,
+) -> Tuple[AttachmentRole, PrimaryMode, bool, float, Tuple[str, ...], Tuple[str, ...]]:
+    """
+    説明可能なルール本体。
+    戻り値: (attachment_role, primary_mode, needs_preprocess, confidence,
+            role_reasons, decision_reasons)
+    """
+    role_reasons: List[str] = []
+    decision_reasons: List[str] = []
 
     # -------------------------
     # 添付の役割判定
     # -------------------------
     if not has_attachments:
         attachment_role = AttachmentRole.NONE
-        reasons.append("attachment_role=none")
+        role_reasons.append("attachment_role=none")
 
     else:
         # テキストがほぼ無い → 添付が主役
-        if not has_text or text_len < 20:
+        if text_len < 20:
             attachment_role = AttachmentRole.PRIMARY
-            reasons.append("attachment_role=primary_due_to_no_text")
+            role_reasons.append("attachment_role=primary_due_to_no_text")
 
         else:
             attachment_role = AttachmentRole.SUPPORT
-            reasons.append("attachment_role=support_with_text")
+            role_reasons.append("attachment_role=support_with_text")
 
     # -------------------------
     # primary_mode 判定
@@ -152,25 +137,23 @@ def detect_input(envelope: InputEnvelope) -> DetectionResult:
     # 1. 添付が主役 → ANALYSIS
     # 2. 添付あり → ANALYSIS
     # 3. テキストのみ → CHAT / TASK
-    if attachment_role == AttachmentRole.PRIMARY:
+    if attachment_role is AttachmentRole.PRIMARY:
         primary_mode = PrimaryMode.ANALYSIS
-        reasons.append("primary_mode=analysis_primary_attachment")
+        decision_reasons.append("primary_mode=analysis_primary_attachment")
 
     elif has_attachments:
         primary_mode = PrimaryMode.ANALYSIS
-        reasons.append("primary_mode=analysis_with_attachments")
+        decision_reasons.append("primary_mode=analysis_with_attachments")
 
     else:
         # テキストのみ
-        reasons.append(f"text_length={text_len}")
-
         if text_len < 200:
             primary_mode = PrimaryMode.CHAT
-            reasons.append("primary_mode=chat_short_text")
+            decision_reasons.append("primary_mode=chat_short_text")
 
         else:
             primary_mode = PrimaryMode.TASK
-            reasons.append("primary_mode=task_long_text")
+            decision_reasons.append("primary_mode=task_long_text")
 
     # -------------------------
     # preprocess 要否判定
@@ -180,16 +163,16 @@ def detect_input(envelope: InputEnvelope) -> DetectionResult:
     # - 例外：短文CHATでも URL が含まれていれば preprocess
     needs_preprocess = False
 
-    if primary_mode == PrimaryMode.ANALYSIS:
+    if primary_mode is PrimaryMode.ANALYSIS:
         needs_preprocess = True
-        reasons.append("needs_preprocess=true_by_analysis")
+        decision_reasons.append("needs_preprocess=true_by_analysis")
 
-    elif primary_mode == PrimaryMode.CHAT and contains_url:
+    elif primary_mode is PrimaryMode.CHAT and contains_url:
         needs_preprocess = True
-        reasons.append("needs_preprocess=true_by_url_in_chat")
+        decision_reasons.append("needs_preprocess=true_by_url_in_chat")
 
     else:
-        reasons.append("needs_preprocess=false")
+        decision_reasons.append("needs_preprocess=false")
 
     # -------------------------
     # confidence 算出
@@ -199,10 +182,101 @@ def detect_input(envelope: InputEnvelope) -> DetectionResult:
     # 短文のみは揺らぎやすい
     if not has_attachments and text_len < 50:
         confidence -= 0.1
-        reasons.append("confidence_down_short_text_only")
+        decision_reasons.append("confidence_down_short_text_only")
 
     confidence = max(0.4, min(confidence, 0.95))
 
+    return (
+        attachment_role,
+        primary_mode,
+        needs_preprocess,
+        confidence,
+        tuple(role_reasons),
+        tuple(decision_reasons),
+    )
+
+
+def _build_decision_table() -> Dict[Tuple[bool, int, bool], tuple]:
+    # 各区分の代表値（区分の下限）でルールを評価する
+    representatives = (0,) + _TEXT_LEN_BOUNDS
+    table: Dict[Tuple[bool, int, bool], tuple] = {}
+    for has_attachments in (False, True):
+        for bucket, text_len in enumerate(representatives):
+            for contains_url in (False, True):
+                table[(has_attachments, bucket, contains_url)] = _apply_rules(
+                    has_attachments=has_attachments,
+                    text_len=text_len,
+                    contains_url=contains_url,
+                )
+    return table
+
+
+_DECISION_TABLE = _build_decision_table()
+
+
+# =========================
+# メイン判定関数
+# =========================
+
+def detect_input(envelope: InputEnvelope) -> DetectionResult:
+    """
+    InputEnvelope から入力の性質を判定する。
+
+    判定はスコアリングではなく、
+    説明可能なルールベースのみを用いる。
+    （ルール本体は _apply_rules、実行時は事前計算した表を引く）
+    """
+
+    reasons: List[str] = []
+
+    # -------------------------
+    # 入力タイプの事実ベース推定
+    # -------------------------
+    input_type: InputType = infer_input_type_from_envelope(envelope)
+    reasons.append(f"inferred_input_type={input_type.value}")
+
+    text: str = envelope.text.strip()
+    has_attachments: bool = len(envelope.attachments) > 0
+    text_len: int = len(text)
+
+    contains_url: bool = _text_contains_url(text)
+    if contains_url:
+        reasons.append("text_contains_url=true")
+
+    # -------------------------
+    # 添付の内訳を把握
+    # -------------------------
+    image_count = 0
+    non_image_count = 0
+
+    for att in envelope.attachments:
+        if att.meta.kind is AttachmentKind.image:
+            image_count += 1
+        else:
+            non_image_count += 1
+
+    if image_count:
+        reasons.append(f"image_count={image_count}")
+    if non_image_count:
+        reasons.append(f"file_count={non_image_count}")
+
+    # -------------------------
+    # 役割 / モード / preprocess / confidence（表引き）
+    # -------------------------
+    (
+        attachment_role,
+        primary_mode,
+        needs_preprocess,
+        confidence,
+        role_reasons,
+        decision_reasons,
+    ) = _DECISION_TABLE[(has_attachments, _text_len_bucket(text_len), contains_url)]
+
+    reasons.extend(role_reasons)
+    if not has_attachments:
+        reasons.append(f"text_length={text_len}")
+    reasons.extend(decision_reasons)
+
     return DetectionResult(
         primary_mode=primary_mode,
         attachment_role=attachment_role,
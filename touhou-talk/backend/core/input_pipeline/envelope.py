@@ -14,13 +14,16 @@ InputEnvelope: API層から渡される入力（text / attachments / recent mess
 
 from __future__ import annotations
 
+import hashlib
+import os
+import re
+import stat
 from dataclasses import dataclass
 from enum import Enum
-from hashlib import sha256
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Literal, Optional, Tuple, Union
 
-from pydantic import BaseModel, Field, ConfigDict, field_validator
+from pydantic import BaseModel, Field, ConfigDict, PrivateAttr, field_validator
 
 
 # =========================
@@ -63,14 +66,22 @@ class InputType(str, Enum):
     MIXED = "mixed"
 
 
-IMAGE_EXTS = {".png", ".jpg", ".jpeg", ".webp"}
-DOC_TEXT_EXTS = {".md", ".txt"}
-DOC_RICH_EXTS = {".pdf", ".docx"}
-SHEET_EXTS = {".xlsx"}
-CODE_EXTS = {".py", ".js", ".ts", ".tsx", ".json", ".yml", ".yaml", ".css", ".scss"}
+IMAGE_EXTS = frozenset({".png", ".jpg", ".jpeg", ".webp"})
+DOC_TEXT_EXTS = frozenset({".md", ".txt"})
+DOC_RICH_EXTS = frozenset({".pdf", ".docx"})
+SHEET_EXTS = frozenset({".xlsx"})
+CODE_EXTS = frozenset({".py", ".js", ".ts", ".tsx", ".json", ".yml", ".yaml", ".css", ".scss"})
 
 SUPPORTED_EXTS = IMAGE_EXTS | DOC_TEXT_EXTS | DOC_RICH_EXTS | SHEET_EXTS | CODE_EXTS
 
+# ext → kind を1回の dict 引きで決めるための表
+_EXT_TO_KIND: Dict[str, AttachmentKind] = {
+    **{e: AttachmentKind.document for e in DOC_TEXT_EXTS | DOC_RICH_EXTS},
+    **{e: AttachmentKind.code for e in CODE_EXTS},
+    **{e: AttachmentKind.spreadsheet for e in SHEET_EXTS},
+    **{e: AttachmentKind.image for e in IMAGE_EXTS},
+}
+
 
 class EnvelopeReliability(str, Enum):
     """
@@ -83,16 +94,7 @@ class EnvelopeReliability(str, Enum):
 
 
 def infer_kind_from_ext(ext: str) -> AttachmentKind:
-    ext = ext.lower()
-    if ext in IMAGE_EXTS:
-        return AttachmentKind.image
-    if ext in SHEET_EXTS:
-        return AttachmentKind.spreadsheet
-    if ext in CODE_EXTS:
-        return AttachmentKind.code
-    if ext in DOC_TEXT_EXTS or ext in DOC_RICH_EXTS:
-        return AttachmentKind.document
-    return AttachmentKind.unknown
+    return _EXT_TO_KIND.get(ext.lower(), AttachmentKind.unknown)
 
 
 def normalize_ext(filename: str) -> str:
@@ -100,17 +102,31 @@ def normalize_ext(filename: str) -> str:
     return p.suffix.lower().strip() if p.suffix else ""
 
 
+_CRLF_RE = re.compile(r"\r\n?")
+
+
 def normalize_text(text: Optional[str], *, max_chars: int) -> str:
     if not text:
         return ""
-    t = text.replace("\r\n", "\n").replace("\r", "\n")
+    # CR を含まない（大半の）入力はコピーせずそのまま使う
+    t = _CRLF_RE.sub("\n", text) if "\r" in text else text
     if len(t) > max_chars:
         t = t[:max_chars]
     return t
 
 
 def sha256_hex(data: bytes) -> str:
-    return sha256(data).hexdigest()
+    return hashlib.sha256(memoryview(data)).hexdigest()
+
+
+def sha256_file_hex(path: str) -> str:
+    with open(path, "rb") as f:
+        if hasattr(hashlib, "file_digest"):  # Python 3.11+
+            return hashlib.file_digest(f, "sha256").hexdigest()
+        h = hashlib.sha256()
+        for chunk in iter(lambda: f.read(256 * 1024), b""):
+            h.update(chunk)
+        return h.hexdigest()
 
 
 # =========================
@@ -156,6 +172,12 @@ class AttachmentRef(BaseModel):
     bytes_data: Optional[bytes] = Field(default=None, repr=False)
     file_path: Optional[str] = Field(default=None)
 
+    # sha256 は必要になった時点で一度だけ計算する
+    _sha256_cache: Optional[str] = PrivateAttr(default=None)
+
+    # os.stat の結果。取得できたときだけ保持する（失敗は毎回取り直す）
+    _stat_cache: Optional[os.stat_result] = PrivateAttr(default=None)
+
     @field_validator("file_path")
     @classmethod
     def _validate_path(cls, v: Optional[str]) -> Optional[str]:
@@ -163,6 +185,21 @@ class AttachmentRef(BaseModel):
             return v
         return str(Path(v))
 
+    def file_stat(self) -> Optional[os.stat_result]:
+        """
+        file_path の os.stat を取得して使い回す。
+        存在しない / 通常ファイルでない場合は None（キャッシュしないので、
+        後から置かれたファイルは次の呼び出しで見える）。
+        """
+        if self._stat_cache is None and self.file_path:
+            try:
+                st = os.stat(self.file_path)
+            except OSError:
+                return None
+            if stat.S_ISREG(st.st_mode):
+                self._stat_cache = st
+        return self._stat_cache
+
     def read_bytes(self, *, max_bytes: int) -> bytes:
         if self.source == AttachmentSource.memory:
             if self.bytes_data is None:
@@ -174,16 +211,35 @@ class AttachmentRef(BaseModel):
         if self.source == AttachmentSource.path:
             if not self.file_path:
                 raise InvalidEnvelopeError("AttachmentRef(path) but file_path is None")
-            p = Path(self.file_path)
-            if not p.exists() or not p.is_file():
+            st = self.file_stat()
+            if st is None:
                 raise InvalidEnvelopeError(f"path not found: {self.file_path}")
-            size = p.stat().st_size
-            if size > max_bytes:
+            if st.st_size > max_bytes:
                 raise AttachmentTooLargeError
-            return p.read_bytes()
+            return Path(self.file_path).read_bytes()
 
         raise InvalidEnvelopeError(f"unknown source: {self.source}")
 
+    def sha256_hex(self) -> Optional[str]:
+        """
+        添付内容の sha256（遅延計算・memoize）。
+        取得できない場合は None。
+        """
+        if self._sha256_cache is not None:
+            return self._sha256_cache
+
+        digest: Optional[str] = None
+        if self.source == AttachmentSource.memory and self.bytes_data is not None:
+            digest = sha256_hex(self.bytes_data)
+        elif self.source == AttachmentSource.path and self.file_path:
+            try:
+                digest = sha256_file_hex(self.file_path)
+            except OSError:
+                digest = None
+
+        self._sha256_cache = digest
+        return digest
+
 
 class AttachmentMeta(BaseModel):
     model_config = ConfigDict(extra="ignore")
@@ -212,6 +268,13 @@ class Attachment(BaseModel):
     meta: AttachmentMeta = Field(...)
     ref: AttachmentRef = Field(...)
 
+    def sha256_hex(self) -> Optional[str]:
+        """
+        meta に確定済みの sha256 があればそれを、
+        無ければ ref から遅延計算した値を返す。
+        """
+        return self.meta.sha256 or self.ref.sha256_hex()
+
 
 class InputEnvelope(BaseModel):
     """
@@ -245,6 +308,12 @@ class EnvelopeBuilder:
         self._limits = limits
         self._policy = policy
 
+        # ext → サイズ上限（それ以外は max_attachment_bytes）
+        self._ext_limits: Dict[str, int] = {
+            **{e: limits.max_image_bytes for e in IMAGE_EXTS},
+            **{e: limits.max_richdoc_bytes for e in DOC_RICH_EXTS | SHEET_EXTS},
+        }
+
     def build(
         self,
         *,
@@ -270,7 +339,7 @@ class EnvelopeBuilder:
                 meta, warn = self._build_attachment_meta(filename=filename, ref=ref)
                 if warn:
                     warnings.append(warn)
-                att_list.append(Attachment(meta=meta, ref=ref))
+                att_list.append(Attachment.model_construct(meta=meta, ref=ref))
 
         # ★信頼度の最終確定（ここが責務）
         if warnings:
@@ -280,7 +349,8 @@ class EnvelopeBuilder:
         else:
             reliability = EnvelopeReliability.MEDIUM
 
-        return InputEnvelope(
+        # 中身はこの builder で正規化済みなので再検証しない
+        return InputEnvelope.model_construct(
             text=t,
             attachments=att_list,
             recent_messages=msgs,
@@ -312,9 +382,9 @@ class EnvelopeBuilder:
         elif ref.source == AttachmentSource.path:
             if not ref.file_path:
                 raise InvalidEnvelopeError
-            p = Path(ref.file_path)
-            if p.exists() and p.is_file():
-                size_bytes = p.stat().st_size
+            st = ref.file_stat()
+            if st is not None:
+                size_bytes = st.st_size
             else:
                 warning = f"path not found at build time: {ref.file_path}"
 
@@ -322,25 +392,19 @@ class EnvelopeBuilder:
         if size_bytes is not None and size_bytes > max_bytes:
             raise AttachmentTooLargeError
 
-        digest: Optional[str] = None
-        if ref.source == AttachmentSource.memory and ref.bytes_data is not None:
-            digest = sha256_hex(ref.bytes_data)
-
-        meta = AttachmentMeta(
-            filename=filename,
+        # sha256 はここでは計算しない（Attachment.sha256_hex() で遅延取得）
+        # ext は normalize_ext 済み、filename はここで sanitize するので
+        # validator を通さずに組み立てる
+        meta = AttachmentMeta.model_construct(
+            filename=Path(filename).name,
             ext=ext,
             kind=kind,
             size_bytes=size_bytes,
-            sha256=digest,
         )
         return meta, warning
 
     def _pick_limit_for(self, *, ext: str, kind: AttachmentKind) -> int:
-        if ext in DOC_RICH_EXTS or ext in SHEET_EXTS:
-            return self._limits.max_richdoc_bytes
-        if ext in IMAGE_EXTS:
-            return self._limits.max_image_bytes
-        return self._limits.max_attachment_bytes
+        return self._ext_limits.get(ext, self._limits.max_attachment_bytes)
 
 
 # =========================
@@ -24,7 +24,7 @@ from dataclasses import dataclass
 from enum import Enum
 from typing import Dict, List
 
-from core.input_pipeline.envelope import InputEnvelope, AttachmentKind
+from core.input_pipeline.envelope import InputEnvelope, AttachmentKind, CODE_EXTS
 from core.input_pipeline.detector import DetectionResult, PrimaryMode
 
 
@@ -40,11 +40,21 @@ class Intent(str, Enum):
     DEBUG = "debug"        # 問題解決・原因特定
 
 
+# スコアの並び順（同点時はこの順で先のものが primary）
+_INTENT_ORDER = (
+    Intent.CHAT,
+    Intent.EXPLAIN,
+    Intent.REVIEW,
+    Intent.DECIDE,
+    Intent.DEBUG,
+)
+
+
 # =========================
 # 出力構造
 # =========================
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class IntentScoreResult:
     scores: Dict[Intent, float]
     primary: Intent
@@ -62,18 +72,15 @@ def score_intent(
 ) -> IntentScoreResult:
     """
     InputEnvelope + DetectionResult を元に intent スコアを算出する。
+
+    スコア計算はローカルの float 5本で行い、
+    dict への格納は最後の一度だけにする。
     """
 
     # -------------------------
-    # 初期スコア
+    # 初期スコア（_INTENT_ORDER と同じ並び）
     # -------------------------
-    scores: Dict[Intent, float] = {
-        Intent.CHAT: 0.0,
-        Intent.EXPLAIN: 0.0,
-        Intent.REVIEW: 0.0,
-        Intent.DECIDE: 0.0,
-        Intent.DEBUG: 0.0,
-    }
+    chat = explain = review = decide = debug = 0.0
 
     reasons: List[str] = []
 
@@ -87,33 +94,35 @@ def score_intent(
     code_like = False
     doc_like = False
 
+    # ※ meta.kind は pydantic が AttachmentKind に、primary_mode は detect_input が
+    #   PrimaryMode に揃えて渡してくるので、ここでは `is` で比較できる
     for att in envelope.attachments:
-        kind = att.meta.kind
-        ext = att.meta.ext
+        meta = att.meta
 
-        if kind == AttachmentKind.image:
+        if meta.kind is AttachmentKind.image:
             image_count += 1
+        elif meta.ext in CODE_EXTS:
+            code_like = True
         else:
-            if ext in (".py", ".js", ".ts", ".tsx", ".json", ".yml", ".yaml", ".css", ".scss"):
-                code_like = True
-            else:
-                doc_like = True
+            doc_like = True
 
     # -------------------------
     # detector 結果によるベース配分
     # -------------------------
-    if detection.primary_mode == PrimaryMode.CHAT:
-        scores[Intent.CHAT] += 0.6
+    primary_mode = detection.primary_mode
+
+    if primary_mode is PrimaryMode.CHAT:
+        chat += 0.6
         reasons.append("primary_mode_chat")
 
-    elif detection.primary_mode == PrimaryMode.ANALYSIS:
-        scores[Intent.EXPLAIN] += 0.4
-        scores[Intent.REVIEW] += 0.4
+    elif primary_mode is PrimaryMode.ANALYSIS:
+        explain += 0.4
+        review += 0.4
         reasons.append("primary_mode_analysis")
 
-    elif detection.primary_mode == PrimaryMode.TASK:
-        scores[Intent.DECIDE] += 0.4
-        scores[Intent.DEBUG] += 0.3
+    elif primary_mode is PrimaryMode.TASK:
+        decide += 0.4
+        debug += 0.3
         reasons.append("primary_mode_task")
 
     # -------------------------
@@ -121,16 +130,16 @@ def score_intent(
     # -------------------------
     if has_text:
         if text_len < 80:
-            scores[Intent.CHAT] += 0.2
+            chat += 0.2
             reasons.append("short_text_bias_chat")
 
         elif text_len < 300:
-            scores[Intent.EXPLAIN] += 0.2
+            explain += 0.2
             reasons.append("medium_text_bias_explain")
 
         else:
-            scores[Intent.REVIEW] += 0.2
-            scores[Intent.DECIDE] += 0.2
+            review += 0.2
+            decide += 0.2
             reasons.append("long_text_bias_review_decide")
 
     # -------------------------
@@ -138,37 +147,52 @@ def score_intent(
     # -------------------------
     if has_attachments:
         if image_count > 0:
-            scores[Intent.EXPLAIN] += 0.25
-            scores[Intent.REVIEW] += 0.25
+            explain += 0.25
+            review += 0.25
             reasons.append("image_present")
 
         if code_like:
-            scores[Intent.DEBUG] += 0.4
-            scores[Intent.REVIEW] += 0.2
+            debug += 0.4
+            review += 0.2
             reasons.append("code_attachment_present")
 
         if doc_like:
-            scores[Intent.EXPLAIN] += 0.3
-            scores[Intent.REVIEW] += 0.3
+            explain += 0.3
+            review += 0.3
             reasons.append("document_attachment_present")
 
     # -------------------------
-    # スコア正規化
+    # スコア正規化（加算のみなので下限は 0.0 のまま）
     # -------------------------
-    for k in scores:
-        scores[k] = max(0.0, min(scores[k], 1.0))
+    values = (
+        min(chat, 1.0),
+        min(explain, 1.0),
+        min(review, 1.0),
+        min(decide, 1.0),
+        min(debug, 1.0),
+    )
+    scores: Dict[Intent, float] = dict(zip(_INTENT_ORDER, values))
 
     # -------------------------
-    # primary intent 決定
+    # primary intent 決定 + confidence 算出（1パス）
     # -------------------------
-    primary = max(scores.items(), key=lambda x: x[1])[0]
+    # 同点の場合は _INTENT_ORDER で先のものを primary とする
+    best_idx = 0
+    top = values[0]
+    second = -1.0
+    for i in range(1, len(values)):
+        v = values[i]
+        if v > top:
+            second = top
+            top = v
+            best_idx = i
+        elif v > second:
+            second = v
+
+    primary = _INTENT_ORDER[best_idx]
     reasons.append(f"primary_intent={primary.value}")
 
-    # -------------------------
-    # confidence 算出
-    # -------------------------
-    sorted_vals = sorted(scores.values(), reverse=True)
-    gap = sorted_vals[0] - sorted_vals[1] if len(sorted_vals) > 1 else sorted_vals[0]
+    gap = top - second
 
     confidence = 0.6 + min(gap, 0.3)
     confidence = max(0.5, min(confidence, 0.9))
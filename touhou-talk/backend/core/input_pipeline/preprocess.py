@@ -17,13 +17,15 @@ input_pipeline における「軽量前処理」層。
 
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 from core.input_pipeline.envelope import (
     InputEnvelope,
     AttachmentKind,
+    AttachmentSource,
 )
 
 from core.input_pipeline.detector import DetectionResult
@@ -31,29 +33,15 @@ from core.executors.documents import execute_document
 
 # ★追加：link 検出（解析はしない）
 
-
-# --- optional deps（存在しない環境でも落とさない） ---
-try:
-    from pdfminer.high_level import extract_text as pdf_extract_text
-except Exception:  # pragma: no cover
-    pdf_extract_text = None
-
-try:
-    import docx  # python-docx
-except Exception:  # pragma: no cover
-    docx = None
-
-try:
-    import openpyxl
-except Exception:  # pragma: no cover
-    openpyxl = None
+# ※ pdf / docx などの重い optional deps は各 document executor 側で
+#   初回利用時に import する（ここでは読み込まない）
 
 
 # =========================
 # 出力構造
 # =========================
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class PreprocessResult:
     """
     preprocess の最終出力。
@@ -61,14 +49,29 @@ class PreprocessResult:
     そのまま使える形にする。
     """
     text_summary: Optional[Dict[str, Any]]
-    attachments_summary: List[Dict[str, Any]]
-    documents_meta: List[Dict[str, Any]]
+    attachments_summary: Sequence[Dict[str, Any]]
+    documents_meta: Sequence[Dict[str, Any]]
 
     # ★追加：検出されたリンク（未解決・未解析）
-    links: List[Dict[str, Any]]
+    links: Sequence[Dict[str, Any]]
 
     skipped: bool
-    reasons: List[str]
+    reasons: Sequence[str]
+
+
+# path 添付の並列読み込みに使う最大スレッド数（EnvelopeLimits.max_attachments 相当）
+_MAX_READ_WORKERS = 5
+
+
+# skip 時の結果は常に同じなので使い回す（中身は tuple で不変）
+_SKIPPED_RESULT = PreprocessResult(
+    text_summary=None,
+    attachments_summary=(),
+    documents_meta=(),
+    links=(),
+    skipped=True,
+    reasons=("detector_decided_skip_preprocess",),
+)
 
 
 # =========================
@@ -85,20 +88,13 @@ def preprocess_input(
     ※ intent は扱わない（score_intent の責務）
     """
 
-    reasons: List[str] = []
-
     # -------------------------
     # preprocess を走らせるか？
     # -------------------------
     if not detection.needs_preprocess:
-        return PreprocessResult(
-            text_summary=None,
-            attachments_summary=[],
-            documents_meta=[],
-            links=[],
-            skipped=True,
-            reasons=["detector_decided_skip_preprocess"],
-        )
+        return _SKIPPED_RESULT
+
+    reasons: List[str] = []
 
     # -------------------------
     # テキスト側の軽量処理
@@ -108,23 +104,27 @@ def preprocess_input(
 
     if envelope.text:
         text = envelope.text
-        lines = text.splitlines()
+
+        # 行数は list を作らずに数える（envelope で改行は \n に正規化済み）
+        line_count = text.count("\n") + (0 if text.endswith("\n") else 1)
+
+        # バッククォート自体が無ければ ``` の探索は不要
+        first_tick = text.find("`")
+        has_code_block = first_tick != -1 and text.find("```", first_tick) != -1
 
         text_summary = {
             "text_length": len(text),
-            "line_count": len(lines),
-            "has_code_block": "```" in text,
+            "line_count": line_count,
+            "has_code_block": has_code_block,
         }
         reasons.append("text_summary_generated")
     # -------------------------
     # 添付の前処理
     # -------------------------
-    attachments_summary: List[Dict[str, Any]] = []
+    filenames, kinds, sizes, refs = _attachments_soa(envelope.attachments)
+    attachments_summary = _preprocess_attachments(filenames, kinds, sizes, refs)
 
-    for att in envelope.attachments:
-        summary = _preprocess_attachment(att)
-        attachments_summary.append(summary)
-        reasons.append(f"processed_attachment:{att.meta.filename}")
+    reasons.extend(f"processed_attachment:{name}" for name in filenames)
 
     # -------------------------
     # documents_meta 抽出
@@ -154,7 +154,56 @@ def preprocess_input(
 # 添付別処理
 # =========================
 
-def _preprocess_attachment(att) -> Dict[str, Any]:
+def _attachments_soa(attachments) -> Tuple[tuple, tuple, tuple, tuple]:
+    """
+    添付列を項目ごとの並列 tuple（filenames, kinds, sizes, refs）に展開する。
+    pydantic モデルの属性アクセスは各添付につきここで一度だけ行う。
+    """
+    if not attachments:
+        return (), (), (), ()
+
+    filenames, kinds, sizes, refs = zip(
+        *[
+            (att.meta.filename, att.meta.kind, att.meta.size_bytes, att.ref)
+            for att in attachments
+        ]
+    )
+    return filenames, kinds, sizes, refs
+
+
+def _preprocess_attachments(
+    filenames: tuple,
+    kinds: tuple,
+    sizes: tuple,
+    refs: tuple,
+) -> List[Dict[str, Any]]:
+    """
+    添付全件の前処理（順序は入力どおり）。
+
+    path 添付が複数ある場合は、ファイル読み込み（blocking I/O）を
+    スレッドで並列に発行し、合計待ち時間を最も遅い1件程度に抑える。
+    """
+    path_reads = sum(
+        1
+        for kind, ref in zip(kinds, refs)
+        if ref.source is AttachmentSource.path
+        and kind is not AttachmentKind.image
+    )
+
+    if path_reads < 2:
+        return list(map(_preprocess_attachment, filenames, kinds, sizes, refs))
+
+    workers = min(len(refs), _MAX_READ_WORKERS)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_preprocess_attachment, filenames, kinds, sizes, refs))
+
+
+def _preprocess_attachment(
+    filename: str,
+    kind: AttachmentKind,
+    size_bytes: Optional[int],
+    ref,
+) -> Dict[str, Any]:
     """
     添付1件分の前処理。
 
@@ -163,20 +212,17 @@ def _preprocess_attachment(att) -> Dict[str, Any]:
     - memory 添付（UploadFile / bytes）
     の両方を正しく扱う
     """
-    meta = att.meta
-    ref = att.ref
-
     base: Dict[str, Any] = {
-        "filename": meta.filename,
-        "kind": meta.kind.value,
-        "size_bytes": meta.size_bytes,
+        "filename": filename,
+        "kind": kind.value,
+        "size_bytes": size_bytes,
         "skipped": False,
     }
 
     # -------------------------
     # IMAGE
     # -------------------------
-    if meta.kind == AttachmentKind.image:
+    if kind is AttachmentKind.image:
         base.update(
             {
                 "image_hint": True,
@@ -192,14 +238,13 @@ def _preprocess_attachment(att) -> Dict[str, Any]:
         data: Optional[bytes] = None
 
         # ===== memory 添付（UploadFile 経由）=====
-        if ref.source == ref.source.memory and ref.bytes_data:
+        if ref.source is AttachmentSource.memory and ref.bytes_data:
             data = ref.bytes_data
 
         # ===== path 添付（filesystem）=====
-        elif ref.source == ref.source.path and ref.file_path:
-            path = Path(ref.file_path)
-            if path.exists():
-                data = path.read_bytes()
+        elif ref.source is AttachmentSource.path and ref.file_path:
+            if ref.file_stat() is not None:
+                data = Path(ref.file_path).read_bytes()
 
         # どちらでも data を取得できなかった場合
         if not data:
@@ -209,7 +254,7 @@ def _preprocess_attachment(att) -> Dict[str, Any]:
 
         # documents executor に委譲
         result = execute_document(
-            filename=meta.filename,
+            filename=filename,
             data=data,
         )
 
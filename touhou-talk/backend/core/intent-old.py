@@ -66,21 +66,26 @@ PAST_PATTERNS = ["この前", "さっき", "昨日", "前に", "以前"]
 FUTURE_PATTERNS = ["これから", "次", "今度", "明日", "そのうち"]
 IF_PATTERNS = ["もし", "仮に", "たら", "なら"]
 
+# 時間軸パターンは全てリテラルなので、軸ごとに1本の alternation にまとめて
+# import 時にコンパイルしておく（優先順：if → past → future）。
+# ※ 全パターンを1本にまとめると「文中で先に出た語」が勝ってしまい
+#    優先順が変わるため、軸単位で分けている。
+_TEMPORAL_AXIS_RES = tuple(
+    (axis, re.compile("|".join(map(re.escape, patterns))))
+    for axis, patterns in (
+        ("if", IF_PATTERNS),
+        ("past", PAST_PATTERNS),
+        ("future", FUTURE_PATTERNS),
+    )
+)
+
 
 def resolve_temporal_axis(text: str) -> TemporalAxis:
     normalized = text.strip().lower()
 
-    for pat in IF_PATTERNS:
-        if re.search(pat, normalized):
-            return "if"
-
-    for pat in PAST_PATTERNS:
-        if re.search(pat, normalized):
-            return "past"
-
-    for pat in FUTURE_PATTERNS:
-        if re.search(pat, normalized):
-            return "future"
+    for axis, pattern in _TEMPORAL_AXIS_RES:
+        if pattern.search(normalized):
+            return axis  # type: ignore[return-value]
 
     if normalized:
         return "present"
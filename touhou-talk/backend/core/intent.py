@@ -8,19 +8,23 @@ intent.py
 LLMに渡す前段階の「雑音除去」と「事故防止」。
 """
 
-from dataclasses import dataclass
-from typing import Literal
+from functools import lru_cache
+from typing import Callable, Iterable, List, Literal, NamedTuple, Optional
 import re
 
+from core._regex import RE2
+
 
 # =========================
 # Intent（内部表現）
 # =========================
 
-@dataclass(frozen=True)
-class Intent:
+class Intent(NamedTuple):
     """
     生の入力解析結果（事実）。
+
+    ※ 毎ターン生成されるので NamedTuple（C 実装の tuple・不変）にしている。
+      値の差し替えは dataclasses.replace ではなく intent._replace(...) を使う。
     """
 
     is_emotional: bool = False   # 感情的な発言か
@@ -54,12 +58,67 @@ TemporalAxis = Literal[
 ]
 
 
-@dataclass(frozen=True)
-class IntentResult:
+class IntentResult(NamedTuple):
     kind: IntentKind
     temporal_axis: TemporalAxis
 
 
+# =========================
+# パターン走査ヘルパ
+# =========================
+
+def _compile_literals(patterns) -> "re.Pattern[str]":
+    """リテラル語の集合を1本の alternation としてコンパイルする。"""
+    return re.compile("|".join(map(re.escape, patterns)))
+
+
+def _literal_patterns(patterns) -> list:
+    """末尾アンカー付き（$ 終わり）のパターンを除いたリテラル語だけを返す。"""
+    return [p for p in patterns if not p.endswith("$")]
+
+
+def _compile_group_scanner(groups) -> Callable[[str], Iterable[str]]:
+    """
+    (グループ名, 語リスト) の並びから、テキスト中に現れたグループ名を返す走査関数を作る。
+
+    重なり合う語（例：「しんどう」の「しんど」と「どう」）も取りこぼさないこと。
+    返すグループ名の順序・重複は保証しない（呼び出し側は集合として扱う）。
+    """
+    if RE2 is not None:
+        return _compile_re2_set_scanner(groups)
+
+    # 標準 re：全体を先読み (?=...) で包むので、マッチは幅0になり全位置で判定される
+    body = "|".join(
+        f"(?P<{name}>{'|'.join(map(re.escape, patterns))})"
+        for name, patterns in groups
+    )
+    pattern = re.compile(f"(?=(?:{body}))")
+
+    def scan(text: str) -> Iterable[str]:
+        return (m.lastgroup for m in pattern.finditer(text))
+
+    return scan
+
+
+def _compile_re2_set_scanner(groups) -> Callable[[str], Iterable[str]]:
+    """
+    google-re2 の RE2::Set で、全グループを DFA 1回の走査で判定する。
+
+    ※ RE2 は先読みを持たないため finditer では重なり語を拾えない。
+      Set.Match は「どのパターンが1回でも当たったか」を返すのでその代わりになる。
+    """
+    names = tuple(name for name, _ in groups)
+    pattern_set = RE2.Set.SearchSet()
+    for _, patterns in groups:
+        pattern_set.Add("|".join(map(re.escape, patterns)))
+    pattern_set.Compile()
+
+    def scan(text: str) -> Iterable[str]:
+        return [names[i] for i in pattern_set.Match(text)]
+
+    return scan
+
+
 # =========================
 # Temporal Axis Resolver
 # =========================
@@ -68,21 +127,41 @@ PAST_PATTERNS = ["この前", "さっき", "昨日", "前に", "以前"]
 FUTURE_PATTERNS = ["これから", "次", "今度", "明日", "そのうち"]
 IF_PATTERNS = ["もし", "仮に", "たら", "なら"]
 
+_TEMPORAL_SCANNER = _compile_group_scanner(
+    (
+        ("if", IF_PATTERNS),
+        ("past", PAST_PATTERNS),
+        ("future", FUTURE_PATTERNS),
+    )
+)
 
-def resolve_temporal_axis(text: str) -> TemporalAxis:
-    normalized = text.strip().lower()
 
-    for pat in IF_PATTERNS:
-        if re.search(pat, normalized):
+def resolve_temporal_axis(
+    text: str,
+    *,
+    normalized: Optional[str] = None,
+) -> TemporalAxis:
+    """
+    normalized（text.strip() 済み）を渡せば正規化を省略する。
+    """
+    if normalized is None:
+        normalized = text.strip()
+    return _temporal_axis_normalized(normalized)
+
+
+@lru_cache(maxsize=512)
+def _temporal_axis_normalized(normalized: str) -> TemporalAxis:
+    # 1回の走査で全軸を拾い、優先順（if → past → future）で決める。
+    # ※ 文中の出現順ではない点に注意
+    found: Optional[str] = None
+    for axis in _TEMPORAL_SCANNER(normalized):
+        if axis == "if":
             return "if"
+        if found is None or axis == "past":
+            found = axis
 
-    for pat in PAST_PATTERNS:
-        if re.search(pat, normalized):
-            return "past"
-
-    for pat in FUTURE_PATTERNS:
-        if re.search(pat, normalized):
-            return "future"
+    if found is not None:
+        return found  # type: ignore[return-value]
 
     if normalized:
         return "present"
@@ -113,38 +192,33 @@ TOPIC_SHIFT_HINTS = [
     "ちなみにだけど",
 ]
 
+_CONSULTATION_RE = _compile_literals(CONSULTATION_HINTS)
 
-def resolve_intent(intent: Intent, *, text: str) -> IntentResult:
-    normalized = text.strip().lower()
-    temporal_axis = resolve_temporal_axis(text)
-
-    # 0) ★ 文脈切替（最優先・内容は見ない）
-    if intent.is_topic_shift:
-        return IntentResult("topic_shift", temporal_axis)
-
-    # 1) 比喩
-    if intent.is_metaphor:
-        return IntentResult("metaphor", temporal_axis)
 
-    # 2) 感情（相談）
-    if intent.is_emotional:
-        return IntentResult("consultation", temporal_axis)
+# 優先順位の梯子（上ほど優先）。(Intent のフラグ属性, kind) の並び。
+# フラグ属性が None の段は「相談ヒント語」がテキストに含まれるかで判定する。
+_KIND_LADDER = (
+    ("is_topic_shift", "topic_shift"),  # 0) ★ 文脈切替（最優先・内容は見ない）
+    ("is_metaphor", "metaphor"),        # 1) 比喩
+    ("is_emotional", "consultation"),   # 2) 感情（相談）
+    (None, "consultation"),             #    相談ヒント語
+    ("is_task", "task"),                # 3) 作業・評価・解析
+    ("is_question", "question"),        # 4) 質問
+    ("is_casual", "smalltalk"),         # 5) 雑談
+)
 
-    for pat in CONSULTATION_HINTS:
-        if re.search(pat, normalized):
-            return IntentResult("consultation", temporal_axis)
 
-    # 3) 作業・評価・解析
-    if intent.is_task:
-        return IntentResult("task", temporal_axis)
-
-    # 4) 質問
-    if intent.is_question:
-        return IntentResult("question", temporal_axis)
+def resolve_intent(intent: Intent, *, text: str) -> IntentResult:
+    normalized = text.strip()
+    temporal_axis = resolve_temporal_axis(text, normalized=normalized)
 
-    # 5) 雑談
-    if intent.is_casual:
-        return IntentResult("smalltalk", temporal_axis)
+    for flag, kind in _KIND_LADDER:
+        if flag is None:
+            hit = _CONSULTATION_RE.search(normalized) is not None
+        else:
+            hit = getattr(intent, flag)
+        if hit:
+            return IntentResult(kind, temporal_axis)
 
     # 6) 通常会話
     return IntentResult("chat", temporal_axis)
@@ -200,80 +274,106 @@ class IntentParser:
 
     @classmethod
     def parse(cls, text: str) -> Intent:
-        normalized = text.strip().lower()
-        intent = Intent()
-
-        # ★ 文脈切替（最優先・他と独立）
-        for pat in cls.TOPIC_SHIFT_PATTERNS:
-            if re.search(pat, normalized):
-                intent = Intent(
-                    is_emotional=intent.is_emotional,
-                    is_metaphor=intent.is_metaphor,
-                    is_question=intent.is_question,
-                    is_casual=intent.is_casual,
-                    is_task=intent.is_task,
-                    is_topic_shift=True,
-                )
-                break
-
-        for pat in cls.EMOTIONAL_PATTERNS:
-            if re.search(pat, normalized):
-                intent = Intent(
-                    is_emotional=True,
-                    is_metaphor=intent.is_metaphor,
-                    is_question=intent.is_question,
-                    is_casual=intent.is_casual,
-                    is_task=intent.is_task,
-                    is_topic_shift=intent.is_topic_shift,
-                )
-                break
-
-        for pat in cls.METAPHOR_HINTS:
-            if re.search(pat, normalized):
-                intent = Intent(
-                    is_emotional=intent.is_emotional,
-                    is_metaphor=True,
-                    is_question=intent.is_question,
-                    is_casual=intent.is_casual,
-                    is_task=intent.is_task,
-                    is_topic_shift=intent.is_topic_shift,
-                )
-                break
-
-        for pat in cls.TASK_PATTERNS:
-            if re.search(pat, normalized):
-                intent = Intent(
-                    is_emotional=intent.is_emotional,
-                    is_metaphor=intent.is_metaphor,
-                    is_question=intent.is_question,
-                    is_casual=intent.is_casual,
-                    is_task=True,
-                    is_topic_shift=intent.is_topic_shift,
-                )
-                break
-
-        for pat in cls.QUESTION_PATTERNS:
-            if re.search(pat, normalized):
-                intent = Intent(
-                    is_emotional=intent.is_emotional,
-                    is_metaphor=intent.is_metaphor,
-                    is_question=True,
-                    is_casual=intent.is_casual,
-                    is_task=intent.is_task,
-                    is_topic_shift=intent.is_topic_shift,
-                )
-                break
-
-        for pat in cls.CASUAL_PATTERNS:
-            if re.search(pat, normalized):
-                intent = Intent(
-                    is_emotional=intent.is_emotional,
-                    is_metaphor=intent.is_metaphor,
-                    is_question=intent.is_question,
-                    is_casual=True,
-                    is_task=intent.is_task,
-                    is_topic_shift=intent.is_topic_shift,
-                )
-                break
-
-        return intent
\ No newline at end of file
+        # ※ パターンは日本語 / 小文字のみなので lower() は不要
+        #   （大文字が関係するのは末尾 "w" だけで、そこは "W" も見る）
+        return _parse_normalized(text.strip())
+
+    @classmethod
+    def parse_many(cls, texts: Iterable[str]) -> List[Intent]:
+        """
+        複数の発話（会話の再分類・policy の一括再評価など）をまとめて解析する。
+
+        結果は parse を1件ずつ呼んだ場合と同じ。
+        ※ 一括処理は同じ発話の再解析が少ないので parse の cache は通さない
+          （cache を一括処理の発話で押し流さないため）
+        """
+        normalized = [text.strip() for text in texts]
+        flags = [_scan_flags(n) for n in normalized]
+        return [_INTENT_BY_FLAGS[f] for f in flags]
+
+
+# 同じ発話の再解析（リトライ・再描画・policy 再判定など）は cache から返す
+@lru_cache(maxsize=512)
+def _parse_normalized(normalized: str) -> Intent:
+    """正規化済みテキストから Intent を組み立てる（parse の本体）。"""
+    return _INTENT_BY_FLAGS[_scan_flags(normalized)]
+
+
+def _scan_flags(normalized: str) -> int:
+    """正規化済みテキストを走査し、立ったフラグを bit の和で返す。"""
+    # リテラル語は全グループまとめて1回の走査で拾い、bit で積む
+    # ※ topic_shift / metaphor で打ち切らないこと：intent_raw の各フラグは
+    #   resolve_intent 以外（state / policy）も直接読む
+    flags = 0
+    for group in _INTENT_SCANNER(normalized):
+        flags |= _GROUP_BITS[group]
+        if flags == _ALL_GROUP_BITS:
+            # 全グループが当たったら残りを走査しても結果は変わらない
+            break
+
+    # 末尾アンカー（r"\?$" / r"？$" / r"w$"）は文字列判定で足りる
+    if normalized.endswith(("?", "？")):
+        flags |= _QUESTION_BIT
+    if normalized.endswith(("w", "W")):
+        flags |= _CASUAL_BIT
+
+    return flags
+
+
+def _intent_from_flags(flags: int) -> Intent:
+    return Intent(
+        is_emotional=bool(flags & _EMOTIONAL_BIT),
+        is_metaphor=bool(flags & _METAPHOR_BIT),
+        is_question=bool(flags & _QUESTION_BIT),
+        is_casual=bool(flags & _CASUAL_BIT),
+        is_task=bool(flags & _TASK_BIT),
+        is_topic_shift=bool(flags & _TOPIC_SHIFT_BIT),
+    )
+
+
+# フラグが1つも立たないときの共有インスタンス（NamedTuple なので不変）
+_EMPTY_INTENT = Intent()
+
+# parse 内部で使うフラグ bit
+_TOPIC_SHIFT_BIT = 1 << 0
+_EMOTIONAL_BIT = 1 << 1
+_METAPHOR_BIT = 1 << 2
+_TASK_BIT = 1 << 3
+_QUESTION_BIT = 1 << 4
+_CASUAL_BIT = 1 << 5
+
+_GROUP_BITS = {
+    "topic_shift": _TOPIC_SHIFT_BIT,
+    "emotional": _EMOTIONAL_BIT,
+    "metaphor": _METAPHOR_BIT,
+    "task": _TASK_BIT,
+    "question": _QUESTION_BIT,
+    "casual": _CASUAL_BIT,
+}
+
+# フラグの全組み合わせ（2^6 通り）の Intent を先に作っておき、bit の和で引く
+# （NamedTuple なので共有してよい。何も立たない発話は _EMPTY_INTENT になる）
+_INTENT_BY_FLAGS = (_EMPTY_INTENT,) + tuple(
+    _intent_from_flags(flags) for flags in range(1, 1 << len(_GROUP_BITS))
+)
+
+_ALL_GROUP_BITS = (
+    _TOPIC_SHIFT_BIT
+    | _EMOTIONAL_BIT
+    | _METAPHOR_BIT
+    | _TASK_BIT
+    | _QUESTION_BIT
+    | _CASUAL_BIT
+)
+
+
+_INTENT_SCANNER = _compile_group_scanner(
+    (
+        ("topic_shift", IntentParser.TOPIC_SHIFT_PATTERNS),
+        ("emotional", IntentParser.EMOTIONAL_PATTERNS),
+        ("metaphor", IntentParser.METAPHOR_HINTS),
+        ("task", IntentParser.TASK_PATTERNS),
+        ("question", _literal_patterns(IntentParser.QUESTION_PATTERNS)),
+        ("casual", _literal_patterns(IntentParser.CASUAL_PATTERNS)),
+    )
+)
\ No newline at end of file
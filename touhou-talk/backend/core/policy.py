@@ -10,8 +10,8 @@ Intent とキャラ定義を元に、
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Any, Literal, Optional
+from functools import lru_cache
+from typing import Any, Literal, NamedTuple, Optional
 
 from .intent import Intent
 
@@ -41,6 +41,9 @@ TemporalAxis = Literal[
     "unknown",
 ]
 
+# temporal_axis として受け付ける値（membership は hash 1回で済ませる）
+_VALID_AXES = frozenset(("past", "present", "future", "if", "unknown"))
+
 
 def _extract_temporal_axis(intent_like: Any) -> TemporalAxis:
     """
@@ -53,7 +56,7 @@ def _extract_temporal_axis(intent_like: Any) -> TemporalAxis:
        ただ属性があれば拾うだけ。
     """
     axis = getattr(intent_like, "temporal_axis", None)
-    if axis in ("past", "present", "future", "if", "unknown"):
+    if axis in _VALID_AXES:
         return axis  # type: ignore[return-value]
     return "unknown"
 
@@ -62,8 +65,7 @@ def _extract_temporal_axis(intent_like: Any) -> TemporalAxis:
 # PolicyDecision（行動制御）
 # =========================
 
-@dataclass(frozen=True)
-class PolicyDecision:
+class PolicyDecision(NamedTuple):
     """
     LLM に渡す前の「行動制御判断」。
 
@@ -75,6 +77,7 @@ class PolicyDecision:
     NOTE:
     - allow_explanation は PromptBuilder 側が getattr で参照する前提のため
       追加しても互換性を壊さない（むしろ明示化できる）。
+    - 毎ターン生成されるので NamedTuple（不変・軽量）にしている。
     """
     mode: PolicyMode
     allow_questions: bool
@@ -89,8 +92,7 @@ class PolicyDecision:
 # PolicyResult（禁止ルール / builder 用）
 # =========================
 
-@dataclass(frozen=True)
-class PolicyResult:
+class PolicyResult(NamedTuple):
     """
     PromptBuilder に渡すための
     「絶対に破ってはいけない制約」。
@@ -124,6 +126,123 @@ CHARACTER_POLICY_PROFILE = {
 }
 
 
+class PolicyProfile(NamedTuple):
+    """decide 内で使う性格係数（float 変換済み）。"""
+    care_tolerance: float
+    advice_tolerance: float
+    talkativeness: float
+
+
+# 未登録キャラ用の安全デフォルト
+_DEFAULT_PROFILE = PolicyProfile(0.2, 0.2, 0.4)
+
+
+def _build_profile(profile: dict) -> PolicyProfile:
+    return PolicyProfile(
+        float(profile.get("care_tolerance", _DEFAULT_PROFILE.care_tolerance)),
+        float(profile.get("advice_tolerance", _DEFAULT_PROFILE.advice_tolerance)),
+        float(profile.get("talkativeness", _DEFAULT_PROFILE.talkativeness)),
+    )
+
+
+# import 時に一度だけ展開しておく（decide では dict 1回引くだけ）
+_PROFILES = {
+    character_id: _build_profile(profile)
+    for character_id, profile in CHARACTER_POLICY_PROFILE.items()
+}
+
+
+# =========================
+# 判定テーブル
+# =========================
+
+# 許可の閾値：キャラ係数がこれを「超えたら」許可する
+_ALWAYS = float("-inf")
+_NEVER = float("inf")
+
+
+class _PolicyRule(NamedTuple):
+    """
+    (時間軸, フラグ) ごとの判定結果（キャラ係数を掛ける前）。
+
+    questions_above : care_tolerance がこれを超えたら allow_questions
+    advice_above    : advice_tolerance がこれを超えたら allow_advice
+    length_base     : max_response_length = max(60, int(length_base * talkativeness))
+    """
+    mode: PolicyMode
+    questions_above: float
+    advice_above: float
+    length_base: int
+
+
+def _policy_rule(
+    axis: TemporalAxis,
+    is_emotional: bool,
+    is_metaphor: bool,
+    is_question: bool,
+    is_casual: bool,
+) -> _PolicyRule:
+    """
+    判定ロジック本体。import 時に全組み合わせを1回ずつ評価して
+    _POLICY_TABLE に展開する（decide からは直接呼ばない）。
+    """
+
+    # -------------------------
+    # 時間軸ブレーキ（最優先）
+    # -------------------------
+    if axis == "if":
+        if is_emotional or is_metaphor:
+            return _PolicyRule("CARE_STRICT", _NEVER, _NEVER, 150)
+
+        return _PolicyRule(
+            "ANSWER_ONLY" if is_question else "CHAT", _NEVER, _NEVER, 180
+        )
+
+    if axis == "future":
+        if is_emotional and is_metaphor:
+            return _PolicyRule("CARE_STRICT", _NEVER, _NEVER, 160)
+
+        if is_emotional:
+            return _PolicyRule("CARE_LIGHT", 0.25, _NEVER, 210)
+
+        if is_question:
+            return _PolicyRule("ANSWER_ONLY", _NEVER, _NEVER, 220)
+
+        if is_casual:
+            return _PolicyRule("CHAT", _ALWAYS, _NEVER, 240)
+
+        return _PolicyRule("CHAT", _ALWAYS, _NEVER, 210)
+
+    # -------------------------
+    # 既存ロジック（present / past / unknown）
+    # -------------------------
+
+    if is_emotional and is_metaphor:
+        return _PolicyRule("CARE_STRICT", _NEVER, _NEVER, 160)
+
+    if is_emotional:
+        return _PolicyRule("CARE_LIGHT", 0.25, 0.3, 220)
+
+    if is_question:
+        return _PolicyRule("ANSWER_ONLY", _NEVER, _NEVER, 240)
+
+    if is_casual:
+        return _PolicyRule("CHAT", _ALWAYS, _NEVER, 260)
+
+    return _PolicyRule("CHAT", _ALWAYS, 0.35, 240)
+
+
+# (axis, is_emotional, is_metaphor, is_question, is_casual) → _PolicyRule
+_POLICY_TABLE = {
+    (axis, e, m, q, c): _policy_rule(axis, e, m, q, c)
+    for axis in _VALID_AXES
+    for e in (False, True)
+    for m in (False, True)
+    for q in (False, True)
+    for c in (False, True)
+}
+
+
 # =========================
 # Policy Engine
 # =========================
@@ -148,133 +267,54 @@ class PolicyEngine:
         """
         Intent + キャラ性格から
         「今どう振る舞うか」を決定する。
-        """
 
-        # -------------------------
-        # キャラプロファイル（安全デフォルト）
-        # -------------------------
-        profile = CHARACTER_POLICY_PROFILE.get(character_id)
-        if profile is None:
-            profile = {
-                "care_tolerance": 0.2,
-                "advice_tolerance": 0.2,
-                "talkativeness": 0.4,
-            }
-
-        care_tol = float(profile.get("care_tolerance", 0.2))
-        advice_tol = float(profile.get("advice_tolerance", 0.2))
-        talk = float(profile.get("talkativeness", 0.4))
+        結果は (キャラ, 時間軸, 判定に使うフラグ) だけで決まる純関数なので、
+        本体は _decide_flags に寄せて LRU cache から返す。
+        """
 
         # -------------------------
         # temporal_axis 決定
         # -------------------------
-        if temporal_axis in ("past", "present", "future", "if", "unknown"):
+        if temporal_axis in _VALID_AXES:
             axis: TemporalAxis = temporal_axis
         else:
             axis = _extract_temporal_axis(intent)
 
-        # -------------------------
-        # 時間軸ブレーキ（最優先）
-        # -------------------------
-        if axis == "if":
-            if intent.is_emotional or intent.is_metaphor:
-                return PolicyDecision(
-                    mode="CARE_STRICT",
-                    allow_questions=False,
-                    allow_advice=False,
-                    max_response_length=max(60, int(150 * talk)),
-                )
-
-            return PolicyDecision(
-                mode="ANSWER_ONLY" if intent.is_question else "CHAT",
-                allow_questions=False,
-                allow_advice=False,
-                max_response_length=max(60, int(180 * talk)),
-            )
-
-        if axis == "future":
-            future_max = max(60, int(210 * talk))
-
-            if intent.is_emotional and intent.is_metaphor:
-                return PolicyDecision(
-                    mode="CARE_STRICT",
-                    allow_questions=False,
-                    allow_advice=False,
-                    max_response_length=max(60, int(160 * talk)),
-                )
-
-            if intent.is_emotional:
-                return PolicyDecision(
-                    mode="CARE_LIGHT",
-                    allow_questions=care_tol > 0.25,
-                    allow_advice=False,
-                    max_response_length=future_max,
-                )
-
-            if intent.is_question:
-                return PolicyDecision(
-                    mode="ANSWER_ONLY",
-                    allow_questions=False,
-                    allow_advice=False,
-                    max_response_length=max(60, int(220 * talk)),
-                )
-
-            if intent.is_casual:
-                return PolicyDecision(
-                    mode="CHAT",
-                    allow_questions=True,
-                    allow_advice=False,
-                    max_response_length=max(60, int(240 * talk)),
-                )
-
-            return PolicyDecision(
-                mode="CHAT",
-                allow_questions=True,
-                allow_advice=False,
-                max_response_length=future_max,
-            )
+        # ※ boundary_level は現状の判定に使っていないため cache キーにも含めない
+        return cls._decide_flags(
+            character_id,
+            axis,
+            bool(intent.is_emotional),
+            bool(intent.is_metaphor),
+            bool(intent.is_question),
+            bool(intent.is_casual),
+        )
 
-        # -------------------------
-        # 既存ロジック（present / past / unknown）
-        # -------------------------
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _decide_flags(
+        character_id: str,
+        axis: TemporalAxis,
+        is_emotional: bool,
+        is_metaphor: bool,
+        is_question: bool,
+        is_casual: bool,
+    ) -> PolicyDecision:
+        """
+        decide の本体。
+
+        ※ CHARACTER_POLICY_PROFILE を実行中に書き換えた場合は
+          _PROFILES を作り直し、PolicyEngine._decide_flags.cache_clear() を呼ぶこと。
+        """
 
-        if intent.is_emotional and intent.is_metaphor:
-            return PolicyDecision(
-                mode="CARE_STRICT",
-                allow_questions=False,
-                allow_advice=False,
-                max_response_length=max(60, int(160 * talk)),
-            )
-
-        if intent.is_emotional:
-            return PolicyDecision(
-                mode="CARE_LIGHT",
-                allow_questions=care_tol > 0.25,
-                allow_advice=advice_tol > 0.3,
-                max_response_length=max(60, int(220 * talk)),
-            )
-
-        if intent.is_question:
-            return PolicyDecision(
-                mode="ANSWER_ONLY",
-                allow_questions=False,
-                allow_advice=False,
-                max_response_length=max(60, int(240 * talk)),
-            )
-
-        if intent.is_casual:
-            return PolicyDecision(
-                mode="CHAT",
-                allow_questions=True,
-                allow_advice=False,
-                max_response_length=max(60, int(260 * talk)),
-            )
+        care_tol, advice_tol, talk = _PROFILES.get(character_id, _DEFAULT_PROFILE)
+        rule = _POLICY_TABLE[(axis, is_emotional, is_metaphor, is_question, is_casual)]
 
         return PolicyDecision(
-            mode="CHAT",
-            allow_questions=True,
-            allow_advice=advice_tol > 0.35,
-            max_response_length=max(60, int(240 * talk)),
+            mode=rule.mode,
+            allow_questions=care_tol > rule.questions_above,
+            allow_advice=advice_tol > rule.advice_above,
+            max_response_length=max(60, int(rule.length_base * talk)),
         )
 
     @staticmethod
@@ -282,5 +322,10 @@ class PolicyEngine:
         """
         PromptBuilder 用の
         静的ポリシー制約を返す。
+
+        ※ 中身は常に既定値なので、不変の共有インスタンスを返す
         """
-        return PolicyResult()
\ No newline at end of file
+        return _DEFAULT_POLICY_RESULT
+
+
+_DEFAULT_POLICY_RESULT = PolicyResult()
\ No newline at end of file
@@ -6,6 +6,7 @@ Supabase Postgres への接続を一元管理するモジュール。
 責務：
 - DATABASE_URL を唯一の情報源として使用
 - psycopg2 による Postgres 直結
+- connection は ThreadedConnectionPool で使い回す（毎回の TCP/TLS・認証を避ける）
 - cursor / connection の生成をここに集約
 - 他モジュールに SQL を書かせても、接続方法は変えさせない
 
@@ -13,14 +14,26 @@ Supabase Postgres への接続を一元管理するモジュール。
 - Supabase client は使わない
 - RLS / API Key は一切関与しない
 - 「DB直結」専用
+
+外部プーラ（PgBouncer / Supavisor の transaction mode）：
+- DATABASE_URL をプーラ（Supabase なら :6543）に向ければ、
+  少数の backend をアプリ側 pool 越しに共有できる
+- そのため接続に session 状態（SET / LISTEN / advisory lock / server-side
+  prepared statement 等）を持たせないこと。1トランザクションで完結させる
 """
 
 from __future__ import annotations
 
+import atexit
 import os
+import re
+import threading
 import psycopg2
+from psycopg2.extensions import connection as _PgConnection
 from psycopg2.extras import RealDictCursor
-from typing import Generator, Optional
+from psycopg2.pool import PoolError, ThreadedConnectionPool
+from functools import lru_cache
+from typing import Any, Dict, Generator, Optional, Tuple
 from contextlib import contextmanager
 
 
@@ -36,23 +49,125 @@ if not DATABASE_URL:
         "Supabase Dashboard → Settings → Database → Connection string (URI) を確認してください。"
     )
 
+# 読み取り専用の接続先（hot standby / 読み取り用プーラ）。任意。
+# 例：...?target_session_attrs=prefer-standby
+# 未設定なら読み取りも DATABASE_URL の pool を使う
+DATABASE_READ_URL: Optional[str] = os.getenv("DATABASE_READ_URL") or None
+
+# pool が常に保持する connection 数 / 同時に保持する connection の上限
+DB_POOL_MIN: int = int(os.getenv("DB_POOL_MIN", "1"))
+DB_POOL_MAX: int = int(os.getenv("DB_POOL_MAX", "10"))
+
+# 読み取り用 pool の上限（DATABASE_READ_URL があるときだけ使う）
+DB_READ_POOL_MAX: int = int(os.getenv("DB_READ_POOL_MAX", str(DB_POOL_MAX)))
+
+# pool が空いたときに connection の返却を待つ秒数。超えたら PoolError
+DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+
+# 定型 SQL を connection ごとに server-side PREPARE して使い回すか。
+# ※ transaction mode のプーラ越しでは使えない（session 状態になる）ので既定は off。
+#   直結 / session mode のときだけ DB_PREPARE_STATEMENTS=1 にする
+DB_PREPARE_STATEMENTS: bool = os.getenv("DB_PREPARE_STATEMENTS", "0") == "1"
+
 
 # ==================================================
 # Connection factory
 # ==================================================
 
-def get_connection():
+class _PreparingConnection(_PgConnection):
+    """この connection で PREPARE 済みの文の名前を覚えておく connection。"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared_statements: set = set()
+
+
+# 書き込み用（primary）/ 読み取り用の pool。readonly フラグで引く
+_POOLS: Dict[bool, ThreadedConnectionPool] = {}
+# pool ごとの空き枠。ThreadedConnectionPool.getconn() は空だと待たずに
+# PoolError を投げるので、ここで maxconn 個の枠を数えて借り手を待たせる
+_POOL_SLOTS: Dict[bool, threading.BoundedSemaphore] = {}
+_POOL_LOCK = threading.Lock()
+
+
+def _pool_key(readonly: bool) -> bool:
+    return readonly and DATABASE_READ_URL is not None
+
+
+def _get_pool(readonly: bool = False) -> ThreadedConnectionPool:
     """
-    新しい DB connection を返す。
+    connection pool を返す（初回呼び出し時に生成）。
+
+    - readonly=True かつ DATABASE_READ_URL がある場合は読み取り用 pool
+    - それ以外は書き込み用（DATABASE_URL）pool
+
+    ※ import しただけでは接続しない
+    """
+    readonly = _pool_key(readonly)
+
+    pool = _POOLS.get(readonly)
+    if pool is None:
+        with _POOL_LOCK:
+            pool = _POOLS.get(readonly)
+            if pool is None:
+                maxconn = DB_READ_POOL_MAX if readonly else DB_POOL_MAX
+                pool = ThreadedConnectionPool(
+                    minconn=min(DB_POOL_MIN, maxconn),
+                    maxconn=maxconn,
+                    dsn=DATABASE_READ_URL if readonly else DATABASE_URL,
+                    cursor_factory=RealDictCursor,
+                    connection_factory=_PreparingConnection,
+                )
+                atexit.register(pool.closeall)
+                _POOL_SLOTS[readonly] = threading.BoundedSemaphore(maxconn)
+                _POOLS[readonly] = pool
+    return pool
+
+
+def get_connection(readonly: bool = False):
+    """
+    pool から DB connection を借りる。
 
     注意：
-    - 毎回新規 connection
-    - pooling は行わない（必要になったら別モジュールで対応）
+    - 使い終わったら必ず release_connection() で返すこと
+      （readonly は借りたときと同じ値を渡す）
+    - 上限（DB_POOL_MAX / DB_READ_POOL_MAX）まで貸し出し中なら返却を待つ。
+      DB_POOL_TIMEOUT 秒待っても空かなければ PoolError になる
     """
-    return psycopg2.connect(
-        DATABASE_URL,
-        cursor_factory=RealDictCursor,
-    )
+    pool = _get_pool(readonly)
+    slots = _POOL_SLOTS[_pool_key(readonly)]
+
+    if not slots.acquire(timeout=DB_POOL_TIMEOUT):
+        raise PoolError(
+            f"connection pool exhausted (waited {DB_POOL_TIMEOUT}s)"
+        )
+
+    try:
+        return pool.getconn()
+    except Exception:
+        slots.release()
+        raise
+
+
+def release_connection(conn, readonly: bool = False) -> None:
+    """
+    借りた connection を pool に返す。
+
+    - 開いたままのトランザクションは rollback してから返す
+    - 切断済みの connection は pool から捨てる
+    """
+    broken = bool(conn.closed)
+
+    if not broken:
+        try:
+            conn.rollback()
+        except Exception:
+            broken = True
+
+    try:
+        _get_pool(readonly).putconn(conn, close=broken)
+    finally:
+        _POOL_SLOTS[_pool_key(readonly)].release()
 
 
 # ==================================================
@@ -60,7 +175,7 @@ def get_connection():
 # ==================================================
 
 @contextmanager
-def get_cursor(commit: bool = False) -> Generator:
+def get_cursor(commit: bool = False, readonly: bool = False) -> Generator:
     """
     with 構文用の cursor 取得ヘルパ。
 
@@ -70,8 +185,15 @@ def get_cursor(commit: bool = False) -> Generator:
 
     commit=True を指定した場合のみ commit する。
     （read-only 前提コードでは指定しない）
+
+    readonly=True は読み取り用 pool（DATABASE_READ_URL）から借りる。
+    standby は書き込めないので commit=True とは併用できない。
     """
-    conn = get_connection()
+    if commit and readonly:
+        raise ValueError("readonly cursor cannot commit")
+
+    conn = get_connection(readonly)
+    cur = None
     try:
         cur = conn.cursor()
         yield cur
@@ -81,14 +203,87 @@ def get_cursor(commit: bool = False) -> Generator:
 
     except Exception:
         conn.rollback()
+        # 失敗したトランザクション内の PREPARE が残ったか分からないので、
+        # 次回は pg_prepared_statements で確かめ直す
+        _forget_prepared(conn)
         raise
 
     finally:
-        try:
-            cur.close()
-        except Exception:
-            pass
-        conn.close()
+        if cur is not None:
+            try:
+                cur.close()
+            except Exception:
+                pass
+        release_connection(conn, readonly)
+
+
+# ==================================================
+# Prepared statements
+# ==================================================
+
+_PLACEHOLDER_RE = re.compile(r"%\((\w+)\)s|%s")
+
+
+@lru_cache(maxsize=64)
+def _prepared_form(sql: str) -> Tuple[str, Tuple[Optional[str], ...]]:
+    """
+    psycopg2 形式（%s / %(name)s）の SQL を PREPARE 用（$1, $2 ...）に直す。
+
+    戻り値の2つ目は $n に対応する引数のキー（%s の場合は None）。
+    同じ名前の %(name)s は同じ $n を使う。
+    """
+    keys: list = []
+
+    def _replace(m: "re.Match[str]") -> str:
+        name = m.group(1)
+        if name is not None and name in keys:
+            return f"${keys.index(name) + 1}"
+        keys.append(name)
+        return f"${len(keys)}"
+
+    return _PLACEHOLDER_RE.sub(_replace, sql), tuple(keys)
+
+
+def _forget_prepared(conn) -> None:
+    prepared = getattr(conn, "prepared_statements", None)
+    if prepared is not None:
+        prepared.clear()
+
+
+def execute_prepared(cur, name: str, sql: str, params: Any = None) -> None:
+    """
+    定型 SQL を実行する。DB_PREPARE_STATEMENTS が有効なら、
+    connection ごとに一度だけ PREPARE し、以降は EXECUTE で parse / plan を省く。
+
+    name   : 文の名前（モジュール内で一意な識別子）
+    sql    : psycopg2 形式の SQL（%s / %(name)s）
+    params : sql に対応する tuple / dict
+
+    無効時・未対応 connection では通常の cur.execute と同じ。
+    """
+    prepared = getattr(cur.connection, "prepared_statements", None)
+    if not DB_PREPARE_STATEMENTS or prepared is None:
+        cur.execute(sql, params)
+        return
+
+    body, keys = _prepared_form(sql)
+
+    if name not in prepared:
+        cur.execute("SELECT 1 FROM pg_prepared_statements WHERE name = %s", (name,))
+        if cur.fetchone() is None:
+            cur.execute(f"PREPARE {name} AS {body}")
+        prepared.add(name)
+
+    if not keys:
+        cur.execute(f"EXECUTE {name}")
+        return
+
+    if isinstance(params, dict):
+        args = [params[key] for key in keys]
+    else:
+        args = list(params)
+
+    cur.execute(f"EXECUTE {name} ({', '.join(['%s'] * len(args))})", args)
 
 
 # ==================================================
@@ -100,7 +295,7 @@ def ping() -> bool:
     DB に接続できるかだけを確認する簡易チェック。
     """
     try:
-        with get_cursor() as cur:
+        with get_cursor(readonly=True) as cur:
             cur.execute("SELECT 1;")
             cur.fetchone()
         return True
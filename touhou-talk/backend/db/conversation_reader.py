@@ -16,7 +16,7 @@ conversation_id（UUID）を取得・生成する中継モジュール。
 - 「conversation_id を解決する」ことだけに専念
 """
 
-from db.connection import get_cursor
+from db.connection import execute_prepared, get_cursor
 
 
 # ==================================================
@@ -40,6 +40,30 @@ def get_or_create_conversation_id(
         conversation_id (str, UUID)
     """
 
+    params = _conversation_params(
+        user_id=user_id,
+        character_id=character_id,
+        session_key=session_key,
+    )
+
+    with get_cursor(commit=True) as cur:
+        return _get_or_create_with_cursor(cur, params)
+
+
+# ==================================================
+# Internal（session_reader からも使う）
+# ==================================================
+
+def _conversation_params(
+    *,
+    user_id: str,
+    character_id: str,
+    session_key: str,
+) -> dict:
+    """
+    入力を検証し、_GET_OR_CREATE_SQL 用のパラメータを返す。
+    """
+
     # --------------------------------------------------
     # Validation
     # --------------------------------------------------
@@ -57,46 +81,65 @@ def get_or_create_conversation_id(
     # --------------------------------------------------
     mode = "single"
 
-    # --------------------------------------------------
-    # 1. 既存 conversation を探す
-    # --------------------------------------------------
-    select_sql = """
-        SELECT id
-        FROM conversations
-        WHERE user_id = %s
-          AND character_id = %s
-          AND session_key = %s
-          AND mode = %s
-        LIMIT 1
+    return {
+        "user_id": user_id,
+        "character_id": character_id,
+        "session_key": session_key,
+        "mode": mode,
+    }
+
+
+def _get_or_create_with_cursor(cur, params: dict) -> str:
     """
+    与えられた cursor（トランザクション）上で conversation_id を取得 or 作成する。
 
-    with get_cursor() as cur:
-        cur.execute(
-            select_sql,
-            (user_id, character_id, session_key, mode),
-        )
+    既存行があればそれを、なければ INSERT した行の id を返す（1 round-trip）。
+    ※ 同時作成の競合で一意制約に当たった場合は何も返らない
+      （ON CONFLICT DO NOTHING）ので、もう一度だけ引き直す。
+      READ COMMITTED なので、同じトランザクション内の再実行で相手の行が見える
+    """
+    for _ in range(2):
+        execute_prepared(cur, "get_or_create_conversation", _GET_OR_CREATE_SQL, params)
         row = cur.fetchone()
 
         if row and "id" in row:
             return str(row["id"])
 
-    # --------------------------------------------------
-    # 2. なければ新規作成
-    # --------------------------------------------------
-    insert_sql = """
-        INSERT INTO conversations (user_id, character_id, mode, session_key)
-        VALUES (%s, %s, %s, %s)
-        RETURNING id
-    """
+    raise RuntimeError("Failed to create conversation")
 
-    with get_cursor(commit=True) as cur:
-        cur.execute(
-            insert_sql,
-            (user_id, character_id, mode, session_key),
-        )
-        new_row = cur.fetchone()
 
-        if not new_row or "id" not in new_row:
-            raise RuntimeError("Failed to create conversation")
+# ==================================================
+# SQL
+# ==================================================
+
+# conv（id 1列・0〜1行）を定義する WITH 句。
+# ※ INSERT を含む WITH は最上位にしか置けないので、
+#   他の文（session_reader）はこの後ろに本文を続けて使う
+_GET_OR_CREATE_CTE = """
+    WITH existing AS (
+        SELECT id
+        FROM conversations
+        WHERE user_id = %(user_id)s
+          AND character_id = %(character_id)s
+          AND session_key = %(session_key)s
+          AND mode = %(mode)s
+        LIMIT 1
+    ),
+    inserted AS (
+        INSERT INTO conversations (user_id, character_id, mode, session_key)
+        SELECT %(user_id)s, %(character_id)s, %(mode)s, %(session_key)s
+        WHERE NOT EXISTS (SELECT 1 FROM existing)
+        ON CONFLICT DO NOTHING
+        RETURNING id
+    ),
+    conv AS (
+        SELECT id FROM existing
+        UNION ALL
+        SELECT id FROM inserted
+        LIMIT 1
+    )
+"""
 
-    return str(new_row["id"])
\ No newline at end of file
+_GET_OR_CREATE_SQL = _GET_OR_CREATE_CTE + """
+    SELECT id FROM conv
+"""
\ No newline at end of file
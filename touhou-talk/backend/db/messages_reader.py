@@ -14,7 +14,7 @@ Public API:
 """
 
 from typing import List, Dict
-from db.connection import get_cursor
+from db.connection import execute_prepared, get_cursor
 
 
 def read_messages(*, session_id: str, limit: int = 12) -> List[Dict[str, str]]:
@@ -28,36 +28,38 @@ def read_messages(*, session_id: str, limit: int = 12) -> List[Dict[str, str]]:
     ]
     """
 
-    sql = """
-        SELECT role, content
+    # 読み取り専用なので読み取り用 pool（設定があれば standby）から引く
+    with get_cursor(readonly=True) as cur:
+        return _read_messages_with_cursor(cur, session_id, limit)
+
+
+# ==================================================
+# Internal（session_reader からも使う）
+# ==================================================
+
+# 直近 limit 件を DESC で切り出し、外側で昇順（文脈の順）に並べ直す
+# （並べ替えは limit 件だけなので DB 側で済ませる）
+# role / content が NULL の行は DB 側で落とす（limit は有効な行で数える）
+_READ_MESSAGES_SQL = """
+    SELECT role, content
+    FROM (
+        SELECT role, content, created_at
         FROM messages
         WHERE conversation_id = %s
+          AND role IS NOT NULL
+          AND content IS NOT NULL
         ORDER BY created_at DESC
         LIMIT %s
-    """
-
-    with get_cursor() as cur:
-        cur.execute(sql, (session_id, limit))
-        rows = cur.fetchall()
-
-    # DB は DESC なので、文脈としては昇順に直す
-    rows.reverse()
-
-    out: List[Dict[str, str]] = []
-    for r in rows:
-        role = r.get("role")
-        content = r.get("content")
+    ) recent
+    ORDER BY created_at ASC
+"""
 
-        if not isinstance(role, str):
-            continue
-        if not isinstance(content, str):
-            continue
 
-        out.append(
-            {
-                "role": role,
-                "content": content,
-            }
-        )
+def _read_messages_with_cursor(cur, session_id: str, limit: int) -> List[Dict[str, str]]:
+    """与えられた cursor 上で直近 messages を読む（read_messages の本体）。"""
+    execute_prepared(cur, "read_messages", _READ_MESSAGES_SQL, (session_id, limit))
+    rows = cur.fetchall()
 
-    return out
\ No newline at end of file
+    # NULL は SQL で除外済み（text 列なので残りは str）。
+    # RealDictRow ではなく素の dict で返す
+    return [{"role": r["role"], "content": r["content"]} for r in rows]
\ No newline at end of file
@@ -0,0 +1,92 @@
+# db/session_reader.py
+"""
+session_reader.py
+===================
+会話を開く際の「conversation_id 解決 + 直近履歴の取得」を
+1回の connection / トランザクションでまとめて行うモジュール。
+
+Public API:
+- open_session_with_history(user_id, character_id, session_key, limit)
+    -> (conversation_id, messages)
+
+呼び出し元：
+- api/server.py の chat（0. conversation_id 確定）。ここで取った履歴を
+  8. の DB 文脈ロードにそのまま渡す
+
+責務：
+- conversation の取得 or 作成と直近履歴の取得を 1 文（1 round-trip）で行う
+- pool からの借り出しとトランザクションを1回に減らす
+
+注意：
+- 履歴の読み込みに失敗すると conversation_id も返らない（例外はそのまま投げる）
+  履歴だけ握りつぶしたい呼び出し側は、従来どおり個別に呼ぶこと
+"""
+
+from typing import Dict, List, Tuple
+
+from db.connection import execute_prepared, get_cursor
+from db.conversation_reader import (
+    _GET_OR_CREATE_CTE,
+    _conversation_params,
+    _get_or_create_with_cursor,
+)
+from db.messages_reader import _read_messages_with_cursor
+
+
+# conversation を確定し（conv）、その直近 messages を LATERAL で同じ文の中で引く。
+# 履歴の条件・並びは messages_reader._READ_MESSAGES_SQL と同じ。
+# 履歴が無い場合も conv の1行（role / content は NULL）が返る。
+_OPEN_SESSION_SQL = _GET_OR_CREATE_CTE + """
+    SELECT conv.id AS conversation_id, recent.role, recent.content
+    FROM conv
+    LEFT JOIN LATERAL (
+        SELECT role, content, created_at
+        FROM messages
+        WHERE conversation_id = conv.id
+          AND role IS NOT NULL
+          AND content IS NOT NULL
+        ORDER BY created_at DESC
+        LIMIT %(limit)s
+    ) recent ON TRUE
+    ORDER BY recent.created_at ASC
+"""
+
+
+def open_session_with_history(
+    *,
+    user_id: str,
+    character_id: str,
+    session_key: str = "default",
+    limit: int = 12,
+) -> Tuple[str, List[Dict[str, str]]]:
+    """
+    conversation_id(UUID) を取得 or 作成し、その直近 messages と一緒に返す。
+
+    get_or_create_conversation_id → read_messages を順に呼んだ場合と同じ結果。
+
+    Returns:
+        (conversation_id, messages)
+    """
+    params = _conversation_params(
+        user_id=user_id,
+        character_id=character_id,
+        session_key=session_key,
+    )
+
+    with get_cursor(commit=True) as cur:
+        execute_prepared(cur, "open_session", _OPEN_SESSION_SQL, {**params, "limit": limit})
+        rows = cur.fetchall()
+
+        if not rows:
+            # 同時作成の競合で conv が空だった（ON CONFLICT DO NOTHING）。
+            # 稀なので、同じトランザクションで従来の2文に分けて引き直す
+            conversation_id = _get_or_create_with_cursor(cur, params)
+            return conversation_id, _read_messages_with_cursor(cur, conversation_id, limit)
+
+    conversation_id = str(rows[0]["conversation_id"])
+    messages = [
+        {"role": r["role"], "content": r["content"]}
+        for r in rows
+        if r["role"] is not None
+    ]
+    return conversation_id, messages
\ No newline at end of file
@@ -32,9 +32,10 @@ drift_detector.py
 
 from __future__ import annotations
 
+from collections import deque
 from dataclasses import dataclass
 from enum import Enum
-from typing import List, Optional
+from typing import Deque, List, Optional
 
 
 # ============================================================
@@ -111,7 +112,8 @@ class DriftDetector:
 
     def __init__(self) -> None:
         self._last_turn_checked: int = -1
-        self._recent_questions: List[int] = []
+        # 直近の履歴だけ持つ（append で古いものは自動で押し出される）
+        self._recent_questions: Deque[int] = deque(maxlen=5)
 
     # --------------------------------------------------------
     # main entry
@@ -204,7 +206,6 @@ class DriftDetector:
         # ④ 質問ループ検知
         if ai_intent.get("is_question", False):
             self._recent_questions.append(turn_index)
-            self._recent_questions = self._recent_questions[-5:]
 
             if len(self._recent_questions) >= 3:
                 events.append(
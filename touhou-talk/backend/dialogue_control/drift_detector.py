@@ -32,9 +32,12 @@ drift_detector.py
 
 from __future__ import annotations
 
+from collections import deque
 from dataclasses import dataclass
 from enum import Enum
-from typing import List, Optional
+from typing import Deque, Iterable, Iterator, List, Optional
+
+from .object_registry import ObjectEvent
 
 
 # ============================================================
@@ -54,11 +57,38 @@ class DriftType(str, Enum):
     QUESTION_LOOP = "question_loop"
 
 
+# ============================================================
+# DriftEvent の説明文（%s は検知時に埋める）
+# ============================================================
+
+_TOPIC_SHIFT_DESC = "Topic shifted from '%s' to '%s' without explicit user consent"
+_OBJECT_OVERCOMMIT_DESC = "Object '%s' treated as existing without confirmation"
+_DENIAL_IGNORED_DESC = "Denied object '%s' referenced again"
+_ASSUMPTION_LEAP_DESC = "AI introduced speculative premise without user request"
+_QUESTION_LOOP_DESC = "AI is repeatedly asking questions without resolution"
+_SPECULATION_CHAIN_DESC = "Speculative reasoning chained across multiple turns"
+
+
+# この severity 以上は「即座に修正が必要」
+_CRITICAL_SEVERITY = 0.8
+
+
+# ============================================================
+# オブジェクトイベント → ドリフトの対応表
+# ============================================================
+
+# ObjectEvent.type → (DriftType, severity, description テンプレート)
+_OBJECT_EVENT_MAP = {
+    "assumed": (DriftType.OBJECT_OVERCOMMIT, 0.7, _OBJECT_OVERCOMMIT_DESC),
+    "denied_but_used": (DriftType.DENIAL_IGNORED, 0.9, _DENIAL_IGNORED_DESC),
+}
+
+
 # ============================================================
 # Drift イベント
 # ============================================================
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class DriftEvent:
     """
     検知されたドリフトイベント。
@@ -69,6 +99,19 @@ class DriftEvent:
     severity: float = 0.5
 
 
+@dataclass(frozen=True, slots=True)
+class TurnRecord:
+    """
+    detect_many に渡す1ターン分の入力（detect の引数と同じ）。
+    """
+    turn_index: int
+    user_intent: dict
+    ai_intent: dict
+    topic_before: Optional[str]
+    topic_after: Optional[str]
+    object_events: List[ObjectEvent]
+
+
 # ============================================================
 # DriftDetector
 # ============================================================
@@ -84,8 +127,11 @@ class DriftDetector:
 
     def __init__(self) -> None:
         self._last_turn_checked: int = -1
-        self._recent_questions: List[int] = []
-        self._recent_speculation: List[int] = []
+        # 直近の履歴だけ持つ（append で古いものは自動で押し出される）
+        self._recent_questions: Deque[int] = deque(maxlen=5)
+        self._recent_speculation: Deque[int] = deque(maxlen=3)
+        # 直前の detect() の結果に critical なイベントがあったか
+        self._last_critical: bool = False
 
     # --------------------------------------------------------
     # main entry
@@ -99,31 +145,105 @@ class DriftDetector:
         ai_intent: dict,
         topic_before: Optional[str],
         topic_after: Optional[str],
-        object_events: List[dict],
+        object_events: List[ObjectEvent],
     ) -> List[DriftEvent]:
+        return list(
+            self._detect_iter(
+                turn_index,
+                user_intent,
+                ai_intent,
+                topic_before,
+                topic_after,
+                object_events,
+            )
+        )
 
-        events: List[DriftEvent] = []
+    def iter_drift(
+        self,
+        *,
+        turn_index: int,
+        user_intent: dict,
+        ai_intent: dict,
+        topic_before: Optional[str],
+        topic_after: Optional[str],
+        object_events: List[ObjectEvent],
+    ) -> Iterator[DriftEvent]:
+        """
+        detect() のジェネレータ版（list を作らない）。
+
+        ※ 履歴の更新は走査に伴って行われるので、途中で打ち切らず最後まで消費すること
+        """
+        return self._detect_iter(
+            turn_index,
+            user_intent,
+            ai_intent,
+            topic_before,
+            topic_after,
+            object_events,
+        )
+
+    def detect_many(self, turns: Iterable[TurnRecord]) -> Iterator[List[DriftEvent]]:
+        """
+        複数ターンをまとめて検知する（会話の再評価・リプレイ用）。
+
+        ターン順に detect() と同じ結果を1ターンずつ yield する。
+        履歴（直近の質問・推測）はターン間で引き継がれるので、
+        turns は turn_index の昇順で渡すこと。
+        """
+        scan = self._detect_iter
+        for turn in turns:
+            yield list(
+                scan(
+                    turn.turn_index,
+                    turn.user_intent,
+                    turn.ai_intent,
+                    turn.topic_before,
+                    turn.topic_after,
+                    turn.object_events,
+                )
+            )
+
+    def _detect_iter(
+        self,
+        turn_index: int,
+        user_intent: dict,
+        ai_intent: dict,
+        topic_before: Optional[str],
+        topic_after: Optional[str],
+        object_events: List[ObjectEvent],
+    ) -> Iterator[DriftEvent]:
+        """
+        detect / iter_drift / detect_many の本体（位置引数で呼ぶ）。
+
+        ※ 履歴・critical の更新は走査に伴って行うので、最後まで消費すること
+        """
 
         # 重複チェック防止
         if turn_index <= self._last_turn_checked:
-            return events
+            self._last_critical = False
+            return
+
+        # critical 判定は各分岐で積み、呼び出し側の再走査を省く
+        critical = False
+
+        # intent の参照は先頭で一度だけ
+        explicit_topic_change = user_intent.get("explicit_topic_change", False)
+        requested_speculation = user_intent.get("requested_speculation", False)
+        speculation = ai_intent.get("speculation", False)
+        is_question = ai_intent.get("is_question", False)
+        followup_question = ai_intent.get("followup_question", False)
 
         # ====================================================
         # ① 話題ジャンプ検知（明示切替は除外）
         # ====================================================
 
         if topic_before and topic_after and topic_before != topic_after:
-            if not user_intent.get("explicit_topic_change", False):
-                events.append(
-                    DriftEvent(
-                        drift_type=DriftType.TOPIC_SHIFT,
-                        turn_index=turn_index,
-                        description=(
-                            f"Topic shifted from '{topic_before}' "
-                            f"to '{topic_after}' without explicit user consent"
-                        ),
-                        severity=0.6,
-                    )
+            if not explicit_topic_change:
+                yield DriftEvent(
+                    drift_type=DriftType.TOPIC_SHIFT,
+                    turn_index=turn_index,
+                    description=_TOPIC_SHIFT_DESC % (topic_before, topic_after),
+                    severity=0.6,
                 )
 
         # ====================================================
@@ -131,67 +251,51 @@ class DriftDetector:
         # ====================================================
 
         for ev in object_events:
-            ev_type = ev.get("type")
-            name = ev.get("name")
-
-            if ev_type == "assumed":
-                events.append(
-                    DriftEvent(
-                        drift_type=DriftType.OBJECT_OVERCOMMIT,
-                        turn_index=turn_index,
-                        description=f"Object '{name}' treated as existing without confirmation",
-                        severity=0.7,
-                    )
-                )
-
-            if ev_type == "denied_but_used":
-                events.append(
-                    DriftEvent(
-                        drift_type=DriftType.DENIAL_IGNORED,
-                        turn_index=turn_index,
-                        description=f"Denied object '{name}' referenced again",
-                        severity=0.9,
-                    )
-                )
+            spec = _OBJECT_EVENT_MAP.get(ev.type)
+            if spec is None:
+                continue
+
+            drift_type, severity, template = spec
+            critical = critical or severity >= _CRITICAL_SEVERITY
+            yield DriftEvent(
+                drift_type=drift_type,
+                turn_index=turn_index,
+                description=template % (ev.name,),
+                severity=severity,
+            )
 
         # ====================================================
         # ③ 推測ジャンプ（要求されていない推測）
         # ====================================================
 
-        if ai_intent.get("speculation", False):
+        if speculation:
             self._recent_speculation.append(turn_index)
-            self._recent_speculation = self._recent_speculation[-3:]
-
-            if not user_intent.get("requested_speculation", False):
-                events.append(
-                    DriftEvent(
-                        drift_type=DriftType.ASSUMPTION_LEAP,
-                        turn_index=turn_index,
-                        description="AI introduced speculative premise without user request",
-                        severity=0.6,
-                    )
+
+            if not requested_speculation:
+                yield DriftEvent(
+                    drift_type=DriftType.ASSUMPTION_LEAP,
+                    turn_index=turn_index,
+                    description=_ASSUMPTION_LEAP_DESC,
+                    severity=0.6,
                 )
 
         # ====================================================
         # ④ 質問ループ（連続性を見る）
         # ====================================================
 
-        if ai_intent.get("is_question", False):
+        if is_question:
             self._recent_questions.append(turn_index)
-            self._recent_questions = self._recent_questions[-5:]
 
             # 連続3回以上かつ、ユーザーが切替を示していない
             if (
                 len(self._recent_questions) >= 3
-                and not user_intent.get("explicit_topic_change", False)
+                and not explicit_topic_change
             ):
-                events.append(
-                    DriftEvent(
-                        drift_type=DriftType.QUESTION_LOOP,
-                        turn_index=turn_index,
-                        description="AI is repeatedly asking questions without resolution",
-                        severity=0.5,
-                    )
+                yield DriftEvent(
+                    drift_type=DriftType.QUESTION_LOOP,
+                    turn_index=turn_index,
+                    description=_QUESTION_LOOP_DESC,
+                    severity=0.5,
                 )
 
         # ====================================================
@@ -200,26 +304,29 @@ class DriftDetector:
 
         if (
             len(self._recent_speculation) >= 2
-            and ai_intent.get("followup_question", False)
+            and followup_question
         ):
-            events.append(
-                DriftEvent(
-                    drift_type=DriftType.SPECULATION_CHAIN,
-                    turn_index=turn_index,
-                    description="Speculative reasoning chained across multiple turns",
-                    severity=0.8,
-                )
+            yield DriftEvent(
+                drift_type=DriftType.SPECULATION_CHAIN,
+                turn_index=turn_index,
+                description=_SPECULATION_CHAIN_DESC,
+                severity=0.8,
             )
+            critical = True
 
         self._last_turn_checked = turn_index
-        return events
+        self._last_critical = critical
 
     # --------------------------------------------------------
     # utility
     # --------------------------------------------------------
 
-    def has_critical_drift(self, events: List[DriftEvent]) -> bool:
+    def has_critical_drift(self, events: Optional[List[DriftEvent]] = None) -> bool:
         """
         即座に修正が必要なドリフトがあるか。
+
+        events を省略すると、直前の detect() で記録済みの判定を返す（再走査しない）。
         """
-        return any(ev.severity >= 0.8 for ev in events)
\ No newline at end of file
+        if events is None:
+            return self._last_critical
+        return any(ev.severity >= _CRITICAL_SEVERITY for ev in events)
\ No newline at end of file
@@ -0,0 +1,23 @@
+# persona_core/core/dialogue_control/evidence_log.py
+"""
+evidence_log.py
+===========================
+TopicNode / ObjectNode の evidence（根拠ログ）を入れる器。
+
+既定では直近 EVIDENCE_MAXLEN 件だけ保持する（長い会話でも増え続けない）。
+件数は TopicTracker / ObjectRegistry の evidence_max で変えられる
+（None は上限なし）。
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import Any, Deque, Optional
+
+
+# evidence（根拠ログ）の既定の保持件数（古いものから捨てる）
+EVIDENCE_MAXLEN = 32
+
+
+def new_evidence_log(maxlen: Optional[int] = EVIDENCE_MAXLEN) -> Deque[Any]:
+    return deque(maxlen=maxlen)
\ No newline at end of file
@@ -46,7 +46,10 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Dict, List, Optional
+from functools import lru_cache
+from typing import Deque, Dict, List, Optional
+
+from .evidence_log import EVIDENCE_MAXLEN, new_evidence_log
 
 
 # ============================================================
@@ -77,7 +80,7 @@ class ObjectStatus(str, Enum):
 # データ構造
 # ============================================================
 
-@dataclass
+@dataclass(slots=True)
 class ObjectEvidence:
     """
     オブジェクト存在に関する根拠ログ。
@@ -93,7 +96,7 @@ class ObjectEvidence:
     note: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class ObjectNode:
     """
     実体オブジェクトノード。
@@ -105,17 +108,54 @@ class ObjectNode:
     - status:
         ObjectStatus
     - evidence:
-        存在・否定の履歴
+        存在・否定の履歴（直近 evidence_max 件。既定 EVIDENCE_MAXLEN）
     - last_updated_turn:
         最終更新ターン
     """
     object_id: str
     label: str
     status: ObjectStatus = ObjectStatus.UNKNOWN
-    evidence: List[ObjectEvidence] = field(default_factory=list)
+    evidence: Deque[ObjectEvidence] = field(default_factory=new_evidence_log)
     last_updated_turn: int = 0
 
 
+@dataclass(frozen=True, slots=True)
+class ObjectEvent:
+    """
+    drift_detector に渡すオブジェクト関連イベント（1ターン分の事実）。
+
+    - type:
+        "assumed"（未確認なのに確定扱い）
+        "denied_but_used"（否定済みなのに再利用）など
+    - name:
+        対象オブジェクトの表示名
+    """
+    type: str
+    name: str
+
+
+# ============================================================
+# 名前正規化
+# ============================================================
+
+@lru_cache(maxsize=1024)
+def _normalize(raw: str) -> tuple[str, str]:
+    """
+    オブジェクト名正規化。
+
+    - 大文字小文字の揺れ吸収（casefold：lower() では畳めない ß などの揺れも吸収）
+    - 表示ラベルは保持
+
+    ※ 同じ名前が会話中に何度も出るので結果は cache する
+    """
+    label = (raw or "").strip()
+    object_id = label.casefold()
+    if not object_id:
+        object_id = "_empty_"
+        label = "_empty_"
+    return object_id, label
+
+
 # ============================================================
 # ObjectRegistry
 # ============================================================
@@ -136,9 +176,21 @@ class ObjectRegistry:
     多少保守的でも問題ない。
     """
 
-    def __init__(self) -> None:
+    def __init__(self, *, evidence_max: Optional[int] = EVIDENCE_MAXLEN) -> None:
+        """
+        Args:
+            evidence_max:
+                オブジェクトごとに保持する evidence の件数上限（古いものから捨てる）
+                ※ None は上限なし
+        """
+        self.evidence_max = evidence_max
         self._objects: Dict[str, ObjectNode] = {}
         self._turn_index: int = 0
+        # status → その status の object_id（dict を順序付き集合として使う）
+        # ※ node.status の変更は必ず _add_node / _set_status を通すこと
+        self._by_status: Dict[ObjectStatus, Dict[str, None]] = {
+            status: {} for status in ObjectStatus
+        }
 
     # --------------------------------------------------------
     # turn lifecycle
@@ -155,14 +207,19 @@ class ObjectRegistry:
     # --------------------------------------------------------
 
     def get(self, name: str) -> Optional[ObjectNode]:
-        object_id, _ = self._normalize(name)
+        object_id, _ = _normalize(name)
         return self._objects.get(object_id)
 
     def list_all(self) -> List[ObjectNode]:
         return list(self._objects.values())
 
     def list_by_status(self, status: ObjectStatus) -> List[ObjectNode]:
-        return [o for o in self._objects.values() if o.status == status]
+        """
+        指定 status のノード一覧（その status になった順）。
+        全件走査せず status 別の索引から引く。
+        """
+        objects = self._objects
+        return [objects[object_id] for object_id in self._by_status[status]]
 
     # --------------------------------------------------------
     # registration / update
@@ -186,7 +243,7 @@ class ObjectRegistry:
         ASSUMED は非常に危険なので、
         後続で CONFIRMED or DENIED に必ず遷移させる設計を推奨。
         """
-        object_id, label = self._normalize(name)
+        object_id, label = _normalize(name)
 
         node = self._objects.get(object_id)
         if node is None:
@@ -194,12 +251,13 @@ class ObjectRegistry:
                 object_id=object_id,
                 label=label,
                 status=ObjectStatus.ASSUMED,
+                evidence=new_evidence_log(self.evidence_max),
                 last_updated_turn=self._turn_index,
             )
-            self._objects[object_id] = node
+            self._add_node(node)
 
         # DENIED を勝手に復活させない
-        if node.status == ObjectStatus.DENIED:
+        if node.status is ObjectStatus.DENIED:
             node.evidence.append(
                 ObjectEvidence(
                     turn_index=self._turn_index,
@@ -211,7 +269,7 @@ class ObjectRegistry:
             node.last_updated_turn = self._turn_index
             return
 
-        node.status = ObjectStatus.ASSUMED
+        self._set_status(node, ObjectStatus.ASSUMED)
         node.last_updated_turn = self._turn_index
         node.evidence.append(
             ObjectEvidence(
@@ -237,7 +295,7 @@ class ObjectRegistry:
         - 「それは持っている」
         - 「確かに存在する」
         """
-        object_id, label = self._normalize(name)
+        object_id, label = _normalize(name)
 
         node = self._objects.get(object_id)
         if node is None:
@@ -245,11 +303,12 @@ class ObjectRegistry:
                 object_id=object_id,
                 label=label,
                 status=ObjectStatus.CONFIRMED,
+                evidence=new_evidence_log(self.evidence_max),
                 last_updated_turn=self._turn_index,
             )
-            self._objects[object_id] = node
+            self._add_node(node)
         else:
-            node.status = ObjectStatus.CONFIRMED
+            self._set_status(node, ObjectStatus.CONFIRMED)
             node.last_updated_turn = self._turn_index
 
         node.evidence.append(
@@ -279,7 +338,7 @@ class ObjectRegistry:
         これが入ったオブジェクトは
         以後、断定質問・前提化を絶対にしない。
         """
-        object_id, label = self._normalize(name)
+        object_id, label = _normalize(name)
 
         node = self._objects.get(object_id)
         if node is None:
@@ -287,11 +346,12 @@ class ObjectRegistry:
                 object_id=object_id,
                 label=label,
                 status=ObjectStatus.DENIED,
+                evidence=new_evidence_log(self.evidence_max),
                 last_updated_turn=self._turn_index,
             )
-            self._objects[object_id] = node
+            self._add_node(node)
         else:
-            node.status = ObjectStatus.DENIED
+            self._set_status(node, ObjectStatus.DENIED)
             node.last_updated_turn = self._turn_index
 
         node.evidence.append(
@@ -303,6 +363,21 @@ class ObjectRegistry:
             )
         )
 
+    # --------------------------------------------------------
+    # status index
+    # --------------------------------------------------------
+
+    def _add_node(self, node: ObjectNode) -> None:
+        self._objects[node.object_id] = node
+        self._by_status[node.status][node.object_id] = None
+
+    def _set_status(self, node: ObjectNode, status: ObjectStatus) -> None:
+        if node.status is status:
+            return
+        self._by_status[node.status].pop(node.object_id, None)
+        self._by_status[status][node.object_id] = None
+        node.status = status
+
     # --------------------------------------------------------
     # safety checks
     # --------------------------------------------------------
@@ -321,11 +396,11 @@ class ObjectRegistry:
         node = self.get(name)
         if node is None:
             return False
-        return node.status == ObjectStatus.CONFIRMED
+        return node.status is ObjectStatus.CONFIRMED
 
     def is_denied(self, name: str) -> bool:
         node = self.get(name)
-        return node is not None and node.status == ObjectStatus.DENIED
+        return node is not None and node.status is ObjectStatus.DENIED
 
     def should_use_cautious_language(self, name: str) -> bool:
         """
@@ -338,22 +413,5 @@ class ObjectRegistry:
         node = self.get(name)
         if node is None:
             return True
-        return node.status in (ObjectStatus.ASSUMED, ObjectStatus.UNKNOWN)
-
-    # --------------------------------------------------------
-    # normalization
-    # --------------------------------------------------------
-
-    def _normalize(self, raw: str) -> tuple[str, str]:
-        """
-        オブジェクト名正規化。
-
-        - 大文字小文字の揺れ吸収
-        - 表示ラベルは保持
-        """
-        label = (raw or "").strip()
-        object_id = label.lower()
-        if not object_id:
-            object_id = "_empty_"
-            label = "_empty_"
-        return object_id, label
\ No newline at end of file
+        status = node.status
+        return status is ObjectStatus.ASSUMED or status is ObjectStatus.UNKNOWN
@@ -35,9 +35,26 @@ TopicTracker は、こうした「話題の暴走」を抑えるために
 
 from __future__ import annotations
 
+import heapq
+import itertools
+import re
+import sys
+from collections import defaultdict, deque
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Dict, List, Optional, Tuple
+from functools import lru_cache
+from typing import Deque, Dict, List, Optional, Set, Tuple
+
+from .evidence_log import EVIDENCE_MAXLEN, new_evidence_log
+
+
+# naive_extract_topics 用の括弧パターン（種類ごと・この順で走査する）
+# 種類ごとに分けているのは、抽出順と入れ子/交差時の拾い方を従来の find 走査と揃えるため
+_BRACKET_RES: Tuple[re.Pattern[str], ...] = (
+    re.compile(r"「([^」]*)」"),
+    re.compile(r"『([^』]*)』"),
+    re.compile(r"（([^）]*)）"),
+)
 
 
 # ============================================================
@@ -72,7 +89,7 @@ class TopicStatus(str, Enum):
 # データ構造
 # ============================================================
 
-@dataclass
+@dataclass(slots=True)
 class TopicEvidence:
     """
     話題の根拠（どこで出たか）を保存する。
@@ -88,7 +105,7 @@ class TopicEvidence:
     note: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class TopicNode:
     """
     話題ノード。
@@ -102,9 +119,9 @@ class TopicNode:
     - parent_id:
         派生元話題（ツリー構造）
     - children_ids:
-        派生話題
+        派生話題（dict を順序付き集合として使う。値は常に None）
     - evidence:
-        出現根拠
+        出現根拠（直近 evidence_max 件。既定 EVIDENCE_MAXLEN）
     - last_touched_turn:
         最終参照ターン（ドーマント判定に使う）
     - rejected_reason:
@@ -114,11 +131,36 @@ class TopicNode:
     label: str
     status: TopicStatus = TopicStatus.AVAILABLE
     parent_id: Optional[str] = None
-    children_ids: List[str] = field(default_factory=list)
-    evidence: List[TopicEvidence] = field(default_factory=list)
+    children_ids: Dict[str, None] = field(default_factory=dict)
+    evidence: Deque[TopicEvidence] = field(default_factory=new_evidence_log)
     last_touched_turn: int = 0
     rejected_reason: str = ""
 
+    def __post_init__(self) -> None:
+        # self._topics のキーと同一オブジェクトにそろえる
+        self.topic_id = sys.intern(self.topic_id)
+
+
+# ============================================================
+# 正規化
+# ============================================================
+
+@lru_cache(maxsize=4096)
+def _normalize_topic_cached(raw: str) -> Tuple[str, str]:
+    """
+    TopicTracker._normalize_topic の本体。
+
+    同じ話題ラベルはターンをまたいで何度も出るので結果は cache し、
+    topic_id は intern して dict 参照を同一オブジェクト比較で済ませる。
+    """
+    label = (raw or "").strip()
+    topic_id = label.lower()
+    # 空は無視したいが、呼び出し側で候補を弾く想定。ここは保険。
+    if not topic_id:
+        topic_id = "_empty_"
+        label = "_empty_"
+    return sys.intern(topic_id), label
+
 
 # ============================================================
 # TopicTracker
@@ -147,28 +189,65 @@ class TopicTracker:
         max_topics: int = 64,
         dormant_after_turns: int = 8,
         allow_revival: bool = False,
+        evidence_max: Optional[int] = EVIDENCE_MAXLEN,
+        history_limit: int = 512,
     ):
         """
         Args:
             max_topics:
                 保持する話題数上限（古いものからdormant化/削除判断に使う）
+                ※ 削除はまとめて行うので、一時的に max_topics + slack 件まで増える
             dormant_after_turns:
                 最終タッチからこのターン数以上で DORMANT 扱い
             allow_revival:
                 REJECTED を自動復活させるか（基本False推奨）
+            evidence_max:
+                話題ごとに保持する evidence の件数上限（古いものから捨てる）
+                ※ None は上限なし
+            history_limit:
+                フォーカス履歴を保持するターン数上限（古いものから捨てる）
         """
         self.max_topics = max_topics
+        # 削除のヒステリシス幅：max_topics + slack を超えたら
+        # max_topics - slack // 2 まで一気に削る（毎回の削除判定を間引く）
+        self._eviction_slack: int = max(8, max_topics // 16)
         self.dormant_after_turns = dormant_after_turns
         self.allow_revival = allow_revival
+        self.evidence_max = evidence_max
 
         self._turn_index: int = 0
         self._topics: Dict[str, TopicNode] = {}
 
+        # status → その status の topic_id（dict を順序付き集合として使う）
+        # ※ node.status の変更は必ず _add_topic / _set_status を通すこと
+        self._by_status: Dict[TopicStatus, Dict[str, None]] = {
+            status: {} for status in TopicStatus
+        }
+
         # 現在フォーカス中の話題ID（主話題）
         self._active_topic_id: Optional[str] = None
 
-        # ターンごとのフォーカス履歴
-        self._focus_history: List[Optional[str]] = []
+        # ターンごとのフォーカス履歴（直近 history_limit ターン分）
+        self._focus_history: Deque[Optional[str]] = deque(maxlen=history_limit)
+
+        # このターンで evidence を積んだ (topic_id, role)。on_turn_start でリセット
+        self._seen_this_turn: Set[Tuple[str, str]] = set()
+
+        # 話題の追加・削除・touch のたびに進める版数と、list_topics() の結果 cache
+        self._version: int = 0
+        self._list_cache: Optional[Tuple[int, List[TopicNode]]] = None
+
+        # 削除候補の min-heap: (last_touched_turn, 登録順, topic_id)
+        # touch のたびに積むだけで、古いエントリは取り出し時に捨てる（遅延削除）
+        # 同ターン内は登録順（= self._topics の挿入順）で古いものから削る
+        self._eviction_heap: List[Tuple[int, int, str]] = []
+        self._insert_seq: Dict[str, int] = {}
+        self._seq_counter = itertools.count()
+
+        # dormant 判定の期限インデックス: 期限ターン -> topic_id 集合
+        # on_turn_start では期限が来たバケットだけを見る
+        self._dormant_due: Dict[int, Set[str]] = defaultdict(set)
+        self._dormant_due_of: Dict[str, int] = {}
 
     # ------------------------------------------------------------
     # public getters
@@ -190,9 +269,22 @@ class TopicTracker:
     def get_topic(self, topic_id: str) -> Optional[TopicNode]:
         return self._topics.get(topic_id)
 
+    def recent_focus_history(self, k: int) -> List[Optional[str]]:
+        """
+        直近 k ターン分のフォーカス履歴（古い順）。
+        """
+        history = self._focus_history
+        start = max(0, len(history) - k)
+        return list(itertools.islice(history, start, None))
+
     def list_topics(self) -> List[TopicNode]:
         # 安定した順序（出現順っぽく）にしたいなら last_touched_turn などでソート
-        return sorted(self._topics.values(), key=lambda t: t.last_touched_turn, reverse=True)
+        # 版数が変わっていなければ前回のソート結果を使う（呼び出し側の改変に備えてコピーを返す）
+        cache = self._list_cache
+        if cache is None or cache[0] != self._version:
+            ordered = sorted(self._topics.values(), key=lambda t: t.last_touched_turn, reverse=True)
+            cache = self._list_cache = (self._version, ordered)
+        return list(cache[1])
 
     # ------------------------------------------------------------
     # turn lifecycle
@@ -205,6 +297,7 @@ class TopicTracker:
         - dormant 判定を適用
         """
         self._turn_index = turn_index
+        self._seen_this_turn.clear()
         self._apply_dormant_rules()
         self._focus_history.append(self._active_topic_id)
 
@@ -232,15 +325,24 @@ class TopicTracker:
             speculative: Trueなら SPECULATIVE として登録
             parent_hint: 派生元トピック（無ければactive_topic）
             note: evidenceに残すメモ
+
+        同じターン・同じ role で同じ話題が繰り返し出た場合、
+        evidence の追加と touch は最初の1回だけ行う（状態更新は毎回行う）。
         """
         parent_id = parent_hint or self._active_topic_id
+        seen = self._seen_this_turn
 
-        for raw in candidates:
+        for raw in dict.fromkeys(candidates):
             topic_id, label = self._normalize_topic(raw)
+            key = (topic_id, role)
+            repeated = key in seen
+            seen.add(key)
 
             # REJECTED が既にある場合は基本触らない（復活事故防止）
             existing = self._topics.get(topic_id)
             if existing and existing.status == TopicStatus.REJECTED and not self.allow_revival:
+                if repeated:
+                    continue
                 # 根拠だけ積んで「また出た」記録は残す（検出器が後で使える）
                 existing.evidence.append(
                     TopicEvidence(
@@ -250,7 +352,8 @@ class TopicTracker:
                         note=f"(rejected-topic-mentioned) {note}".strip(),
                     )
                 )
-                existing.last_touched_turn = self._turn_index
+                # last_touched_turn は更新しない（REJECTED は dormant/削除の対象外なので
+                # 触り直しても意味がなく、heap に無駄なエントリが積まれるだけ）
                 continue
 
             if topic_id not in self._topics:
@@ -261,6 +364,7 @@ class TopicTracker:
                     label=label,
                     status=status,
                     parent_id=parent_id,
+                    evidence=new_evidence_log(self.evidence_max),
                     last_touched_turn=self._turn_index,
                 )
                 node.evidence.append(
@@ -271,38 +375,37 @@ class TopicTracker:
                         note=note,
                     )
                 )
-                self._topics[topic_id] = node
+                self._add_topic(node)
 
                 # 親子接続
                 if parent_id and parent_id in self._topics:
                     parent = self._topics[parent_id]
-                    if topic_id not in parent.children_ids:
-                        parent.children_ids.append(topic_id)
+                    parent.children_ids[topic_id] = None
 
             else:
                 # 既存更新
                 node = self._topics[topic_id]
-                node.last_touched_turn = self._turn_index
-                node.evidence.append(
-                    TopicEvidence(
-                        turn_index=self._turn_index,
-                        role=role,
-                        text=text,
-                        note=note,
+                if not repeated:
+                    self._touch(node)
+                    node.evidence.append(
+                        TopicEvidence(
+                            turn_index=self._turn_index,
+                            role=role,
+                            text=text,
+                            note=note,
+                        )
                     )
-                )
 
                 # speculative を優先して下げる（確定を勝手に外さない）
                 if speculative and node.status not in (TopicStatus.REJECTED, TopicStatus.ACTIVE):
-                    node.status = TopicStatus.SPECULATIVE
+                    self._set_status(node, TopicStatus.SPECULATIVE)
 
                 # 親子接続（parent_idが変わっても上書きは基本しない。最初の根を尊重）
                 if node.parent_id is None and parent_id is not None:
                     node.parent_id = parent_id
                     if parent_id in self._topics:
                         parent = self._topics[parent_id]
-                        if topic_id not in parent.children_ids:
-                            parent.children_ids.append(topic_id)
+                        parent.children_ids[topic_id] = None
 
         self._enforce_max_topics()
 
@@ -338,6 +441,7 @@ class TopicTracker:
                 topic_id=topic_id,
                 label=label,
                 status=TopicStatus.REJECTED,
+                evidence=new_evidence_log(self.evidence_max),
                 last_touched_turn=self._turn_index,
                 rejected_reason=reason,
             )
@@ -349,11 +453,11 @@ class TopicTracker:
                     note=f"(rejected-created) {note}".strip(),
                 )
             )
-            self._topics[topic_id] = node
+            self._add_topic(node)
         else:
-            node.status = TopicStatus.REJECTED
+            self._set_status(node, TopicStatus.REJECTED)
             node.rejected_reason = reason
-            node.last_touched_turn = self._turn_index
+            self._touch(node)
             node.evidence.append(
                 TopicEvidence(
                     turn_index=self._turn_index,
@@ -410,6 +514,7 @@ class TopicTracker:
                 topic_id=topic_id,
                 label=label,
                 status=TopicStatus.AVAILABLE,
+                evidence=new_evidence_log(self.evidence_max),
                 last_touched_turn=self._turn_index,
             )
             node.evidence.append(
@@ -420,7 +525,7 @@ class TopicTracker:
                     note="(focus-created)",
                 )
             )
-            self._topics[topic_id] = node
+            self._add_topic(node)
 
         # rejected をフォーカスにしない
         if node.status == TopicStatus.REJECTED and not self.allow_revival:
@@ -432,11 +537,13 @@ class TopicTracker:
             prev = self._topics[self._active_topic_id]
             if prev.status == TopicStatus.ACTIVE:
                 # rejected 以外に落とす
-                prev.status = TopicStatus.AVAILABLE
+                self._set_status(prev, TopicStatus.AVAILABLE)
+                # ACTIVE 中に期限を過ぎていた場合に備えて dormant 判定に戻す
+                self._schedule_dormant(prev)
 
         # 新しい active
-        node.status = TopicStatus.ACTIVE
-        node.last_touched_turn = self._turn_index
+        self._set_status(node, TopicStatus.ACTIVE)
+        self._touch(node)
         self._active_topic_id = topic_id
 
         self._enforce_max_topics()
@@ -462,13 +569,21 @@ class TopicTracker:
             return self._active_topic_id
 
         if fallback_to_recent:
-            candidates = [
-                t for t in self._topics.values()
-                if t.status in (TopicStatus.AVAILABLE, TopicStatus.SPECULATIVE, TopicStatus.ACTIVE)
+            by_status = self._by_status
+            candidate_ids = [
+                *by_status[TopicStatus.AVAILABLE],
+                *by_status[TopicStatus.SPECULATIVE],
+                *by_status[TopicStatus.ACTIVE],
             ]
-            if candidates:
-                candidates.sort(key=lambda t: t.last_touched_turn, reverse=True)
-                self.set_focus(candidates[0].topic_id)
+            if candidate_ids:
+                # 最近触ったもの優先。同ターンなら登録順が早いもの
+                topics = self._topics
+                insert_seq = self._insert_seq
+                best = min(
+                    candidate_ids,
+                    key=lambda i: (-topics[i].last_touched_turn, insert_seq[i]),
+                )
+                self.set_focus(best)
                 return self._active_topic_id
 
         return self._active_topic_id
@@ -507,7 +622,9 @@ class TopicTracker:
         return active.status == TopicStatus.SPECULATIVE
 
     def get_rejected_topics(self) -> List[TopicNode]:
-        return [t for t in self._topics.values() if t.status == TopicStatus.REJECTED]
+        # 登録順（self._topics の順）で返す
+        rejected = sorted(self._by_status[TopicStatus.REJECTED], key=self._insert_seq.__getitem__)
+        return [self._topics[i] for i in rejected]
 
     # ------------------------------------------------------------
     # internal: normalization
@@ -524,31 +641,90 @@ class TopicTracker:
         - 全角/半角などは触らない（不用意な破壊を避ける）
         - 小文字化（英字のみ）
         """
-        label = (raw or "").strip()
-        topic_id = label.lower()
-        # 空は無視したいが、呼び出し側で候補を弾く想定。ここは保険。
-        if not topic_id:
-            topic_id = "_empty_"
-            label = "_empty_"
-        return topic_id, label
+        return _normalize_topic_cached(raw)
 
     # ------------------------------------------------------------
     # internal: dormant / max enforcement
     # ------------------------------------------------------------
 
+    def _add_topic(self, node: TopicNode) -> None:
+        self._topics[node.topic_id] = node
+        self._version += 1
+        self._by_status[node.status][node.topic_id] = None
+        self._touch(node)
+
+    def _set_status(self, node: TopicNode, status: TopicStatus) -> None:
+        if node.status is status:
+            return
+        self._by_status[node.status].pop(node.topic_id, None)
+        self._by_status[status][node.topic_id] = None
+        node.status = status
+
+    def _touch(self, node: TopicNode) -> None:
+        """
+        last_touched_turn を現在ターンに更新し、削除候補 heap に積む。
+        last_touched_turn の書き換えは必ずここを通すこと。
+        """
+        node.last_touched_turn = self._turn_index
+        self._version += 1
+        seq = self._insert_seq.get(node.topic_id)
+        if seq is None:
+            seq = self._insert_seq[node.topic_id] = next(self._seq_counter)
+        heapq.heappush(self._eviction_heap, (self._turn_index, seq, node.topic_id))
+        self._schedule_dormant(node)
+
+        # 古いエントリが溜まりすぎたら現存ノードから作り直す
+        if len(self._eviction_heap) > 4 * max(len(self._topics), self.max_topics):
+            self._eviction_heap = [
+                (t.last_touched_turn, self._insert_seq[t.topic_id], t.topic_id)
+                for t in self._topics.values()
+            ]
+            heapq.heapify(self._eviction_heap)
+
+    def _schedule_dormant(self, node: TopicNode) -> None:
+        """
+        node を「last_touched_turn + dormant_after_turns」の期限バケットに入れ直す。
+        """
+        topic_id = node.topic_id
+        due = node.last_touched_turn + self.dormant_after_turns
+        old = self._dormant_due_of.get(topic_id)
+        if old == due:
+            return
+        if old is not None:
+            self._unschedule_dormant(topic_id)
+        self._dormant_due[due].add(topic_id)
+        self._dormant_due_of[topic_id] = due
+
+    def _unschedule_dormant(self, topic_id: str) -> None:
+        due = self._dormant_due_of.pop(topic_id, None)
+        if due is None:
+            return
+        bucket = self._dormant_due.get(due)
+        if bucket is not None:
+            bucket.discard(topic_id)
+            if not bucket:
+                del self._dormant_due[due]
+
     def _apply_dormant_rules(self) -> None:
         """
         一定ターン触れていない話題を DORMANT に落とす。
         ACTIVE は落とさない。
         REJECTED もそのまま。
-        """
-        for node in self._topics.values():
-            if node.status in (TopicStatus.ACTIVE, TopicStatus.REJECTED):
-                continue
 
-            turns_since = self._turn_index - node.last_touched_turn
-            if turns_since >= self.dormant_after_turns:
-                node.status = TopicStatus.DORMANT
+        期限が来たバケットだけを処理する。
+        ACTIVE / REJECTED はここでバケットから外し、再 touch か
+        ACTIVE からの降格時（set_focus）に入れ直す。
+        """
+        due_turns = [d for d in self._dormant_due if d <= self._turn_index]
+        for due in due_turns:
+            for topic_id in self._dormant_due.pop(due):
+                del self._dormant_due_of[topic_id]
+                node = self._topics.get(topic_id)
+                if node is None:
+                    continue
+                if node.status in (TopicStatus.ACTIVE, TopicStatus.REJECTED):
+                    continue
+                self._set_status(node, TopicStatus.DORMANT)
 
     def _enforce_max_topics(self) -> None:
         """
@@ -556,33 +732,41 @@ class TopicTracker:
         - REJECTED は残す（再発防止のため）
         - ACTIVE は残す
         - それ以外は古いものから削る
+
+        heap から古い順に取り出す。消えたノード・touch し直されたノードの
+        エントリは捨て、保護対象のエントリは後で積み直す。
+
+        max_topics + slack を超えたときだけ走り、max_topics - slack // 2
+        （最低1件）まで削る。
         """
-        if len(self._topics) <= self.max_topics:
+        slack = self._eviction_slack
+        if len(self._topics) <= self.max_topics + slack:
             return
+        target = max(1, self.max_topics - slack // 2)
+
+        heap = self._eviction_heap
+        kept: List[Tuple[int, int, str]] = []
+
+        while len(self._topics) > target and heap:
+            entry = heapq.heappop(heap)
+            turn, seq, topic_id = entry
+            victim = self._topics.get(topic_id)
+            if (
+                victim is None
+                or victim.last_touched_turn != turn
+                or self._insert_seq[topic_id] != seq
+            ):
+                continue
+
+            # 保護対象（ACTIVE / REJECTED）は残す。状態が変われば再び候補になる
+            if topic_id == self._active_topic_id or victim.status == TopicStatus.REJECTED:
+                kept.append(entry)
+                continue
 
-        # 保護対象
-        protected = set()
-        if self._active_topic_id:
-            protected.add(self._active_topic_id)
-        for t in self._topics.values():
-            if t.status == TopicStatus.REJECTED:
-                protected.add(t.topic_id)
-
-        # 削除候補
-        candidates = [
-            t for t in self._topics.values()
-            if t.topic_id not in protected
-        ]
-        # 古い順
-        candidates.sort(key=lambda t: t.last_touched_turn)
-
-        while len(self._topics) > self.max_topics and candidates:
-            victim = candidates.pop(0)
             # 親のchildrenからも外す（整合性）
             if victim.parent_id and victim.parent_id in self._topics:
                 parent = self._topics[victim.parent_id]
-                if victim.topic_id in parent.children_ids:
-                    parent.children_ids.remove(victim.topic_id)
+                parent.children_ids.pop(victim.topic_id, None)
 
             # 子の親参照を外す（必要なら将来「孤児扱い」もできる）
             for cid in victim.children_ids:
@@ -590,6 +774,13 @@ class TopicTracker:
                     self._topics[cid].parent_id = None
 
             del self._topics[victim.topic_id]
+            self._version += 1
+            del self._by_status[victim.status][victim.topic_id]
+            del self._insert_seq[victim.topic_id]
+            self._unschedule_dormant(victim.topic_id)
+
+        for entry in kept:
+            heapq.heappush(heap, entry)
 
     # ------------------------------------------------------------
     # optional helper: very simple extractor (temporary)
@@ -614,30 +805,12 @@ class TopicTracker:
         if not text:
             return []
 
-        topics: List[str] = []
-        pairs = [("「", "」"), ("『", "』"), ("（", "）")]
-        for l, r in pairs:
-            start = 0
-            while True:
-                i = text.find(l, start)
-                if i < 0:
-                    break
-                j = text.find(r, i + 1)
-                if j < 0:
-                    break
-                inner = text[i + 1 : j].strip()
+        # 重複除去しつつ順序保持（dict の挿入順を使う。最初に出た表記を残す）
+        uniq: Dict[str, str] = {}
+        for pattern in _BRACKET_RES:
+            for m in pattern.finditer(text):
+                inner = m.group(1).strip()
                 if inner:
-                    topics.append(inner)
-                start = j + 1
-
-        # 重複除去しつつ順序保持
-        seen = set()
-        uniq: List[str] = []
-        for t in topics:
-            key = t.strip().lower()
-            if not key or key in seen:
-                continue
-            seen.add(key)
-            uniq.append(t)
+                    uniq.setdefault(inner.lower(), inner)
 
-        return uniq
\ No newline at end of file
+        return list(uniq.values())
\ No newline at end of file
@@ -27,13 +27,18 @@ turn_controller.py
 
 from __future__ import annotations
 
+import os
 from dataclasses import dataclass
 from enum import Enum
-from typing import List, Optional
+from typing import Callable, Dict, Iterable, List, Optional
 
 from .drift_detector import DriftEvent, DriftType
 
 
+# notes（判断理由の説明文）は TURN_DEBUG=1 のときだけ記録する（import 時に一度だけ読む）
+TURN_DEBUG: bool = os.getenv("TURN_DEBUG", "0") == "1"
+
+
 # ============================================================
 # ターン制御モード
 # ============================================================
@@ -66,7 +71,7 @@ class TurnMode(str, Enum):
 # ターン制御指示
 # ============================================================
 
-@dataclass
+@dataclass(slots=True)
 class TurnInstruction:
     """
     LLM に渡す最終制御指示。
@@ -83,7 +88,7 @@ class TurnInstruction:
         ★ 会話モード切替指示（technical / casual 等）
           None の場合は切替なし
     - notes:
-        デバッグ用説明
+        デバッグ用説明（TURN_DEBUG=1 のときだけ記録。それ以外は None）
     """
 
     mode: TurnMode
@@ -91,7 +96,37 @@ class TurnInstruction:
     allow_questions: bool
     max_tokens: int
     switch_conversation_mode: Optional[str]
-    notes: List[str]
+    notes: Optional[List[str]] = None
+
+
+@dataclass(slots=True)
+class _TurnState:
+    """
+    decide() 内で各ドリフトハンドラが書き換える作業用の状態。
+    最後に TurnInstruction に詰め替える。
+    """
+
+    mode: TurnMode = TurnMode.NORMAL
+    allow_speculation: bool = True
+    allow_questions: bool = True
+    max_tokens: int = 300
+    switch_conversation_mode: Optional[str] = None
+    notes: Optional[List[str]] = None
+
+
+_DriftHandler = Callable[[_TurnState, DriftEvent], None]
+
+
+def _add_note(state: _TurnState, msg: str) -> None:
+    """
+    notes に1件追加する（list は最初の1件で作る）。
+    TURN_DEBUG でなければ何もしない。
+    """
+    if not TURN_DEBUG:
+        return
+    if state.notes is None:
+        state.notes = []
+    state.notes.append(msg)
 
 
 # ============================================================
@@ -105,7 +140,15 @@ class TurnController:
     """
 
     def __init__(self) -> None:
-        pass
+        # drift_type → ハンドラ（イベントごとに dict 参照1回で振り分ける）
+        self._handlers: Dict[DriftType, _DriftHandler] = {
+            DriftType.OBJECT_OVERCOMMIT: self._on_object_overcommit,
+            DriftType.ASSUMPTION_LEAP: self._on_assumption_leap,
+            DriftType.DENIAL_IGNORED: self._on_denial_ignored,
+            DriftType.TOPIC_SHIFT: self._on_topic_shift,
+            DriftType.QUESTION_LOOP: self._on_question_loop,
+            DriftType.SPECULATION_CHAIN: self._on_speculation_chain,
+        }
 
     # --------------------------------------------------------
     # main entry
@@ -114,7 +157,7 @@ class TurnController:
     def decide(
         self,
         *,
-        drift_events: List[DriftEvent],
+        drift_events: Iterable[DriftEvent],
     ) -> TurnInstruction:
         """
         ターン制御のメイン関数。
@@ -123,98 +166,107 @@ class TurnController:
         ----
         drift_events:
             DriftDetector が検知したイベント群
+            （1回しか走査しないので DriftDetector.iter_drift() の generator でもよい）
 
         出力
         ----
         TurnInstruction
         """
 
-        notes: List[str] = []
-
-        # デフォルト
-        mode = TurnMode.NORMAL
-        allow_speculation = True
-        allow_questions = True
-        max_tokens = 300
-
-        # ★ NEW：会話モード切替指示
-        switch_conversation_mode: Optional[str] = None
-
-        # ----------------------------------------------------
-        # ドリフト重要度判定
-        # ----------------------------------------------------
-
-        critical = any(ev.severity >= 0.8 for ev in drift_events)
+        # デフォルト（mode=NORMAL / 推測・質問可 / max_tokens=300 / 会話モード切替なし）
+        state = _TurnState()
 
         # ----------------------------------------------------
-        # 個別ドリフト対応
+        # 個別ドリフト対応 + 重要度・件数の集計（1パス）
         # ----------------------------------------------------
 
+        handlers = self._handlers
+        max_severity = 0.0
+        count = 0
         for ev in drift_events:
-            if ev.drift_type == DriftType.OBJECT_OVERCOMMIT:
-                allow_speculation = False
-                notes.append("Disable speculation due to object overcommit")
-
-            if ev.drift_type == DriftType.ASSUMPTION_LEAP:
-                allow_speculation = False
-                notes.append("Prevent assumption leap")
-
-            if ev.drift_type == DriftType.DENIAL_IGNORED:
-                mode = TurnMode.REPAIR
-                allow_questions = False
-                allow_speculation = False
-                max_tokens = 150
-                notes.append("Repair mode due to denial ignored")
-
-            if ev.drift_type == DriftType.TOPIC_SHIFT:
-                # ★ 従来：REFOCUS
-                # ★ 今回：文脈切替として扱う
-                switch_conversation_mode = "casual"
-                notes.append("Conversation mode switch requested (topic shift)")
-
-            if ev.drift_type == DriftType.QUESTION_LOOP:
-                allow_questions = False
-                max_tokens = 180
-                notes.append("Question loop detected, disable questions")
-
-            if ev.drift_type == DriftType.SPECULATION_CHAIN:
-                mode = TurnMode.FACT_ONLY
-                allow_speculation = False
-                allow_questions = False
-                max_tokens = 200
-                notes.append("Speculation chain stopped")
+            count += 1
+            if ev.severity > max_severity:
+                max_severity = ev.severity
+            handler = handlers.get(ev.drift_type)
+            if handler is not None:
+                handler(state, ev)
+
+        critical = max_severity >= 0.8
 
         # ----------------------------------------------------
         # 重大ドリフト時の上書き
         # ----------------------------------------------------
 
         if critical:
-            mode = TurnMode.REPAIR
-            allow_speculation = False
-            allow_questions = False
-            max_tokens = min(max_tokens, 150)
-            notes.append("Critical drift override applied")
+            state.mode = TurnMode.REPAIR
+            state.allow_speculation = False
+            state.allow_questions = False
+            state.max_tokens = min(state.max_tokens, 150)
+            _add_note(state, "Critical drift override applied")
 
             # 修復中は文脈切替を抑止
-            switch_conversation_mode = None
+            state.switch_conversation_mode = None
 
         # ----------------------------------------------------
         # 応答短縮（複数ドリフト同時）
         # ----------------------------------------------------
 
-        if len(drift_events) >= 3:
-            max_tokens = min(max_tokens, 120)
-            notes.append("Multiple drift events, enforce short response")
+        if count >= 3:
+            state.max_tokens = min(state.max_tokens, 120)
+            _add_note(state, "Multiple drift events, enforce short response")
 
         # ----------------------------------------------------
         # 最終決定
         # ----------------------------------------------------
 
         return TurnInstruction(
-            mode=mode,
-            allow_speculation=allow_speculation,
-            allow_questions=allow_questions,
-            max_tokens=max_tokens,
-            switch_conversation_mode=switch_conversation_mode,
-            notes=notes,
-        )
\ No newline at end of file
+            mode=state.mode,
+            allow_speculation=state.allow_speculation,
+            allow_questions=state.allow_questions,
+            max_tokens=state.max_tokens,
+            switch_conversation_mode=state.switch_conversation_mode,
+            notes=state.notes,
+        )
+
+    # --------------------------------------------------------
+    # drift handlers
+    # --------------------------------------------------------
+
+    @staticmethod
+    def _on_object_overcommit(state: _TurnState, ev: DriftEvent) -> None:
+        state.allow_speculation = False
+        _add_note(state, "Disable speculation due to object overcommit")
+
+    @staticmethod
+    def _on_assumption_leap(state: _TurnState, ev: DriftEvent) -> None:
+        state.allow_speculation = False
+        _add_note(state, "Prevent assumption leap")
+
+    @staticmethod
+    def _on_denial_ignored(state: _TurnState, ev: DriftEvent) -> None:
+        state.mode = TurnMode.REPAIR
+        state.allow_questions = False
+        state.allow_speculation = False
+        state.max_tokens = 150
+        _add_note(state, "Repair mode due to denial ignored")
+
+    @staticmethod
+    def _on_topic_shift(state: _TurnState, ev: DriftEvent) -> None:
+        # ★ 従来：REFOCUS
+        # ★ 今回：文脈切替として扱う
+        state.switch_conversation_mode = "casual"
+        _add_note(state, "Conversation mode switch requested (topic shift)")
+
+    @staticmethod
+    def _on_question_loop(state: _TurnState, ev: DriftEvent) -> None:
+        state.allow_questions = False
+        state.max_tokens = 180
+        _add_note(state, "Question loop detected, disable questions")
+
+    @staticmethod
+    def _on_speculation_chain(state: _TurnState, ev: DriftEvent) -> None:
+        state.mode = TurnMode.FACT_ONLY
+        state.allow_speculation = False
+        state.allow_questions = False
+        state.max_tokens = 200
+        _add_note(state, "Speculation chain stopped")
\ No newline at end of file
@@ -10,8 +10,9 @@ LLM（外界）との通信を担当する唯一のモジュール。
 - 出力は「テキストのみ」
 
 .env 依存：
-- OPENAI_API_KEY : OpenAI APIキー（必須）
-- LLM_MODEL      : 使用モデル名（任意）
+- OPENAI_API_KEY       : OpenAI APIキー（必須）
+- LLM_MODEL            : 使用モデル名（任意）
+- LLM_RESPONSE_CACHE   : "1" で同一プロンプトの応答を使い回す（任意・既定は無効）
 
 このモジュールは
 人格OSにとっての「声帯の外側」「外界との喉」。
@@ -19,23 +20,54 @@ LLM（外界）との通信を担当する唯一のモジュール。
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import os
+import random
+import threading
 import time
-from typing import Dict, Optional, List
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, Iterator, Optional, List, Tuple, TypeVar
 
 # -------------------------------------------------
 # .env を明示的に読み込む（cmd / PowerShell 対策）
 # -------------------------------------------------
 from dotenv import load_dotenv
-load_dotenv()
+
+
+@lru_cache(maxsize=1)
+def _ensure_env_loaded() -> None:
+    # 何度呼ばれても .env の読み込みは1回だけ
+    load_dotenv()
+
+
+_ensure_env_loaded()
 
 # -------------------------------------------------
 # OpenAI SDK
 # -------------------------------------------------
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI, RateLimitError
 from openai.types.chat import ChatCompletion
 
 
+# 同一プロンプト（model / max_tokens / system / user が完全一致）の応答を使い回すか
+# ※ テスト等で毎回 API を叩きたい場合は無効のままにする
+LLM_RESPONSE_CACHE: bool = os.getenv("LLM_RESPONSE_CACHE", "0") == "1"
+
+# API キー / 既定モデル名は import 時に一度だけ読む（LLMClient() ごとに環境変数を引かない）
+_OPENAI_KEY: Optional[str] = os.environ.get("OPENAI_API_KEY")
+_DEFAULT_MODEL: str = os.environ.get("LLM_MODEL") or "gpt-5.1-chat-latest"
+
+# retry 間の待ち時間（秒）：上限付き指数バックオフ + full jitter
+_BACKOFF_BASE = 0.25
+_BACKOFF_CAP = 4.0
+# 429 の Retry-After はこの秒数までなら従う（それ以上は待たずに通常のバックオフ）
+_RETRY_AFTER_MAX = 30.0
+
+_T = TypeVar("_T")
+
+
 # =================================================
 # LLM Client
 # =================================================
@@ -60,18 +92,23 @@ class LLMClient:
         max_tokens: int = 512,
         timeout_sec: float = 15.0,
         retry: int = 2,
+        max_cache: int = 512,
+        static_system_prefix: str = "",
     ) -> None:
         """
         初期化。
 
         - APIキーは必ず環境変数から取得
         - モデル名は 引数 → 環境変数 → デフォルト の順で解決
+        - max_cache は応答 cache（LLM_RESPONSE_CACHE=1 のとき）の保持件数
+        - static_system_prefix はセッション中に変わらない system 冒頭部分
+          （generate では常にこの後ろに system を連結する）
         """
 
         # -------------------------
         # API Key（必須）
         # -------------------------
-        api_key = os.getenv("OPENAI_API_KEY")
+        api_key = _OPENAI_KEY
         if not api_key:
             raise RuntimeError(
                 "OPENAI_API_KEY is not set. "
@@ -84,11 +121,8 @@ class LLMClient:
         # 1. 明示的に渡された model
         # 2. .env の LLM_MODEL
         # 3. フォールバック
-        self.model = (
-            model
-            or os.getenv("LLM_MODEL")
-            or "gpt-5.1-chat-latest"
-        )
+        # （2, 3 は import 時に _DEFAULT_MODEL として解決済み）
+        self.model = model or _DEFAULT_MODEL
 
         # -------------------------
         # Generation parameters（人格OS向け）
@@ -104,11 +138,33 @@ class LLMClient:
         self.timeout_sec = timeout_sec
         self.retry = retry
 
+        # -------------------------
+        # Response cache（LRU）
+        # -------------------------
+        # key: (model, max_tokens, system+user の digest) → 応答テキスト
+        # server からは singleton として複数スレッドで共有されるので lock で守る
+        self.max_cache = max_cache
+        self._response_cache: "OrderedDict[Tuple[str, int, bytes], str]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+        # 同期呼び出し用の messages（スレッドごとに1つ作って content だけ差し替える）
+        self._local = threading.local()
+
+        # -------------------------
+        # Static system prefix
+        # -------------------------
+        # OpenAI の prompt cache は「先頭が byte 単位で一致する部分」にしか効かない。
+        # 固定部分を先頭に置き、可変部分（system 引数）は必ずその後ろに足す（append-only）。
+        # ※ str は不変なので、ここで一度入れたら呼び出しごとの確認は不要（差し替えないこと）
+        self._static_system_prefix = static_system_prefix
+
         # -------------------------
         # OpenAI client
         # -------------------------
         # 人格OSが唯一「外界」に触れる場所
         self._client = OpenAI(api_key=api_key)
+        # agenerate 用（1ターン内の独立した呼び出しを asyncio.gather で並べる）
+        self._aclient = AsyncOpenAI(api_key=api_key)
 
     # =================================================
     # public API
@@ -125,37 +181,240 @@ class LLMClient:
         LLM からのテキスト応答を返す。
 
         人格OSが呼ぶ唯一の関数。
+
+        LLM_RESPONSE_CACHE=1 の場合、同一プロンプトへの応答は
+        API を呼ばずに cache から返す。
+
+        static_system_prefix が設定されている場合、system は可変部分として
+        その後ろに連結される（呼び出し側は固定部分を system に含めないこと）。
         """
 
-        # -------------------------
-        # messages 構造（OpenAI 標準）
-        # -------------------------
-        messages: List[Dict[str, str]] = [
-            {"role": "system", "content": system},
-            {"role": "user", "content": user},
-        ]
+        system = self._compose_system(system)
+
+        cache_key: Optional[Tuple[str, int, bytes]] = None
+        if LLM_RESPONSE_CACHE and self.max_cache > 0:
+            cache_key = self._cache_key(system, user)
+            cached = self._cached_response(cache_key)
+            if cached is not None:
+                return cached
+
+        messages = self._reuse_messages(system, user)
+
+        completion = self._with_retry(
+            lambda: self._call_llm(messages),
+            "LLM call failed after retries",
+        )
+        text = self._extract_text(completion)
+        # 空応答は失敗に近いので cache しない
+        if cache_key is not None and text:
+            self._store_response(cache_key, text)
+        return text
+
+    async def agenerate(
+        self,
+        *,
+        system: str,
+        user: str,
+    ) -> str:
+        """
+        generate の async 版（AsyncOpenAI 経由）。
+
+        1ターン内で独立した LLM 呼び出しが複数ある場合に
+        asyncio.gather で並べて待ち時間を重ねるためのもの。
+        prefix / cache / retry の扱いは generate と同じ。
+        """
+
+        system = self._compose_system(system)
+
+        cache_key: Optional[Tuple[str, int, bytes]] = None
+        if LLM_RESPONSE_CACHE and self.max_cache > 0:
+            cache_key = self._cache_key(system, user)
+            cached = self._cached_response(cache_key)
+            if cached is not None:
+                return cached
+
+        messages = self._build_messages(system, user)
+
+        completion = await self._awith_retry(
+            lambda: self._aclient.chat.completions.create(**self._build_kwargs(messages)),
+            "LLM call failed after retries",
+        )
+        text = self._extract_text(completion)
+        if cache_key is not None and text:
+            self._store_response(cache_key, text)
+        return text
+
+    def generate_stream(
+        self,
+        *,
+        system: str,
+        user: str,
+    ) -> Iterator[str]:
+        """
+        generate のストリーミング版。応答テキストを届いた断片ごとに yield する。
+
+        - retry するのはストリームを開くところまで
+          （途中で切れた場合は例外をそのまま送出する。呼び出し側でやり直す）
+        - 断片は加工しない（先頭/末尾の空白も含めてそのまま返す）
+        - LLM_RESPONSE_CACHE=1 なら cache ヒット時は1断片で返し、
+          最後まで読み切った応答は generate と同じ形（strip 済み）で cache する
+        """
+
+        system = self._compose_system(system)
+
+        cache_key: Optional[Tuple[str, int, bytes]] = None
+        if LLM_RESPONSE_CACHE and self.max_cache > 0:
+            cache_key = self._cache_key(system, user)
+            cached = self._cached_response(cache_key)
+            if cached is not None:
+                yield cached
+                return
 
+        messages = self._reuse_messages(system, user)
+
+        stream = self._with_retry(
+            lambda: self._client.chat.completions.create(
+                **self._build_kwargs(messages),
+                stream=True,
+            ),
+            "LLM stream open failed after retries",
+        )
+
+        parts: List[str] = []
+        for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta
+            content = delta.content if delta else None
+            if content:
+                if cache_key is not None:
+                    parts.append(content)
+                yield content
+
+        if cache_key is not None:
+            text = "".join(parts).strip()
+            if text:
+                self._store_response(cache_key, text)
+
+    # =================================================
+    # internal
+    # =================================================
+
+    def _with_retry(self, call: Callable[[], _T], failure_message: str) -> _T:
+        """
+        call を最大 retry + 1 回試す。全て失敗したら RuntimeError。
+        """
         last_error: Optional[Exception] = None
 
-        # -------------------------
-        # retry loop
-        # -------------------------
         for attempt in range(self.retry + 1):
             try:
-                completion = self._call_llm(messages)
-                return self._extract_text(completion)
+                return call()
 
             except Exception as e:
                 last_error = e
-                # 軽いバックオフ（人格OSに揺れを伝播させない）
-                time.sleep(0.5 * (attempt + 1))
+                # 最後の試行の後は待たない
+                if attempt < self.retry:
+                    time.sleep(self._backoff_delay(attempt, e))
 
         # 全試行失敗時
-        raise RuntimeError("LLM call failed after retries") from last_error
+        raise RuntimeError(failure_message) from last_error
 
-    # =================================================
-    # internal
-    # =================================================
+    async def _awith_retry(
+        self,
+        coro_factory: Callable[[], Awaitable[_T]],
+        failure_message: str,
+    ) -> _T:
+        """
+        _with_retry の async 版（待ちは asyncio.sleep でイベントループを止めない）。
+        """
+        last_error: Optional[Exception] = None
+
+        for attempt in range(self.retry + 1):
+            try:
+                return await coro_factory()
+
+            except Exception as e:
+                last_error = e
+                if attempt < self.retry:
+                    await asyncio.sleep(self._backoff_delay(attempt, e))
+
+        raise RuntimeError(failure_message) from last_error
+
+    @staticmethod
+    def _build_messages(system: str, user: str) -> List[Dict[str, str]]:
+        """
+        messages 構造（OpenAI 標準）
+        """
+        return [
+            {"role": "system", "content": system},
+            {"role": "user", "content": user},
+        ]
+
+    def _reuse_messages(self, system: str, user: str) -> List[Dict[str, str]]:
+        """
+        同期呼び出し用：スレッドごとの messages を使い回し、content だけ差し替える。
+
+        SDK はリクエスト送信時に messages をシリアライズするので、
+        create() が戻った後に書き換えても問題ない。
+        ※ 同一スレッド上で呼び出しが交互に進む agenerate では使わないこと
+        """
+        messages = getattr(self._local, "messages", None)
+        if messages is None:
+            messages = self._local.messages = self._build_messages(system, user)
+            return messages
+        messages[0]["content"] = system
+        messages[1]["content"] = user
+        return messages
+
+    def _compose_system(self, system: str) -> str:
+        """
+        static_system_prefix を先頭に付けた system を返す。
+        """
+        prefix = self._static_system_prefix
+        if not prefix:
+            return system
+        return prefix + "\n" + system if system else prefix
+
+    def _cached_response(self, key: Tuple[str, int, bytes]) -> Optional[str]:
+        with self._cache_lock:
+            cached = self._response_cache.get(key)
+            if cached is not None:
+                self._response_cache.move_to_end(key)
+            return cached
+
+    @staticmethod
+    def _backoff_delay(attempt: int, error: Exception) -> float:
+        """
+        retry 前の待ち時間。
+
+        - 429（RateLimitError）で Retry-After があればそれに従う
+        - それ以外は上限付き指数バックオフ + full jitter
+          （同時に失敗した複数リクエストが一斉に再送しないようにばらす）
+        """
+        if isinstance(error, RateLimitError):
+            retry_after = _parse_retry_after(error)
+            if retry_after is not None:
+                return retry_after
+        return random.uniform(0.0, min(_BACKOFF_CAP, _BACKOFF_BASE * (2 ** attempt)))
+
+    def _cache_key(self, system: str, user: str) -> Tuple[str, int, bytes]:
+        """
+        応答 cache の key。
+        プロンプト本文は長いので digest にして保持する。
+        """
+        h = hashlib.blake2b(digest_size=16)
+        h.update(system.encode("utf-8"))
+        h.update(b"\0")
+        h.update(user.encode("utf-8"))
+        return self.model, self.max_tokens, h.digest()
+
+    def _store_response(self, key: Tuple[str, int, bytes], text: str) -> None:
+        with self._cache_lock:
+            cache = self._response_cache
+            cache[key] = text
+            cache.move_to_end(key)
+            while len(cache) > self.max_cache:
+                cache.popitem(last=False)
 
     def _call_llm(self, messages: List[Dict[str, str]]) -> ChatCompletion:
         """
@@ -167,11 +426,17 @@ class LLMClient:
 
         👉 人格OSはこの事情を一切知らなくてよい
         """
+        return self._client.chat.completions.create(**self._build_kwargs(messages))
+
+    def _build_kwargs(self, messages: List[Dict[str, str]]) -> Dict[str, Any]:
+        """
+        chat.completions.create に渡す引数（stream 以外）を組み立てる。
+        """
 
         # -------------------------
         # 共通引数（全モデル共通）
         # -------------------------
-        kwargs = {
+        kwargs: Dict[str, Any] = {
             "model": self.model,
             "messages": messages,
             # 🔵 新仕様：max_tokens → max_completion_tokens
@@ -191,7 +456,7 @@ class LLMClient:
         # if self.temperature != 1.0:
         #     kwargs["temperature"] = self.temperature
 
-        return self._client.chat.completions.create(**kwargs)
+        return kwargs
 
     def _extract_text(self, completion: ChatCompletion) -> str:
         """
@@ -208,4 +473,28 @@ class LLMClient:
         if not message or not message.content:
             return ""
 
-        return message.content.strip()
\ No newline at end of file
+        return message.content.strip()
+
+
+def _parse_retry_after(error: RateLimitError) -> Optional[float]:
+    """
+    RateLimitError のレスポンスヘッダから Retry-After（秒）を取り出す。
+    取れない・HTTP-date 形式・長すぎる場合は None。
+    """
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+
+    value = headers.get("retry-after")
+    if not value:
+        return None
+
+    try:
+        seconds = float(value)
+    except ValueError:
+        return None
+
+    if seconds < 0 or seconds > _RETRY_AFTER_MAX:
+        return None
+    return seconds
\ No newline at end of file
@@ -23,6 +23,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from enum import Enum
+from typing import FrozenSet, Optional
 
 # state 実装差分に備える
 try:
@@ -33,6 +34,7 @@ except Exception:  # pragma: no cover
     Phase = None  # type: ignore
 
 from core.intent import IntentResult
+from memory.markers import TRIVIAL_STRINGS, scan
 from memory.salience import SalienceResult
 
 
@@ -89,25 +91,6 @@ class BoundaryEvaluator:
     ※ 判断のみ行い、制御・生成は行わない
     """
 
-    def __init__(self) -> None:
-        # 明示的拒否・境界宣言
-        self._explicit_boundary_markers = [
-            "それ以上は",
-            "触れないで",
-            "言いたくない",
-            "詮索しないで",
-            "深掘りしないで",
-        ]
-
-        # 危険な踏み込みになりやすい語
-        # ※ 治療・介入は行わない前提
-        self._danger_zone_markers = [
-            "死にたい",
-            "消えたい",
-            "終わりにしたい",
-            "自傷",
-        ]
-
     # =========================
     # public API
     # =========================
@@ -119,14 +102,21 @@ class BoundaryEvaluator:
         intent: IntentResult,
         salience: SalienceResult,
         user_text: str,
+        hits: Optional[FrozenSet[str]] = None,
     ) -> BoundaryResult:
         """
         境界レベルを決定する。
 
         入力は必ず「解析済み」のものを受け取る。
+        hits は同じ user_text に対する markers.scan() の結果（任意）。
         """
         text = (user_text or "").strip()
 
+        # 入力オブジェクトの属性は最初に一度だけ読む
+        score = float(getattr(salience, "score", 0.0))
+        phase = getattr(state, "phase", None)
+        kind = getattr(intent, "kind", None)
+
         # 空入力は安全に表層へ（サーバ側で弾かれていても保険）
         if not text:
             return BoundaryResult(
@@ -134,10 +124,15 @@ class BoundaryEvaluator:
                 reason="empty_text",
             )
 
+        # 明示的境界は誤検知より見逃し防止を優先（単純な部分一致）
+        # （相槌だけの発言はマーカーを含み得ないので走査しない）
+        if hits is None:
+            hits = frozenset() if text in TRIVIAL_STRINGS else scan(text)
+
         # -------------------------
         # 0) 明示的拒否（最優先）
         # -------------------------
-        if self._contains_any(text, self._explicit_boundary_markers):
+        if "explicit_boundary" in hits:
             return BoundaryResult(
                 level=BoundaryLevel.BLOCK,
                 reason="explicit_boundary_marker",
@@ -146,7 +141,7 @@ class BoundaryEvaluator:
         # -------------------------
         # 1) 危険語検出（深掘り禁止）
         # -------------------------
-        if self._contains_any(text, self._danger_zone_markers):
+        if "danger_zone" in hits:
             return BoundaryResult(
                 level=BoundaryLevel.SURFACE,
                 reason="danger_zone_marker",
@@ -155,7 +150,7 @@ class BoundaryEvaluator:
         # -------------------------
         # 2) salience が低すぎる場合
         # -------------------------
-        if float(getattr(salience, "score", 0.0)) < 0.25:
+        if score < 0.25:
             return BoundaryResult(
                 level=BoundaryLevel.SURFACE,
                 reason="low_salience",
@@ -164,11 +159,9 @@ class BoundaryEvaluator:
         # -------------------------
         # 3) フェーズ別制御（存在する場合のみ）
         # -------------------------
-        phase = getattr(state, "phase", None)
-
         if Phase is not None and phase == Phase.CARE:
             # CARE中でも salience が低ければ浅く
-            if salience.score < 0.5:
+            if score < 0.5:
                 return BoundaryResult(
                     level=BoundaryLevel.SURFACE,
                     reason="care_phase_low_salience",
@@ -188,8 +181,6 @@ class BoundaryEvaluator:
         # -------------------------
         # 4) intent ベース制御
         # -------------------------
-        kind = getattr(intent, "kind", None)
-
         if kind == "smalltalk":
             return BoundaryResult(
                 level=BoundaryLevel.SURFACE,
@@ -197,7 +188,7 @@ class BoundaryEvaluator:
             )
 
         if kind == "consultation":
-            if salience.score >= 0.6:
+            if score >= 0.6:
                 return BoundaryResult(
                     level=BoundaryLevel.DEEP,
                     reason="consultation_high_salience",
@@ -209,7 +200,7 @@ class BoundaryEvaluator:
 
         if kind == "metaphor":
             # 比喩は誤爆しやすいので基本は浅め
-            if salience.score >= 0.7:
+            if score >= 0.7:
                 return BoundaryResult(
                     level=BoundaryLevel.NORMAL,
                     reason="metaphor_high_salience",
@@ -226,19 +217,3 @@ class BoundaryEvaluator:
             level=BoundaryLevel.NORMAL,
             reason="default",
         )
-
-    # =========================
-    # helper
-    # =========================
-
-    def _contains_any(self, text: str, markers: list[str]) -> bool:
-        """
-        単純な部分一致。
-
-        明示的境界は
-        ・誤検知より見逃し防止を優先
-        """
-        for m in markers:
-            if m and m in text:
-                return True
-        return False
\ No newline at end of file
@@ -30,9 +30,11 @@ long_term.py
 
 from __future__ import annotations
 
+import time
+from array import array
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Optional, Sequence, Tuple
 
 from memory.salience import SalienceResult
 
@@ -54,9 +56,17 @@ class LongTermMemoryItem:
     salience_score: float
 
     # メタ情報（後段で使う可能性があるもの）
-    created_at: datetime = field(default_factory=datetime.utcnow)
+    # ※ created_at は UNIX 時刻（秒）。datetime が要るときは created_at_dt で作る
+    created_at: float = field(default_factory=time.time)
     tags: tuple[str, ...] = ()   # まだ使わないが、後で拡張可能
 
+    @property
+    def created_at_dt(self) -> datetime:
+        """
+        created_at の datetime（UTC・naive）。読まれたときにだけ組み立てる。
+        """
+        return datetime.utcfromtimestamp(self.created_at)
+
 
 # =========================
 # Long-term Memory Container
@@ -69,6 +79,13 @@ class LongTermMemory:
     - salience を通過したものだけを保持
     - 明示的に add() されたもの以外は入らない
     - ここから勝手に参照されることはない
+
+    内部表現：
+    - LongTermMemoryItem を1件ずつ持たず、項目ごとの列（SoA）で持つ
+    - 各列は max_items 長のリングバッファ（_cursor が次の書き込み位置）
+    - salience_score 列は array('d') に詰める（score での一括走査用）
+    - created_at 列も UNIX 時刻（秒）の array('d')
+    - LongTermMemoryItem は all_items() など読み出し時にだけ組み立てる
     """
 
     def __init__(
@@ -86,10 +103,18 @@ class LongTermMemory:
             超えた場合は古いものから捨てる（LRU ではない）。
         """
         self._salience_threshold = float(salience_threshold)
-        self._max_items = int(max_items)
+        self._max_items = max(0, int(max_items))
+
+        capacity = self._max_items
+        self._user_texts: List[str] = [""] * capacity
+        self._ai_texts: List[str] = [""] * capacity
+        self._scores: array = array("d", bytes(8 * capacity))
+        self._created_ats: array = array("d", bytes(8 * capacity))
+        self._tags: List[Tuple[str, ...]] = [()] * capacity
 
-        # 実体は単純な配列
-        self._items: List[LongTermMemoryItem] = []
+        # 次に書き込むスロットと、現在の保持件数
+        self._cursor = 0
+        self._size = 0
 
     # =========================
     # public API
@@ -118,23 +143,78 @@ class LongTermMemory:
         if salience.score < self._salience_threshold:
             return False
 
-        item = LongTermMemoryItem(
-            user_text=user_text,
-            ai_text=ai_text,
-            salience_score=salience.score,
-            tags=tuple(tags) if tags else (),
-        )
+        capacity = self._max_items
+        if capacity == 0:
+            return True
 
-        self._items.append(item)
+        # 上限超過時は古いものから捨てる（最古のスロットを上書きする）
+        slot = self._cursor
+        self._user_texts[slot] = user_text
+        self._ai_texts[slot] = ai_text
+        self._scores[slot] = salience.score
+        self._created_ats[slot] = time.time()
+        self._tags[slot] = tuple(tags) if tags else ()
 
-        # 上限超過時は古いものから捨てる
-        if len(self._items) > self._max_items:
-            overflow = len(self._items) - self._max_items
-            if overflow > 0:
-                self._items = self._items[overflow:]
+        self._cursor = (slot + 1) % capacity
+        if self._size < capacity:
+            self._size += 1
 
         return True
 
+    def add_batch(
+        self,
+        *,
+        user_texts: Sequence[str],
+        ai_texts: Sequence[str],
+        scores: Sequence[float],
+        tags: Optional[List[str]] = None,
+    ) -> int:
+        """
+        複数件をまとめて長期記憶に追加する（3つの列は同じ長さ・同じ順序）。
+
+        各行の扱いは add() と同じ（score が閾値未満の行は破棄）。
+        通過した行は列ごとにスライス代入でまとめてリングバッファへ書く。
+        tags は全行に共通で付ける。
+
+        戻り値：
+        - 閾値を通過した件数（上限超過で即座に押し出された分も含む）
+        """
+        threshold = self._salience_threshold
+        keep = [i for i, score in enumerate(scores) if score >= threshold]
+        admitted = len(keep)
+
+        capacity = self._max_items
+        if admitted == 0 or capacity == 0:
+            return admitted
+
+        # 入りきらない分は、書いてもすぐ上書きされるので最初から書かない
+        keep = keep[-capacity:]
+        count = len(keep)
+
+        rows_user = [user_texts[i] for i in keep]
+        rows_ai = [ai_texts[i] for i in keep]
+        rows_score = array("d", (scores[i] for i in keep))
+        created_at = array("d", (time.time(),))
+        row_tags = tuple(tags) if tags else ()
+
+        # 末尾までの区間と、先頭に折り返す区間の高々2回に分けて書く
+        start = self._cursor
+        head = min(count, capacity - start)
+        for begin, lo, hi in ((start, 0, head), (0, head, count)):
+            if lo == hi:
+                continue
+            end = begin + (hi - lo)
+            self._user_texts[begin:end] = rows_user[lo:hi]
+            self._ai_texts[begin:end] = rows_ai[lo:hi]
+            self._scores[begin:end] = rows_score[lo:hi]
+            self._created_ats[begin:end] = created_at * (hi - lo)
+            self._tags[begin:end] = [row_tags] * (hi - lo)
+
+        self._cursor = (start + count) % capacity
+        self._size = min(capacity, self._size + count)
+
+        return admitted
+
     # =========================
     # read-only helpers
     # =========================
@@ -143,16 +223,25 @@ class LongTermMemory:
         """
         現在保持している長期記憶数。
         """
-        return len(self._items)
+        return self._size
 
     def all_items(self) -> List[LongTermMemoryItem]:
         """
-        全件取得。
+        全件取得（古い順）。
 
         ※ 現フェーズではデバッグ・確認用途のみ。
            server / builder から直接使う想定はしない。
         """
-        return list(self._items)
+        return [self._item_at(slot) for slot in self._slots()]
+
+    def filter_by_score(self, threshold: float) -> List[LongTermMemoryItem]:
+        """
+        salience_score が threshold 以上のものだけ取得（古い順）。
+
+        score 列だけを走査し、該当したものだけ LongTermMemoryItem を組み立てる。
+        """
+        scores = self._scores
+        return [self._item_at(slot) for slot in self._slots() if scores[slot] >= threshold]
 
     def clear(self) -> None:
         """
@@ -160,4 +249,33 @@ class LongTermMemory:
 
         テスト・セッションリセット用。
         """
-        self._items.clear()
\ No newline at end of file
+        capacity = self._max_items
+        self._user_texts = [""] * capacity
+        self._ai_texts = [""] * capacity
+        self._tags = [()] * capacity
+        # scores / created_ats は件数で管理しているので中身は残っていてよい
+        self._cursor = 0
+        self._size = 0
+
+    # =========================
+    # internal
+    # =========================
+
+    def _slots(self) -> List[int]:
+        """
+        保持中のスロット番号（古い順）。
+        """
+        capacity = self._max_items
+        if self._size == 0:
+            return []
+        start = (self._cursor - self._size) % capacity
+        return [(start + k) % capacity for k in range(self._size)]
+
+    def _item_at(self, slot: int) -> LongTermMemoryItem:
+        return LongTermMemoryItem(
+            user_text=self._user_texts[slot],
+            ai_text=self._ai_texts[slot],
+            salience_score=self._scores[slot],
+            created_at=self._created_ats[slot],
+            tags=self._tags[slot],
+        )
\ No newline at end of file
@@ -0,0 +1,108 @@
+# persona_core/memory/marker_scanner.py
+"""
+marker_scanner.py
+===========================
+salience / boundary で使う「マーカー語の部分一致判定」をまとめて行う走査器。
+
+目的：
+- 複数のマーカー語グループ（high_signal / danger_zone など）を
+  テキスト1回の走査でまとめて判定する
+- 判定結果は「どのグループの語が1つ以上含まれていたか」だけ
+
+実装：
+- pyahocorasick があれば Aho–Corasick 自動機械（C 実装）で1パス走査
+- 無ければグループごとに事前コンパイルした正規表現（語の選言）で判定する（結果は同じ）
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Dict, FrozenSet, Iterator, List, Sequence, Tuple
+
+# pyahocorasick は任意依存（無くても動く）
+try:
+    import ahocorasick as _ahocorasick  # type: ignore
+except ImportError:  # pragma: no cover
+    _ahocorasick = None
+
+
+MarkerGroups = Sequence[Tuple[str, Sequence[str]]]
+
+
+class MarkerScanner:
+    """
+    (グループ名, マーカー語リスト) の並びから作る走査器。
+
+    - 空文字のマーカーは無視する
+    - 同じ語が複数グループに属していてもよい（例：「前提」）
+    - 同じグループ内の別の語を含む語（「読んで」に対する「全文読んで」など）は
+      判定結果を変えないので、走査対象から外す
+    """
+
+    def __init__(self, groups: MarkerGroups) -> None:
+        self._groups: Tuple[Tuple[str, Tuple[str, ...]], ...] = tuple(
+            (name, _minimal_markers(markers)) for name, markers in groups
+        )
+        self._automaton = _build_automaton(self._groups) if _ahocorasick is not None else None
+
+        # フォールバック用：グループごとに語の選言を1本の正規表現にしておく
+        # （語が無いグループは空パターンが何にでもマッチしてしまうので除く）
+        self._patterns: Tuple[Tuple[str, "re.Pattern[str]"], ...] = tuple(
+            (name, re.compile("|".join(map(re.escape, markers))))
+            for name, markers in self._groups
+            if markers
+        )
+
+    def scan(self, text: str) -> Iterator[str]:
+        """
+        text 中に現れたマーカーのグループ名を yield する。
+
+        - 同じグループ名が複数回出ることがある（呼び出し側は集合として扱う）
+        - 順序は保証しない
+        - generator なので、必要なグループが見つかった時点で打ち切ってよい
+        """
+        if self._automaton is not None:
+            for _, names in self._automaton.iter(text):
+                yield from names
+            return
+
+        for name, pattern in self._patterns:
+            if pattern.search(text) is not None:
+                yield name
+
+    def hits(self, text: str) -> FrozenSet[str]:
+        """
+        text 中に1語以上現れたグループ名の集合。
+        """
+        return frozenset(self.scan(text))
+
+
+def _minimal_markers(markers: Sequence[str]) -> Tuple[str, ...]:
+    """
+    「どれか1語でも含まれるか」の判定に必要な語だけを残す（順序は元のまま）。
+
+    語 m が同じ集合の別の語 s を部分文字列として含むなら、
+    m が現れる箇所には必ず s も現れるので m は不要。
+    """
+    unique = list(dict.fromkeys(m for m in markers if m))
+    return tuple(
+        m for m in unique if not any(s != m and s in m for s in unique)
+    )
+
+
+def _build_automaton(groups: Tuple[Tuple[str, Tuple[str, ...]], ...]):
+    """
+    マーカー語 → 所属グループ名 tuple を値に持つ Aho–Corasick 自動機械を作る。
+    """
+    owners: Dict[str, List[str]] = {}
+    for name, markers in groups:
+        for m in markers:
+            names = owners.setdefault(m, [])
+            if name not in names:
+                names.append(name)
+
+    automaton = _ahocorasick.Automaton()
+    for marker, names in owners.items():
+        automaton.add_word(marker, tuple(names))
+    automaton.make_automaton()
+    return automaton
\ No newline at end of file
@@ -0,0 +1,135 @@
+# persona_core/memory/markers.py
+"""
+markers.py
+===========================
+salience / boundary が見るマーカー語の定義と、その共有走査器。
+
+目的：
+- 両 evaluator のマーカー語を1か所にまとめる
+- 1ターンの user_text を1回だけ走査し、結果（グループ名の集合）を両方に渡せるようにする
+
+使い方：
+    hits = scan(text)
+    salience_eval.evaluate(text, ..., hits=hits)
+    boundary_eval.evaluate(..., user_text=text, hits=hits)
+
+※ hits を渡さなければ各 evaluator が自分で scan() する（結果は同じ）
+"""
+
+from __future__ import annotations
+
+from typing import FrozenSet
+
+from memory.marker_scanner import MarkerScanner
+
+
+# =========================
+# salience 用
+# =========================
+
+# 会話の核になりやすい語
+HIGH_SIGNAL_KEYWORDS = (
+    "助けて",
+    "相談",
+    "悩み",
+    "不安",
+    "怖い",
+    "つらい",
+    "苦しい",
+    "限界",
+    "死にそう",
+    "やばい",
+    "本題",
+    "結論",
+    "要するに",
+    "大事",
+)
+
+# 意思決定・方針固定を示す語
+COMMITMENT_KEYWORDS = (
+    "やる",
+    "決めた",
+    "進める",
+    "方針",
+    "ルール",
+    "前提",
+    "必須",
+    "固定",
+)
+
+# 記憶参照・継続性トリガー
+MEMORY_TRIGGER_KEYWORDS = (
+    "前に",
+    "さっき",
+    "この前",
+    "覚えて",
+    "記憶",
+    "引き継ぎ",
+    "前提",
+)
+
+# 明確な雑談マーカー
+SMALLTALK_MARKERS = (
+    "w",
+    "笑",
+    "草",
+    "うける",
+    "眠い",
+    "腹減った",
+    "暇",
+)
+
+
+# =========================
+# boundary 用
+# =========================
+
+# 明示的拒否・境界宣言
+EXPLICIT_BOUNDARY_MARKERS = (
+    "それ以上は",
+    "触れないで",
+    "言いたくない",
+    "詮索しないで",
+    "深掘りしないで",
+)
+
+# 危険な踏み込みになりやすい語
+# ※ 治療・介入は行わない前提
+DANGER_ZONE_MARKERS = (
+    "死にたい",
+    "消えたい",
+    "終わりにしたい",
+    "自傷",
+)
+
+
+# それ単体で1発言になっている場合は走査せずに即決してよい語
+# ※ boundary 側のマーカーを含む語は入れないこと
+TRIVIAL_STRINGS: FrozenSet[str] = frozenset({"w", "笑", "草", "うける"})
+
+
+# =========================
+# 共有走査器
+# =========================
+
+_SCANNER = MarkerScanner(
+    (
+        ("high_signal", HIGH_SIGNAL_KEYWORDS),
+        ("commitment", COMMITMENT_KEYWORDS),
+        ("memory_trigger", MEMORY_TRIGGER_KEYWORDS),
+        ("smalltalk", SMALLTALK_MARKERS),
+        ("explicit_boundary", EXPLICIT_BOUNDARY_MARKERS),
+        ("danger_zone", DANGER_ZONE_MARKERS),
+    )
+)
+
+
+def scan(text: str) -> FrozenSet[str]:
+    """
+    text 中に1語以上現れたマーカーグループ名の集合。
+
+    グループ名：
+    high_signal / commitment / memory_trigger / smalltalk /
+    explicit_boundary / danger_zone
+    """
+    return _SCANNER.hits(text)
\ No newline at end of file
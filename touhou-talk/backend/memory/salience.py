@@ -17,11 +17,23 @@ salience.py
 
 from __future__ import annotations
 
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Literal, Optional
+from itertools import product
+from typing import Dict, FrozenSet, Literal, Optional, Tuple
+
+from memory.markers import TRIVIAL_STRINGS, scan
 
 Role = Literal["user", "assistant"]
 
+# evaluate 結果 cache の保持件数と、cache に入れる最小文字数
+# （短文は計算が軽いので cache を荒らさないよう入れない）
+_CACHE_MAXSIZE = 1024
+_CACHE_MIN_LENGTH = 16
+
+_CacheKey = Tuple[str, str, Optional[str], bool]
+
 
 # =========================
 # 結果型
@@ -54,6 +66,10 @@ class SalienceResult:
         return self.score >= 0.5
 
 
+# 相槌だけの発言（"w" / "笑" など）の固定結果
+_TRIVIAL_RESULT = SalienceResult(score=0.10, reasons=("trivial_token",))
+
+
 # =========================
 # Salience Evaluator
 # =========================
@@ -68,57 +84,11 @@ class SalienceEvaluator:
     """
 
     def __init__(self) -> None:
-        # 会話の核になりやすい語
-        self._high_signal_keywords = [
-            "助けて",
-            "相談",
-            "悩み",
-            "不安",
-            "怖い",
-            "つらい",
-            "苦しい",
-            "限界",
-            "死にそう",
-            "やばい",
-            "本題",
-            "結論",
-            "要するに",
-            "大事",
-        ]
-
-        # 意思決定・方針固定を示す語
-        self._commitment_keywords = [
-            "やる",
-            "決めた",
-            "進める",
-            "方針",
-            "ルール",
-            "前提",
-            "必須",
-            "固定",
-        ]
-
-        # 記憶参照・継続性トリガー
-        self._memory_trigger_keywords = [
-            "前に",
-            "さっき",
-            "この前",
-            "覚えて",
-            "記憶",
-            "引き継ぎ",
-            "前提",
-        ]
-
-        # 明確な雑談マーカー
-        self._smalltalk_markers = [
-            "w",
-            "笑",
-            "草",
-            "うける",
-            "眠い",
-            "腹減った",
-            "暇",
-        ]
+        # (raw, role, intent_kind, is_metaphor) → 結果（LRU）
+        # SalienceResult は frozen なのでそのまま共有してよい
+        # server からは singleton として複数スレッドで使われるので lock で守る
+        self._cache: "OrderedDict[_CacheKey, SalienceResult]" = OrderedDict()
+        self._cache_lock = threading.Lock()
 
     # =========================
     # public API
@@ -131,116 +101,266 @@ class SalienceEvaluator:
         role: Role = "user",
         intent_kind: Optional[str] = None,
         is_metaphor: bool = False,
+        hits: Optional[FrozenSet[str]] = None,
     ) -> SalienceResult:
         """
         発言テキストから salience を算出する。
 
         intent_kind は補助情報としてのみ使用し、
         判定の主軸はあくまでテキスト信号とする。
+
+        hits:
+            呼び出し側で同じ text に対して markers.scan() 済みならその結果。
+            渡されればここでは走査しない。
         """
         raw = text.strip()
         if not raw:
             return SalienceResult(score=0.0, reasons=("empty",))
 
-        # ベースライン（前振り・文脈維持用）
-        score = 0.30
-        reasons: list[str] = []
-
-        # -------------------------
-        # 1) 長さ・構造
-        # -------------------------
-        length = len(raw)
-        if length >= 120:
-            score += 0.10
-            reasons.append("long_text")
-        elif length <= 12:
-            # 相談文脈では短さを理由に落としすぎない
-            if intent_kind != "consultation":
-                score -= 0.05
-                reasons.append("very_short")
-
-        if raw.count("\n") >= 2:
-            score += 0.10
-            reasons.append("structured_lines")
-
-        # -------------------------
-        # 2) 質問シグナル
-        # -------------------------
-        if "?" in raw or "？" in raw:
-            score += 0.08
-            reasons.append("question")
-
-        # -------------------------
-        # 3) キーワード群
-        # -------------------------
-        if self._contains_any(raw, self._high_signal_keywords):
-            score += 0.25
-            reasons.append("high_signal_keyword")
-
-        if self._contains_any(raw, self._commitment_keywords):
-            score += 0.20
-            reasons.append("commitment_keyword")
-
-        if self._contains_any(raw, self._memory_trigger_keywords):
-            score += 0.15
-            reasons.append("memory_trigger_keyword")
-
-        # -------------------------
-        # 4) intent 補正
-        # -------------------------
-        if intent_kind == "consultation":
-            score += 0.15
-            reasons.append("intent_consultation")
-
-        if intent_kind == "smalltalk":
-            score -= 0.10
-            reasons.append("intent_smalltalk")
-
-        if intent_kind == "metaphor" or is_metaphor:
-            score += 0.06
-            reasons.append("intent_metaphor")
-
-        # -------------------------
-        # 5) role 補正
-        # -------------------------
-        if role == "assistant":
+        # 「w」「笑」だけの発言はキーワード走査も cache も通さない
+        if raw in TRIVIAL_STRINGS:
+            return _TRIVIAL_RESULT
+
+        # 同じ発言が Boundary / LongTerm / Session から繰り返し評価されるので cache する
+        if len(raw) < _CACHE_MIN_LENGTH:
+            return self._evaluate(raw, role, intent_kind, is_metaphor, hits)
+
+        key: _CacheKey = (raw, role, intent_kind, bool(is_metaphor))
+        with self._cache_lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                return cached
+
+        result = self._evaluate(raw, role, intent_kind, is_metaphor, hits)
+
+        with self._cache_lock:
+            self._cache[key] = result
+            if len(self._cache) > _CACHE_MAXSIZE:
+                self._cache.popitem(last=False)
+        return result
+
+    def _evaluate(
+        self,
+        raw: str,
+        role: Role,
+        intent_kind: Optional[str],
+        is_metaphor: bool,
+        hits: Optional[FrozenSet[str]],
+    ) -> SalienceResult:
+        """
+        evaluate の本体（raw は strip 済み・空でない）。
+
+        テキストからは信号（真偽値・長さ区分）だけを取り出し、
+        スコア計算は _score_signals に任せる。
+        """
+        length_class, structured, question = _text_signals(raw)
+        if hits is None:
+            hits = scan(raw)
+
+        return _score_signals(
+            length_class,
+            structured,
+            question,
+            "high_signal" in hits,
+            "commitment" in hits,
+            "memory_trigger" in hits,
+            "smalltalk" in hits,
+            intent_kind if intent_kind in _SCORED_INTENT_KINDS else None,
+            role == "assistant",
+            bool(is_metaphor),
+        )
+
+
+# =========================
+# スコア計算
+# =========================
+
+_LENGTH_SHORT = 0
+_LENGTH_NORMAL = 1
+_LENGTH_LONG = 2
+
+# スコアに影響する intent_kind（それ以外は None と同じ扱い）
+_SCORED_INTENT_KINDS = frozenset({"consultation", "smalltalk", "metaphor"})
+
+
+def _text_signals(raw: str) -> Tuple[int, bool, bool]:
+    """
+    キーワード以外のテキスト信号（長さ区分, 構造化, 質問）。
+    """
+    length = len(raw)
+    if length >= 120:
+        length_class = _LENGTH_LONG
+    elif length <= 12:
+        length_class = _LENGTH_SHORT
+    else:
+        length_class = _LENGTH_NORMAL
+
+    # 改行は「2つ以上あるか」だけ分かればよいので、2つ目が見つかった時点で止める
+    # （1文字ずつの Python ループにまとめるより、C 実装の find / in の方が速い）
+    structured = raw.find("\n", raw.find("\n") + 1) != -1
+
+    return length_class, structured, "?" in raw or "？" in raw
+
+
+def _compute_score(
+    length_class: int,
+    structured: bool,
+    question: bool,
+    high_signal: bool,
+    commitment: bool,
+    memory_trigger: bool,
+    smalltalk: bool,
+    intent_kind: Optional[str],
+    is_assistant: bool,
+    is_metaphor: bool,
+) -> SalienceResult:
+    """
+    信号の組からスコアと理由を決める。
+
+    入力は有限個の離散値（3 × 2^6 × 4 × 2^2 = 3072 通り）なので、
+    import 時に全組を計算して _SCORE_TABLE に載せておく（実行時は表引きのみ）。
+    ※ 加算の順序は変えないこと（浮動小数の丸めで結果が変わる）
+    """
+    # ベースライン（前振り・文脈維持用）
+    score = 0.30
+    reasons: list[str] = []
+
+    # -------------------------
+    # 1) 長さ・構造
+    # -------------------------
+    if length_class == _LENGTH_LONG:
+        score += 0.10
+        reasons.append("long_text")
+    elif length_class == _LENGTH_SHORT:
+        # 相談文脈では短さを理由に落としすぎない
+        if intent_kind != "consultation":
             score -= 0.05
-            reasons.append("assistant_bias_down")
-
-        # -------------------------
-        # 6) 明確な雑談マーカー
-        # -------------------------
-        if self._contains_any(raw, self._smalltalk_markers):
-            score -= 0.08
-            reasons.append("smalltalk_marker")
-
-        # -------------------------
-        # 7) 相談文脈の最低保証
-        # -------------------------
-        if (
-            intent_kind == "consultation"
-            and "high_signal_keyword" in reasons
-            and score < 0.45
-        ):
-            score = 0.45
-            reasons.append("consultation_floor")
-
-        score = self._clamp(score, 0.0, 1.0)
-        return SalienceResult(score=score, reasons=tuple(reasons))
+            reasons.append("very_short")
+
+    if structured:
+        score += 0.10
+        reasons.append("structured_lines")
+
+    # -------------------------
+    # 2) 質問シグナル
+    # -------------------------
+    if question:
+        score += 0.08
+        reasons.append("question")
+
+    # -------------------------
+    # 3) キーワード群
+    # -------------------------
+    if high_signal:
+        score += 0.25
+        reasons.append("high_signal_keyword")
+
+    if commitment:
+        score += 0.20
+        reasons.append("commitment_keyword")
+
+    if memory_trigger:
+        score += 0.15
+        reasons.append("memory_trigger_keyword")
+
+    # -------------------------
+    # 4) intent 補正
+    # -------------------------
+    if intent_kind == "consultation":
+        score += 0.15
+        reasons.append("intent_consultation")
+
+    if intent_kind == "smalltalk":
+        score -= 0.10
+        reasons.append("intent_smalltalk")
+
+    if intent_kind == "metaphor" or is_metaphor:
+        score += 0.06
+        reasons.append("intent_metaphor")
+
+    # -------------------------
+    # 5) role 補正
+    # -------------------------
+    if is_assistant:
+        score -= 0.05
+        reasons.append("assistant_bias_down")
+
+    # -------------------------
+    # 6) 明確な雑談マーカー
+    # -------------------------
+    if smalltalk:
+        score -= 0.08
+        reasons.append("smalltalk_marker")
+
+    # -------------------------
+    # 7) 相談文脈の最低保証
+    # -------------------------
+    if (
+        intent_kind == "consultation"
+        and high_signal
+        and score < 0.45
+    ):
+        score = 0.45
+        reasons.append("consultation_floor")
+
+    score = 0.0 if score < 0.0 else 1.0 if score > 1.0 else score
+    return SalienceResult(score=score, reasons=tuple(reasons))
+
+
+_SignalKey = Tuple[int, bool, bool, bool, bool, bool, bool, Optional[str], bool, bool]
+
+
+def _build_score_table() -> Dict[_SignalKey, SalienceResult]:
+    """
+    全信号組 → SalienceResult の表を作る（数 ms・import 時に1回だけ）。
 
-    # =========================
-    # helper
-    # =========================
+    lru_cache と違って初回呼び出し時の計算が無いので、
+    どの発言でも評価コストが揃う。
+    """
+    table: Dict[_SignalKey, SalienceResult] = {}
+    bools = (False, True)
+    for length_class in (_LENGTH_SHORT, _LENGTH_NORMAL, _LENGTH_LONG):
+        for flags in product(bools, repeat=6):
+            for intent_kind in (None, *sorted(_SCORED_INTENT_KINDS)):
+                for is_assistant in bools:
+                    for is_metaphor in bools:
+                        key = (length_class, *flags, intent_kind, is_assistant, is_metaphor)
+                        table[key] = _compute_score(*key)
+    return table
+
+
+_SCORE_TABLE = _build_score_table()
+
+
+def _score_signals(
+    length_class: int,
+    structured: bool,
+    question: bool,
+    high_signal: bool,
+    commitment: bool,
+    memory_trigger: bool,
+    smalltalk: bool,
+    intent_kind: Optional[str],
+    is_assistant: bool,
+    is_metaphor: bool,
+) -> SalienceResult:
+    """
+    信号の組に対応する SalienceResult（_SCORE_TABLE の表引き）。
 
-    def _contains_any(self, text: str, keywords: list[str]) -> bool:
-        for k in keywords:
-            if k in text:
-                return True
-        return False
-
-    def _clamp(self, v: float, lo: float, hi: float) -> float:
-        if v < lo:
-            return lo
-        if v > hi:
-            return hi
-        return v
\ No newline at end of file
+    intent_kind は _SCORED_INTENT_KINDS か None に正規化して渡すこと。
+    """
+    return _SCORE_TABLE[
+        (
+            length_class,
+            structured,
+            question,
+            high_signal,
+            commitment,
+            memory_trigger,
+            smalltalk,
+            intent_kind,
+            is_assistant,
+            is_metaphor,
+        )
+    ]
\ No newline at end of file
@@ -15,8 +15,10 @@ session.py
 - 永続化しない
 """
 
+import sys
+from collections import deque
 from dataclasses import dataclass, field
-from typing import List, Literal, Dict, Optional
+from typing import Deque, List, Literal, Dict, Optional, Tuple
 
 
 # =========================
@@ -32,18 +34,24 @@ Phase = Literal["explore", "discuss", "work", "review"]
 ConversationMode = Literal["technical", "casual"]
 
 
-@dataclass
+@dataclass(slots=True)
 class Message:
     """
     会話1発言分の構造。
 
     axis:
         いつの話か（意味付けはしない）
+
+    role / axis は取り得る値が数個しかないので intern して全発言で共有する。
     """
     role: Role
     content: str
     axis: TimeAxis = "present"
 
+    def __post_init__(self) -> None:
+        self.role = sys.intern(self.role)
+        self.axis = sys.intern(self.axis)
+
 
 # =========================
 # Session Memory 本体
@@ -61,16 +69,31 @@ class SessionMemory:
     max_turns: int = 6
 
     # mode 別メッセージバッファ
-    buffers: Dict[ConversationMode, List[Message]] = field(
+    # （maxlen 付き deque。maxlen は phase に応じて _trim で決める）
+    buffers: Dict[ConversationMode, Deque[Message]] = field(
         default_factory=lambda: {
-            "technical": [],
-            "casual": [],
+            "technical": deque(),
+            "casual": deque(),
         }
     )
 
     # 現在の会話モード（外部から明示的に切替）
     current_mode: ConversationMode = "technical"
 
+    # mode 別：これまでに append した通し番号（= 追加件数）
+    _appended: Dict[ConversationMode, int] = field(
+        default_factory=dict, init=False, repr=False
+    )
+
+    # mode 別：最後の user / assistant 発言の (通し番号, content)
+    # 通し番号からバッファにまだ残っているかを O(1) で判定できる
+    _last_user: Dict[ConversationMode, Tuple[int, str]] = field(
+        default_factory=dict, init=False, repr=False
+    )
+    _last_assistant: Dict[ConversationMode, Tuple[int, str]] = field(
+        default_factory=dict, init=False, repr=False
+    )
+
     # =========================
     # 追加系 API
     # =========================
@@ -93,14 +116,16 @@ class SessionMemory:
         """
         ユーザー発言を追加。
         """
+        self._trim(phase=phase)
+        content = text.strip()
         self._current_buffer().append(
             Message(
                 role="user",
-                content=text.strip(),
+                content=content,
                 axis=axis,
             )
         )
-        self._trim(phase=phase)
+        self._last_user[self.current_mode] = (self._count_appended(), content)
 
     def add_assistant(
         self,
@@ -112,14 +137,16 @@ class SessionMemory:
         """
         AI応答を追加。
         """
+        self._trim(phase=phase)
+        content = text.strip()
         self._current_buffer().append(
             Message(
                 role="assistant",
-                content=text.strip(),
+                content=content,
                 axis=axis,
             )
         )
-        self._trim(phase=phase)
+        self._last_assistant[self.current_mode] = (self._count_appended(), content)
 
     # =========================
     # 取得系 API
@@ -149,24 +176,40 @@ class SessionMemory:
         ]
 
     def get_last_user_message(self) -> Optional[str]:
-        for m in reversed(self._current_buffer()):
-            if m.role == "user":
-                return m.content
-        return None
+        return self._last_if_retained(self._last_user.get(self.current_mode))
 
     def get_last_assistant_message(self) -> Optional[str]:
-        for m in reversed(self._current_buffer()):
-            if m.role == "assistant":
-                return m.content
-        return None
+        return self._last_if_retained(self._last_assistant.get(self.current_mode))
 
     # =========================
     # 内部処理
     # =========================
 
-    def _current_buffer(self) -> List[Message]:
+    def _current_buffer(self) -> Deque[Message]:
         return self.buffers[self.current_mode]
 
+    def _count_appended(self) -> int:
+        """
+        現在モードの追加件数を1進め、今追加した発言の通し番号を返す。
+        """
+        seq = self._appended.get(self.current_mode, 0) + 1
+        self._appended[self.current_mode] = seq
+        return seq
+
+    def _last_if_retained(self, last: Optional[Tuple[int, str]]) -> Optional[str]:
+        """
+        (通し番号, content) が現在モードのバッファにまだ残っていれば content を返す。
+
+        バッファは古い方からしか捨てないので、
+        「その後に追加された件数 < 現在の保持件数」なら残っている。
+        """
+        if last is None:
+            return None
+        seq, content = last
+        if self._appended.get(self.current_mode, 0) - seq < len(self._current_buffer()):
+            return content
+        return None
+
     def _trim(self, *, phase: Optional[Phase]) -> None:
         """
         phase に応じて保持戦略を切り替える。
@@ -176,6 +219,10 @@ class SessionMemory:
 
         work / review:
             - 直近 2 ターン分のみ保持
+
+        追加の直前に呼び、現在モードのバッファの maxlen を合わせておく
+        （超過分は append 時に deque が古い方から捨てる）。
+        maxlen が変わったときだけ、直近 max_messages 件で作り直す。
         """
 
         buffer = self._current_buffer()
@@ -185,9 +232,8 @@ class SessionMemory:
         else:
             max_messages = self.max_turns * 2
 
-        if len(buffer) > max_messages:
-            overflow = len(buffer) - max_messages
-            self.buffers[self.current_mode] = buffer[overflow:]
+        if buffer.maxlen != max_messages:
+            self.buffers[self.current_mode] = deque(buffer, maxlen=max_messages)
 
     # =========================
     # デバッグ・管理
@@ -206,10 +252,14 @@ class SessionMemory:
         現在モードのセッションをリセット。
         """
         self.buffers[self.current_mode].clear()
+        self._last_user.pop(self.current_mode, None)
+        self._last_assistant.pop(self.current_mode, None)
 
     def clear_all(self) -> None:
         """
         全モードの履歴を完全にリセット。
         """
         for buf in self.buffers.values():
-            buf.clear()
\ No newline at end of file
+            buf.clear()
+        self._last_user.clear()
+        self._last_assistant.clear()
\ No newline at end of file
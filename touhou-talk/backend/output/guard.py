@@ -24,6 +24,8 @@ from __future__ import annotations
 import re
 from typing import List, Optional
 
+from core._regex import compile_fast
+
 
 class OutputGuard:
     """
@@ -54,6 +56,35 @@ class OutputGuard:
             "システムとして",
         ]
 
+        # -------------------------
+        # 事前コンパイル済みパターン
+        # -------------------------
+        # 定型句は全て1本の選言にまとめ、1回の置換で消す
+        # （各語は単語構成文字だけなので、\b で囲んだ選言でも語ごとの逐次置換と結果は同じ）
+        self._ai_re = re.compile(
+            r"\b(?:" + "|".join(map(re.escape, self.ai_phrases)) + r")\b"
+        )
+        self._ws_re = re.compile(r"[ \t]{2,}")
+
+        # 文末の重複は4種を1本の選言で1回に直す
+        # （です。/ます。の連続直後の「。」は、逐次置換なら続く「。」の畳み込みで
+        #   一緒に消えていたので、ここでまとめて吸収する）
+        self._endings_re = re.compile(
+            r"(?P<desu>(?:です。){2,})。*"
+            r"|(?P<masu>(?:ます。){2,})。*"
+            r"|(?P<deshouka>(?:でしょうか？){2,})"
+            r"|(?P<maru>。{2,})"
+        )
+
+        # prose ガードのどれかが効く可能性がある箇所（1回の search で判定）
+        # ※ 各ガードの条件の上位集合であればよい（誤検出は本処理に回るだけ）
+        # ※ 固定語の選言だけなので compile_fast（\b を使う _ai_re・
+        #   lastgroup を使う _endings_re は標準 re のまま）
+        self._trigger_re = compile_fast(
+            "|".join(map(re.escape, self.ai_phrases))
+            + r"|[ \t]{2}|です。です。|ます。ます。|でしょうか？でしょうか？|。。"
+        )
+
     # =========================
     # public API
     # =========================
@@ -95,6 +126,10 @@ class OutputGuard:
 
         # ここから下は prose（通常会話）のみ
 
+        # 大半の出力はどのガードにも掛からないので、1回の走査で確かめて素通しする
+        if result.count("？") < 3 and self._trigger_re.search(result) is None:
+            return result
+
         # =========================
         # 1. 明確なAI説明臭の除去
         # =========================
@@ -127,16 +162,10 @@ class OutputGuard:
 
         ※ 文構造・段落は保持
         """
-        result = text
-        for phrase in self.ai_phrases:
-            result = re.sub(
-                rf"\b{re.escape(phrase)}\b",
-                "",
-                result,
-            )
+        result = self._ai_re.sub("", text)
 
         # 空白のみ整理（改行は保持）
-        result = re.sub(r"[ \t]{2,}", " ", result)
+        result = self._ws_re.sub(" ", result)
         return result
 
     def _soften_list_expression(self, text: str) -> str:
@@ -153,12 +182,7 @@ class OutputGuard:
 
         ※ 行構造は変更しない
         """
-        result = text
-        result = re.sub(r"(です。){2,}", "です。", result)
-        result = re.sub(r"(ます。){2,}", "ます。", result)
-        result = re.sub(r"(でしょうか？){2,}", "でしょうか？", result)
-        result = re.sub(r"(。){2,}", "。", result)
-        return result
+        return self._endings_re.sub(_replace_ending, text)
 
     def _reduce_excessive_questions(self, text: str) -> str:
         """
@@ -172,4 +196,17 @@ class OutputGuard:
             return text
 
         parts = text.split("？")
-        return "？".join(parts[:-1]) + "？"
\ No newline at end of file
+        return "？".join(parts[:-1]) + "？"
+
+
+# 文末重複の置換先（_endings_re の名前付きグループ → 代表形）
+_ENDING_REPLACEMENTS = {
+    "desu": "です。",
+    "masu": "ます。",
+    "deshouka": "でしょうか？",
+    "maru": "。",
+}
+
+
+def _replace_ending(match: "re.Match[str]") -> str:
+    return _ENDING_REPLACEMENTS[match.lastgroup]
\ No newline at end of file
@@ -27,7 +27,13 @@ pronoun_normalizer.py
 from __future__ import annotations
 
 import re
-from typing import Optional
+from typing import List, Optional, Pattern
+
+from core._regex import compile_fast
+
+
+# よくある一人称候補
+_PRONOUNS = ["私", "自分", "あたい", "俺", "僕"]
 
 
 class PronounNormalizer:
@@ -60,22 +66,57 @@ class PronounNormalizer:
         self.allow_soft_ellipsis = allow_soft_ellipsis
 
         # 観測者・解説者化しやすい表現
-        self._observer_patterns = [
-            r"一般的に言うと",
-            r"〜と言われている",
-            r"〜と考えられている",
-            r"客観的に見ると",
-            r"第三者から見ると",
+        self._observer_patterns: List[Pattern[str]] = [
+            re.compile(p)
+            for p in (
+                r"一般的に言うと",
+                r"〜と言われている",
+                r"〜と考えられている",
+                r"客観的に見ると",
+                r"第三者から見ると",
+            )
         ]
 
         # 自己距離化しやすい表現
-        self._detached_self_patterns = [
-            r"私は.*と思われる",
-            r"私自身としては",
-            r"私という存在は",
-            r"私の立場からすると",
+        # ※ 「私は〜と思われる」は同じ文の中・40字以内に限る
+        #   （.* だと長い出力で最後の「と思われる」まで巻き込み、走査も重くなる）
+        self._detached_self_patterns: List[Pattern[str]] = [
+            re.compile(p)
+            for p in (
+                r"私は[^。\n]{0,40}?と思われる",
+                r"私自身としては",
+                r"私という存在は",
+                r"私の立場からすると",
+            )
         ]
 
+        # 観測者・自己距離化のどれかが現れうるか（1回の search で判定する）
+        # 無ければ 2. 3. の逐次置換はどれも何もしないので丸ごと省ける
+        # ※ 置換自体は逐次のまま（前の置換で次のパターンが当たる場合があるため）
+        # ※ 判定（search）だけなので compile_fast（置換側は標準 re）
+        self._self_reference_re: Pattern[str] = compile_fast(
+            "|".join(
+                f"(?:{p.pattern})"
+                for p in self._observer_patterns + self._detached_self_patterns
+            )
+        )
+
+        # 一人称の揺れ → first_person への置換（文頭・助詞直前のみ：暴走防止）
+        # 候補は1本の選言にまとめて1回で置換する
+        # （置換後の直後は必ず助詞なので、ある候補の置換が別の候補の一致を作ることはない）
+        self._first_person_re: Pattern[str] = re.compile(
+            r"(?<!\w)(?:"
+            + "|".join(p for p in _PRONOUNS if p != first_person)
+            + r")(?=[はがをに、。])"
+        )
+
+        # 1.〜3. のどれかが当たりうるか（1回の search で判定する）
+        # 大半の出力はどれも含まないので、その場合は正規化を丸ごと省く
+        # ※ 一人称の後読み・先読みを含むので標準 re のまま
+        self._probe_re: Pattern[str] = re.compile(
+            f"(?:{self._first_person_re.pattern})|(?:{self._self_reference_re.pattern})"
+        )
+
     # =========================
     # public API
     # =========================
@@ -104,16 +145,20 @@ class PronounNormalizer:
         if not allow_intervention:
             return text
 
+        if self._probe_re.search(text) is None:
+            return text.strip()
+
         result = text
 
         # 1. 一人称のブレを正規化
         result = self._normalize_first_person(result)
 
-        # 2. 観測者的フレーズを除去・弱化
-        result = self._suppress_observer_phrases(result)
+        if self._self_reference_re.search(result) is not None:
+            # 2. 観測者的フレーズを除去・弱化
+            result = self._suppress_observer_phrases(result)
 
-        # 3. 自己距離化表現を抑制
-        result = self._suppress_detached_self(result)
+            # 3. 自己距離化表現を抑制
+            result = self._suppress_detached_self(result)
 
         return result.strip()
 
@@ -129,20 +174,7 @@ class PronounNormalizer:
         - 私 / 自分 / あたい / 俺 などの混在
         """
 
-        # よくある一人称候補
-        pronouns = ["私", "自分", "あたい", "俺", "僕"]
-
-        result = text
-        for p in pronouns:
-            if p != self.first_person:
-                # 文頭・助詞直前のみ置換（暴走防止）
-                result = re.sub(
-                    rf"(?<!\w){p}(?=[はがをに、。])",
-                    self.first_person,
-                    result,
-                )
-
-        return result
+        return self._first_person_re.sub(self.first_person, text)
 
     def _suppress_observer_phrases(self, text: str) -> str:
         """
@@ -151,7 +183,7 @@ class PronounNormalizer:
 
         result = text
         for pattern in self._observer_patterns:
-            result = re.sub(pattern, "", result)
+            result = pattern.sub("", result)
 
         return result
 
@@ -165,6 +197,6 @@ class PronounNormalizer:
 
         result = text
         for pattern in self._detached_self_patterns:
-            result = re.sub(pattern, self.first_person, result)
+            result = pattern.sub(self.first_person, result)
 
         return result
\ No newline at end of file
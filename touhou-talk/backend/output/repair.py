@@ -19,7 +19,18 @@ LLM の応答が「文法的には正しいが、会話としてズレている
 - 意味・判断・結論は変更しない
 """
 
-from typing import List, Optional
+import re
+import sys
+from typing import FrozenSet, Optional, Set, Tuple
+
+
+# 過剰介入語の言い換え先（_soften_support 用・この順に置換する）
+_SOFTEN_MAP = {
+    "今すぐ": "",
+    "必ず": "",
+    "してください": "してみてもいいかもしれません",
+    "しなければ": "できれば",
+}
 
 
 class OutputRepair:
@@ -33,37 +44,62 @@ class OutputRepair:
     - kernel 決定（phase / tone）を最優先する
     """
 
-    def __init__(self):
-        # -------------------------
-        # 過剰介入を示しやすい語句
-        # -------------------------
-        self.over_supportive_markers: List[str] = [
+    # -------------------------
+    # 過剰介入を示しやすい語句
+    # -------------------------
+    OVER_SUPPORTIVE: Tuple[str, ...] = tuple(
+        sys.intern(s)
+        for s in (
             "今すぐ",
             "必ず",
             "まずは",
             "してください",
             "しなければ",
-        ]
-
-        # -------------------------
-        # メタ視点・説明者ズレ
-        # -------------------------
-        self.meta_shift_markers: List[str] = [
+        )
+    )
+
+    # -------------------------
+    # メタ視点・説明者ズレ
+    # -------------------------
+    META_SHIFT: Tuple[str, ...] = tuple(
+        sys.intern(s)
+        for s in (
             "比喩でも",
             "例え話ですが",
             "一般的には",
             "客観的に見ると",
             "言い換えると",
-        ]
-
-        # -------------------------
-        # 会話を勝手に拡張しがちな兆候
-        # -------------------------
-        self.topic_expansion_markers: List[str] = [
+        )
+    )
+
+    # -------------------------
+    # 会話を勝手に拡張しがちな兆候
+    # -------------------------
+    TOPIC_EXPANSION: Tuple[str, ...] = tuple(
+        sys.intern(s)
+        for s in (
             "ちなみに",
             "ところで",
             "そういえば",
-        ]
+        )
+    )
+
+    # -------------------------
+    # 全マーカーの一括検出
+    # -------------------------
+    # ※ server はリクエストごとにインスタンスを作るので、
+    #   派生物（集合・正規表現）もクラス定義時に1回だけ作る
+    _over_supportive: FrozenSet[str] = frozenset(OVER_SUPPORTIVE)
+    _meta_shift: FrozenSet[str] = frozenset(META_SHIFT)
+    _topic_expansion: FrozenSet[str] = frozenset(TOPIC_EXPANSION)
+
+    # 先読み (?=...) で包むので、重なり合うマーカーも全位置で拾える
+    # ※ 先読みを使うので標準 re のまま
+    _marker_re = re.compile(
+        "(?=("
+        + "|".join(map(re.escape, OVER_SUPPORTIVE + META_SHIFT + TOPIC_EXPANSION))
+        + "))"
+    )
 
     # =========================
     # public API
@@ -101,18 +137,26 @@ class OutputRepair:
         if phase in {"work", "review"}:
             return text
 
+        # 全マーカーを1回の走査で拾う（大半の出力はどれも含まないのでここで素通し）
+        hits = self._marker_hits(text)
+        if not hits:
+            return text
+
         repaired = text
 
         # 1. 支援・介入が強すぎないか（relaxed / neutral のみ）
-        if tone != "strict" and self._is_over_supportive(repaired):
+        if tone != "strict" and self._is_over_supportive(hits):
             repaired = self._soften_support(repaired)
+            # 置換で別のマーカーが現れ・消えることがあるので取り直す
+            hits = self._marker_hits(repaired)
 
         # 2. メタ視点へ逸脱していないか
-        if self._has_meta_shift(repaired):
+        if self._has_meta_shift(hits):
             repaired = self._pull_back_to_character(repaired, tone=tone)
+            hits = self._marker_hits(repaired)
 
         # 3. 勝手に話題を広げていないか
-        if self._has_topic_expansion(repaired):
+        if self._has_topic_expansion(hits):
             repaired = self._trim_topic_expansion(repaired)
 
         return repaired
@@ -121,35 +165,38 @@ class OutputRepair:
     # ズレ検知ロジック
     # =========================
 
-    def _is_over_supportive(self, text: str) -> bool:
+    def _marker_hits(self, text: str) -> Set[str]:
+        """
+        text に1回以上現れたマーカー（全カテゴリ）の集合。
+        """
+        return {m.group(1) for m in self._marker_re.finditer(text)}
+
+    def _is_over_supportive(self, hits: Set[str]) -> bool:
         """
         キャラが「支援AI」「助言者」方向へ
         踏み込みすぎていないかを検知。
         """
-        hit_count = 0
-        for marker in self.over_supportive_markers:
-            if marker in text:
-                hit_count += 1
-
-        return hit_count >= 2
+        # 交差集合は作らず、2語見つかった時点で打ち切る
+        over_supportive = self._over_supportive
+        count = 0
+        for m in hits:
+            if m in over_supportive:
+                count += 1
+                if count >= 2:
+                    return True
+        return False
 
-    def _has_meta_shift(self, text: str) -> bool:
+    def _has_meta_shift(self, hits: Set[str]) -> bool:
         """
         説明者・観測者視点への逸脱検知。
         """
-        for marker in self.meta_shift_markers:
-            if marker in text:
-                return True
-        return False
+        return not self._meta_shift.isdisjoint(hits)
 
-    def _has_topic_expansion(self, text: str) -> bool:
+    def _has_topic_expansion(self, hits: Set[str]) -> bool:
         """
         不要な話題拡張の検知。
         """
-        for marker in self.topic_expansion_markers:
-            if marker in text:
-                return True
-        return False
+        return not self._topic_expansion.isdisjoint(hits)
 
     # =========================
     # 修正ロジック
@@ -159,15 +206,16 @@ class OutputRepair:
         """
         介入しすぎた文を距離感のある表現へ戻す。
         """
+        # ※ 置換は語ごとに順番どおり行う（1回の選言 sub にまとめると、
+        #   消した語の前後がつながって新しくできた語が残ってしまう）
         softened = text
+        for old, new in _SOFTEN_MAP.items():
+            softened = softened.replace(old, new)
 
-        softened = softened.replace("今すぐ", "")
-        softened = softened.replace("必ず", "")
-        softened = softened.replace("してください", "してみてもいいかもしれません")
-        softened = softened.replace("しなければ", "できれば")
-
-        softened = softened.lstrip("……")
-        softened = "……" + softened
+        # 先頭の「…」の連続をちょうど「……」に揃える
+        # （既に「……」＋「…」以外で始まっていれば作り直さない）
+        if not softened.startswith("……") or softened.startswith("…", 2):
+            softened = "……" + softened.lstrip("…")
 
         return softened.strip()
 
@@ -177,10 +225,8 @@ class OutputRepair:
         tone が strict の場合は余韻付加をしない。
         """
         repaired = text
-
-        for marker in self.meta_shift_markers:
+        for marker in self.META_SHIFT:
             repaired = repaired.replace(marker, "")
-
         repaired = repaired.strip()
 
         if tone != "strict":
@@ -193,6 +239,6 @@ class OutputRepair:
         話題の横滑りを抑止。
         """
         trimmed = text
-        for marker in self.topic_expansion_markers:
+        for marker in self.TOPIC_EXPANSION:
             trimmed = trimmed.replace(marker, "")
         return trimmed.strip()
\ No newline at end of file
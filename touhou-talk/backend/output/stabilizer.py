@@ -28,6 +28,28 @@ import re
 import math
 
 
+# 連続した疑問符（？？… → ？ に圧縮する）
+_REPEATED_QUESTION_RE = re.compile(r"？{2,}")
+
+# 連続した「……」（2回以上 → 1回に圧縮する）
+# ※ 捕捉は使わないので非捕捉にしておく
+_REPEATED_ELLIPSIS_RE = re.compile(r"(?:……){2,}")
+
+# 長音の伸ばし（ーーー… → ー に圧縮する）
+_LONG_VOWEL_RE = re.compile(r"ー{3,}")
+
+# 既定の抑制開始ターン / 抑制最大ターン
+_DEFAULT_TURN_THRESHOLD = 8
+_DEFAULT_MAX_TURN = 20
+
+# 既定しきい値での抑制圧（i 番目は turn_count = _DEFAULT_TURN_THRESHOLD + i）。
+# OutputStabilizer はリクエストごとに作られるので、表は import 時に一度だけ作る
+_DEFAULT_PRESSURE_LUT = tuple(
+    min(1.0, math.sqrt(i / (_DEFAULT_MAX_TURN - _DEFAULT_TURN_THRESHOLD)))
+    for i in range(_DEFAULT_MAX_TURN - _DEFAULT_TURN_THRESHOLD)
+)
+
+
 class OutputStabilizer:
     """
     出力を「落ち着いた状態」に保つためのスタビライザ。
@@ -42,10 +64,10 @@ class OutputStabilizer:
         # -------------------------
 
         # 会話がこのターン数を超えると抑制を開始
-        self.turn_threshold: int = 8
+        self.turn_threshold: int = _DEFAULT_TURN_THRESHOLD
 
         # 抑制が最大になるターン数
-        self.max_turn: int = 20
+        self.max_turn: int = _DEFAULT_MAX_TURN
 
         # 詩的表現・比喩の減衰率（開始点）
         self.poetic_decay_rate: float = 0.5
@@ -84,11 +106,19 @@ class OutputStabilizer:
         if turn_count < self.turn_threshold:
             return text
 
-        stabilized = text
-
         # ターン数に応じた抑制強度を計算
         pressure = self._calc_pressure(turn_count)
 
+        # どちらの減衰も発動しない圧なら触らない
+        if pressure <= self.poetic_decay_rate and pressure < self.question_decay_rate:
+            return text
+
+        # 対象の記号（…… / ー / ？）が1つも無ければ触らない
+        if "……" not in text and "ー" not in text and "？" not in text:
+            return text
+
+        stabilized = text
+
         # 1. 詩的・比喩的な装飾を抑える（※切らない）
         stabilized = self._decay_poetic_expression(stabilized, pressure)
 
@@ -112,6 +142,16 @@ class OutputStabilizer:
         if turn_count >= self.max_turn:
             return 1.0
 
+        # 既定しきい値のままなら表引き（変えられていたら下の式で計算する）
+        offset = turn_count - self.turn_threshold
+        if (
+            type(offset) is int
+            and 0 <= offset < len(_DEFAULT_PRESSURE_LUT)
+            and self.turn_threshold == _DEFAULT_TURN_THRESHOLD
+            and self.max_turn == _DEFAULT_MAX_TURN
+        ):
+            return _DEFAULT_PRESSURE_LUT[offset]
+
         raw = (turn_count - self.turn_threshold) / (
             self.max_turn - self.turn_threshold
         )
@@ -134,11 +174,15 @@ class OutputStabilizer:
 
         result = text
 
+        # 各置換は、対象の連続が部分文字列として無ければ走査ごと省く
+
         # 「……」が3回以上連続している場合のみ圧縮
-        result = re.sub(r"(……){2,}", "……", result)
+        if "…………" in result:
+            result = _REPEATED_ELLIPSIS_RE.sub("……", result)
 
         # 伸ばし表現の軽減（例: ーーー → ー）
-        result = re.sub(r"(ー){3,}", "ー", result)
+        if "ーーー" in result:
+            result = _LONG_VOWEL_RE.sub("ー", result)
 
         return result
 
@@ -160,8 +204,11 @@ class OutputStabilizer:
             return text.replace("？", "。")
 
         # 中程度：疑問符を1つだけ残す
+        # （連続が無ければ置換走査そのものを省く）
         if pressure >= self.question_decay_rate:
-            return re.sub(r"？{2,}", "？", text)
+            if "？？" not in text:
+                return text
+            return _REPEATED_QUESTION_RE.sub("？", text)
 
         # 軽い抑制：そのまま
         return text
\ No newline at end of file
@@ -14,7 +14,8 @@ builder.py
 を受け取り、LLM に渡す system / user prompt を構築する。
 """
 
-from typing import Dict, List, Optional, Any
+from functools import cached_property, lru_cache
+from typing import Dict, List, Optional, Any, Tuple
 
 # state 側の実装差分に備える
 try:
@@ -25,19 +26,105 @@ except Exception:
 
 from core.intent import IntentResult
 from core.policy import PolicyDecision
-from core.character import (
-    CharacterProfile,
-    CharacterSystem,
-    CharacterPrompt,
-)
+from core.character import CharacterProfile
 
 # ★ 追加：PrimaryMode（enum）
 from core.input_pipeline.detector import PrimaryMode
 
+from memory.marker_scanner import MarkerScanner
+
+# Mood → 雰囲気指示（Mood が無い実装では空）
+# ※ Mood は str Enum（hash・== とも値の文字列と同じ）なので、
+#   state に値の文字列で入っていてもメンバーのキーでそのまま引ける
+_MOOD_LINES: Dict[Any, str] = (
+    {
+        Mood.CALM: "全体のトーンは落ち着いています。",
+        Mood.PLAYFUL: "全体の雰囲気は軽く柔らかいです。",
+        Mood.SERIOUS: "真剣で誠実なトーンを保ちます。",
+        Mood.TENSE: "慎重で刺激を避けた表現を心がけます。",
+    }
+    if Mood is not None
+    else {}
+)
+
 # ==================================================
 # documents 読み込み判定（ユーザー明示トリガー）
 # ==================================================
 
+# 明示的トリガー（最優先）
+_EXPLICIT_TRIGGERS: Tuple[str, ...] = (
+    # 読む
+    "読んで",
+    "読んでほしい",
+    "全文読んで",
+    "内容読んで",
+    "中身読んで",
+    "これ読んで",
+    "この文章読んで",
+
+    # 見る
+    "見て",
+    "見てほしい",
+    "中身見て",
+    "内容見て",
+    "確認して",
+    "チェックして",
+
+    # 解析・分析
+    "解析して",
+    "分析して",
+    "レビューして",
+    "精査して",
+    "評価して",
+
+    # 説明・要約
+    "説明して",
+    "解説して",
+    "要点教えて",
+    "要約して",
+    "まとめて",
+
+    # 判断依頼（※結論は出させないが読むのはOK）
+    "どう思う",
+    "意見聞かせて",
+    "感想教えて",
+)
+
+# 文書参照を強く示す言い回し
+_DOCUMENT_REFERENCE_PHRASES: Tuple[str, ...] = (
+    "このファイル",
+    "この資料",
+    "この文章",
+    "添付の",
+    "添付した",
+    "アップした",
+    "送ったファイル",
+    "さっきの資料",
+)
+
+# 読む・見るなどの要求動詞
+_ACTION_VERBS: Tuple[str, ...] = (
+    "見て",
+    "読んで",
+    "確認",
+    "チェック",
+    "解析",
+    "分析",
+    "説明",
+    "要約",
+)
+
+# 3種の語を1回の走査でまとめて判定する
+# （pyahocorasick があれば Aho–Corasick、無ければグループごとの選言正規表現）
+_DOCUMENT_SCANNER = MarkerScanner(
+    (
+        ("explicit", _EXPLICIT_TRIGGERS),
+        ("reference", _DOCUMENT_REFERENCE_PHRASES),
+        ("action", _ACTION_VERBS),
+    )
+)
+
+
 def should_include_documents(
     *,
     user_input: str,
@@ -55,99 +142,246 @@ def should_include_documents(
     if not user_input:
         return False
 
-    text = user_input.lower()
+    # -------------------------
+    # generation_context 側ヒント（保険）の材料
+    # -------------------------
+    has_documents = False
+    try:
+        if generation_context is not None:
+            meta = getattr(generation_context, "meta", {})
+            has_documents = bool(meta.get("documents_meta"))
+    except Exception:
+        pass
+
+    return _decide_include_documents(user_input, has_documents)
+
+
+@lru_cache(maxsize=1024)
+def _decide_include_documents(user_input: str, has_documents: bool) -> bool:
+    """
+    should_include_documents の本体（入力はこの2つだけで決まるので memo する）。
+
+    再生成・リトライなどで同じ発話が繰り返し判定される場合は走査を省ける。
+    語表を変えた場合はプロセスの再起動が必要。
+    """
+    # ※ 語はすべてかな・漢字（大文字小文字の区別が無い）なので lower() は不要
+    hits = _DOCUMENT_SCANNER.hits(user_input)
 
     # -------------------------
     # 明示的トリガー（最優先）
     # -------------------------
-    explicit_triggers = [
-        # 読む
-        "読んで",
-        "読んでほしい",
-        "全文読んで",
-        "内容読んで",
-        "中身読んで",
-        "これ読んで",
-        "この文章読んで",
-
-        # 見る
-        "見て",
-        "見てほしい",
-        "中身見て",
-        "内容見て",
-        "確認して",
-        "チェックして",
-
-        # 解析・分析
-        "解析して",
-        "分析して",
-        "レビューして",
-        "精査して",
-        "評価して",
-
-        # 説明・要約
-        "説明して",
-        "解説して",
-        "要点教えて",
-        "要約して",
-        "まとめて",
-
-        # 判断依頼（※結論は出させないが読むのはOK）
-        "どう思う",
-        "意見聞かせて",
-        "感想教えて",
-    ]
-
-    if any(t in text for t in explicit_triggers):
+    if "explicit" in hits:
         return True
 
     # -------------------------
     # 文書参照を強く示す言い回し
     # -------------------------
-    document_reference_phrases = [
-        "このファイル",
-        "この資料",
-        "この文章",
-        "添付の",
-        "添付した",
-        "アップした",
-        "送ったファイル",
-        "さっきの資料",
-    ]
-
-    action_verbs = [
-        "見て",
-        "読んで",
-        "確認",
-        "チェック",
-        "解析",
-        "分析",
-        "説明",
-        "要約",
-    ]
-    
-
-
-    if any(r in text for r in document_reference_phrases) and any(
-        v in text for v in action_verbs
-    ):
+    if "reference" in hits and "action" in hits:
         return True
 
     # -------------------------
     # generation_context 側ヒント（保険）
     # -------------------------
-    try:
-        if generation_context is not None:
-            meta = getattr(generation_context, "meta", {})
-            if meta.get("documents_meta"):
-                # 文書が存在し、かつ
-                # ユーザーが何か要求している場合のみ
-                if any(v in text for v in action_verbs):
-                    return True
-    except Exception:
-        pass
+    # 文書が存在し、かつ
+    # ユーザーが何か要求している場合のみ
+    return has_documents and "action" in hits
+
+
+# ==================================================
+# プロンプト定型文（全 build で共有する定数）
+# ==================================================
+
+# 時間軸ごとの制約文
+
+_TEMPORAL_LINES: Dict[str, Tuple[str, ...]] = {
+    "past": (
+        "現在の話題は『過去の出来事』の参照を含みます。",
+        "過去の話題を、現在の出来事として扱い直しません。",
+        "相手が指している『その時』の文脈を保持して応答します。",
+    ),
+    "future": (
+        "現在の話題は『これから・今後』に関する内容です。",
+        "未来の出来事を確定事項として断定しません。",
+        "予定・見通し・可能性として扱います。",
+    ),
+    "if": (
+        "現在の話題は『仮定（if）』を含みます。",
+        "仮定の内容を事実として扱いません。",
+        "条件関係（もし〜なら）を保持したまま応答します。",
+    ),
+    "present": ("話題は『いま』の流れを基準として扱います。",),
+}
+
+_DEFAULT_TEMPORAL_LINES: Tuple[str, ...] = (
+    "時間軸が不明確な場合、相手の言い回しを優先して自然に合わせます。",
+)
+
+# system prompt 末尾（8. 時間軸 + 締めの1行）を軸ごとに組み立て済みの形で持つ
+_TEMPORAL_HEADER = "【時間軸】"
+_CLOSING_LINE = "終始、世界内の話者として自然な対話を維持してください。"
+
+_TEMPORAL_SECTIONS: Dict[str, Tuple[str, ...]] = {
+    axis: (_TEMPORAL_HEADER, *axis_lines, _CLOSING_LINE)
+    for axis, axis_lines in _TEMPORAL_LINES.items()
+}
+
+_DEFAULT_TEMPORAL_SECTION: Tuple[str, ...] = (
+    _TEMPORAL_HEADER,
+    *_DEFAULT_TEMPORAL_LINES,
+    _CLOSING_LINE,
+)
+
+# 会話履歴の role → 表示ラベル（これ以外の role は履歴に載せない）
+_ROLE_LABEL: Dict[str, str] = {
+    "user": "相手",
+    "assistant": "あなた",
+    "ai": "あなた",
+}
+
+# user prompt に添える注記（intent.kind / 時間軸ごと。無いものは何も添えない）
+_INTENT_KIND_NOTES: Dict[str, str] = {
+    "metaphor": "※次の発言は比喩です。",
+    "consultation": "※相手は相談しています。",
+}
+
+_USER_AXIS_NOTES: Dict[str, str] = {
+    "past": "※過去参照の話題です。",
+    "future": "※今後・予定の話題です。",
+    "if": "※仮定（if）の話題です。",
+}
+
+# CharacterSystem が無い場合の世界前提
+_DEFAULT_WORLD_LINES: Tuple[str, ...] = (
+    "この対話は一貫した世界観の内部で行われています。",
+    "話者は世界内の住人として自然に会話します。",
+)
+
+
+@lru_cache(maxsize=16)
+def _conversation_mode_line(conversation_mode: str) -> str:
+    # 会話モードは少数の値しか取らないので、毎ターンの f-string 組み立てを省く
+    return f"【現在の会話モード】{conversation_mode}"
+
+
+def _mode_value(mode: Any) -> Optional[str]:
+    # primary_mode の Enum / str 両対応（それ以外は None）
+    if hasattr(mode, "value"):
+        return mode.value
+    return mode if isinstance(mode, str) else None
+
+
+# ==================================================
+# キャラ由来の system prompt 行（memo）
+# ==================================================
+
+def _character_lines(character: CharacterProfile) -> Tuple[str, ...]:
+    """
+    system prompt の 1〜4（世界前提・話者スタイル・キャラ定義・数値人格）。
+
+    CharacterProfile は毎ターン作り直されるので、id ではなく
+    中身（文字列・数値の tuple）をキーにして組み立て結果を memo する。
+    """
+    # ※ 各属性は getattr で1回ずつ読む（__dict__ をまとめて読んで .get する形は
+    #   計測するとむしろ遅く、property やクラス属性の既定値も取りこぼす）
+    system = character.system
+    prompt = character.prompt
+    return _compose_character_lines(
+        (system.world, system.self_recognition) if system else None,
+        getattr(character, "style_label", None),
+        (
+            tuple(prompt.roleplay) if prompt.roleplay else (),
+            tuple(prompt.persona) if prompt.persona else (),
+            tuple(prompt.speech) if prompt.speech else (),
+            tuple(prompt.constraints) if prompt.constraints else (),
+        )
+        if prompt
+        else None,
+        getattr(character, "distance_bias", 0.5),
+        getattr(character, "intervention_level", 0.5),
+        getattr(character, "initiative", 0.5),
+        getattr(character, "metaphor_preference", 0.0),
+    )
+
+
+@lru_cache(maxsize=64)
+def _compose_character_lines(
+    system: Optional[Tuple[str, str]],
+    style_label: Optional[str],
+    prompt: Optional[Tuple[Tuple[str, ...], ...]],
+    distance: float,
+    intervene: float,
+    initiative: float,
+    metaphor: float,
+) -> Tuple[str, ...]:
+    lines: List[str] = []
+
+    # 1. 世界前提
+    if system is not None:
+        world, self_recognition = system
+        lines.extend(
+            (
+                "この対話は、以下の世界観の内部で行われています。",
+                f"世界観：{world}",
+                "話者はこの世界の住人として自然に振る舞い、"
+                "自分をAI・システム・キャラクターとして説明しません。",
+                self_recognition,
+            )
+        )
+    else:
+        lines.extend(_DEFAULT_WORLD_LINES)
+
+    # 2. 話者スタイル
+    if style_label:
+        lines.append(
+            f"話者は「{style_label}」の雰囲気を参考に話します。"
+        )
+
+    lines.append(
+        "特定の人物になりきる意識は持たず、"
+        "世界内の一人の話者として自然に表現してください。"
+    )
+
+    # 3. キャラ定義 prompt
+    if prompt is not None:
+        roleplay, persona, speech, constraints = prompt
+
+        if roleplay:
+            lines.append("【振る舞い指針】")
+            lines.extend(roleplay)
+
+        if persona:
+            lines.append("【性格・立場】")
+            lines.extend(persona)
+
+        if speech:
+            lines.append("【話し方】")
+            lines.extend(speech)
+
+        if constraints:
+            lines.append("【制約】")
+            lines.extend(constraints)
+
+    # 4. 数値人格
+    if distance < 0.4:
+        lines.append("相手との距離を保ち、踏み込みすぎません。")
+    elif distance > 0.6:
+        lines.append("相手との距離を比較的近く取ります。")
+
+    if intervene < 0.3:
+        lines.append("助言や指示は控えめにします。")
+    elif intervene > 0.6:
+        lines.append("必要に応じて軽い提案を行います。")
+
+    if initiative < 0.4:
+        lines.append("聞き役に回ることが多いです。")
+    elif initiative > 0.6:
+        lines.append("会話の流れを自然に引き取ることがあります。")
+
+    if metaphor > 0.6:
+        lines.append("比喩的な表現を時折用います。")
+
+    return tuple(lines)
 
-    return False
 
 class PromptBuilder:
     """
@@ -179,11 +413,23 @@ class PromptBuilder:
         """
         LLM に渡す system / user prompt を構築する。
         """
+        # 時間軸は1回だけ解決し、system / user の両方で同じものを使う
+        axis = self._resolve_temporal_axis(generation_context)
         return {
-            "system": self._build_system_prompt(generation_context, user_input=user_input,),
-            "user": self._build_user_prompt(user_input, messages),
+            "system": self._build_system_prompt(generation_context, user_input=user_input, axis=axis,),
+            "user": self._build_user_prompt(user_input, messages, axis=axis),
         }
 
+    # ==================================================
+    # internal: character sections
+    # ==================================================
+
+    @cached_property
+    def _static_character_lines(self) -> Tuple[str, ...]:
+        # system prompt の 1〜4 は self.character だけで決まるので builder ごとに1回
+        # （組み立て自体は _character_lines 側で中身をキーに memo 済み）
+        return _character_lines(self.character)
+
     # ==================================================
     # internal: temporal axis
     # ==================================================
@@ -207,221 +453,120 @@ class PromptBuilder:
 
         return "unknown"
 
-    def _build_temporal_constraints_lines(self, axis: str) -> List[str]:
-        if axis == "past":
-            return [
-                "現在の話題は『過去の出来事』の参照を含みます。",
-                "過去の話題を、現在の出来事として扱い直しません。",
-                "相手が指している『その時』の文脈を保持して応答します。",
-            ]
-        if axis == "future":
-            return [
-                "現在の話題は『これから・今後』に関する内容です。",
-                "未来の出来事を確定事項として断定しません。",
-                "予定・見通し・可能性として扱います。",
-            ]
-        if axis == "if":
-            return [
-                "現在の話題は『仮定（if）』を含みます。",
-                "仮定の内容を事実として扱いません。",
-                "条件関係（もし〜なら）を保持したまま応答します。",
-            ]
-        if axis == "present":
-            return ["話題は『いま』の流れを基準として扱います。"]
-
-        return [
-            "時間軸が不明確な場合、相手の言い回しを優先して自然に合わせます。"
-        ]
+    def _build_temporal_constraints_lines(self, axis: str) -> Tuple[str, ...]:
+        # 共有定数をそのまま返す（呼び出し側は extend するだけで変更しない）
+        return _TEMPORAL_LINES.get(axis, _DEFAULT_TEMPORAL_LINES)
+
+    def _build_temporal_section_lines(self, axis: str) -> Tuple[str, ...]:
+        # 見出し・制約文・締めの1行をまとめた共有定数（1回の extend で足りる）
+        return _TEMPORAL_SECTIONS.get(axis, _DEFAULT_TEMPORAL_SECTION)
 
     # ==================================================
     # system prompt
     # ==================================================
 
-    def _build_system_prompt( self, generation_context: Optional[Any], *, user_input: str,) -> str:
-        lines: List[str] = []
-
-        # 1. 世界前提
-        if self.character.system:
-            system: CharacterSystem = self.character.system
-            lines.extend(
-                [
-                    "この対話は、以下の世界観の内部で行われています。",
-                    f"世界観：{system.world}",
-                    "話者はこの世界の住人として自然に振る舞い、"
-                    "自分をAI・システム・キャラクターとして説明しません。",
-                    system.self_recognition,
-                ]
-            )
-        else:
-            lines.extend(
-                [
-                    "この対話は一貫した世界観の内部で行われています。",
-                    "話者は世界内の住人として自然に会話します。",
-                ]
-            )
-
-        # 2. 話者スタイル
-        if getattr(self.character, "style_label", None):
-            lines.append(
-                f"話者は「{self.character.style_label}」の雰囲気を参考に話します。"
-            )
-
-        lines.append(
-            "特定の人物になりきる意識は持たず、"
-            "世界内の一人の話者として自然に表現してください。"
-        )
-
-        # 3. キャラ定義 prompt
-        if self.character.prompt:
-            prompt: CharacterPrompt = self.character.prompt
-
-            if prompt.roleplay:
-                lines.append("【振る舞い指針】")
-                lines.extend(prompt.roleplay)
-
-            if prompt.persona:
-                lines.append("【性格・立場】")
-                lines.extend(prompt.persona)
-
-            if prompt.speech:
-                lines.append("【話し方】")
-                lines.extend(prompt.speech)
-
-            if prompt.constraints:
-                lines.append("【制約】")
-                lines.extend(prompt.constraints)
-
-        # 4. 数値人格
-        if getattr(self.character, "distance_bias", 0.5) < 0.4:
-            lines.append("相手との距離を保ち、踏み込みすぎません。")
-        elif getattr(self.character, "distance_bias", 0.5) > 0.6:
-            lines.append("相手との距離を比較的近く取ります。")
-
-        if getattr(self.character, "intervention_level", 0.5) < 0.3:
-            lines.append("助言や指示は控えめにします。")
-        elif getattr(self.character, "intervention_level", 0.5) > 0.6:
-            lines.append("必要に応じて軽い提案を行います。")
+    def _build_system_prompt( self, generation_context: Optional[Any], *, user_input: str, axis: str,) -> str:
+        # 参照する属性は先に一度だけ読む
+        state = self.state
+        policy = self.policy
 
-        if getattr(self.character, "initiative", 0.5) < 0.4:
-            lines.append("聞き役に回ることが多いです。")
-        elif getattr(self.character, "initiative", 0.5) > 0.6:
-            lines.append("会話の流れを自然に引き取ることがあります。")
-
-        if getattr(self.character, "metaphor_preference", 0.0) > 0.6:
-            lines.append("比喩的な表現を時折用います。")
+        # 1〜4. 世界前提・話者スタイル・キャラ定義・数値人格（キャラだけで決まる）
+        # ※ 行の list + 最後に1回の join のままにする
+        #   （この行数では io.StringIO への逐次 write より join の方が速い）
+        lines: List[str] = list(self._static_character_lines)
 
         # 5. Mood
-        mood = getattr(self.state, "mood", None)
-        if Mood and mood is not None:
-            if mood == Mood.CALM:
-                lines.append("全体のトーンは落ち着いています。")
-            elif mood == Mood.PLAYFUL:
-                lines.append("全体の雰囲気は軽く柔らかいです。")
-            elif mood == Mood.SERIOUS:
-                lines.append("真剣で誠実なトーンを保ちます。")
-            elif mood == Mood.TENSE:
-                lines.append("慎重で刺激を避けた表現を心がけます。")
+        mood_line = _MOOD_LINES.get(getattr(state, "mood", None))
+        if mood_line:
+            lines.append(mood_line)
 
         # 6. Policy
-        if not getattr(self.policy, "allow_explanation", True):
+        if not getattr(policy, "allow_explanation", True):
             lines.append("自分の仕組みや立場について説明しません。")
 
-        if not getattr(self.policy, "allow_advice", True):
+        if not getattr(policy, "allow_advice", True):
             lines.append("助言は行わず、共感を中心に応答します。")
 
-        conversation_mode = getattr(self.policy, "conversation_mode", None)
+        conversation_mode = getattr(policy, "conversation_mode", None)
         if isinstance(conversation_mode, str):
-            lines.append(f"【現在の会話モード】{conversation_mode}")
+            lines.append(_conversation_mode_line(conversation_mode))
 
         # 7. input_pipeline（反映のみ）
+        # ※ 以下 7.〜7.6 は try で丸ごと包まず、getattr の既定値と型の確認で
+        #   欠けた・想定外の入力を読み飛ばす（壊れうるのは外部の文字列化だけ）
+        # primary_mode は 7. の表示と 7.5 の判定の両方で使うので1回だけ読む
+        pm = getattr(generation_context, "primary_mode", None)
+
         if generation_context is not None:
-            try:
-                lines.append("【生成制御ヒント】")
-                pm = getattr(generation_context, "primary_mode", None)
-                pi = getattr(generation_context, "primary_intent", None)
-                tone = getattr(generation_context, "tone", None)
-                detail = getattr(generation_context, "detail_level", None)
-
-                if pm:
-                    lines.append(f"- 応答モード：{pm}")
-                if pi:
-                    lines.append(f"- 主意図：{pi}")
-                if tone:
-                    lines.append(f"- トーン：{tone}")
-                if detail is not None:
-                    lines.append(f"- 詳細度：{detail}")
-            except Exception:
-                pass
+            lines.append("【生成制御ヒント】")
+            pi = getattr(generation_context, "primary_intent", None)
+            tone = getattr(generation_context, "tone", None)
+            detail = getattr(generation_context, "detail_level", None)
+
+            if pm:
+                lines.append(f"- 応答モード：{pm}")
+            if pi:
+                lines.append(f"- 主意図：{pi}")
+            if tone:
+                lines.append(f"- トーン：{tone}")
+            if detail is not None:
+                lines.append(f"- 詳細度：{detail}")
 
         # 7.5 OCR / Vision 情報（analysis モード時のみ）
-        try:
-            ocr = getattr(generation_context, "ocr", None)
-            pm = getattr(generation_context, "primary_mode", None)
-
-            # Enum / str 両対応
-            pm_value = None
-            if hasattr(pm, "value"):
-                pm_value = pm.value
-            elif isinstance(pm, str):
-                pm_value = pm
-
-            if (
-                pm_value == "analysis"
-                and ocr
-                and getattr(ocr, "executed", False)
-                and ocr.texts
-            ):
+        ocr = getattr(generation_context, "ocr", None)
+        ocr_texts = getattr(ocr, "texts", None) if ocr else None
+
+        # 大半のターンは OCR 結果が無いので、モード判定はその後に回す
+        if ocr_texts and getattr(ocr, "executed", False):
+            if _mode_value(pm) == "analysis":
                 lines.append("【画像から読み取れた文字情報】")
                 lines.append(
                     "以下は画像から抽出された文字です。"
                     "OCR結果のため、誤認識が含まれる可能性があります。"
                 )
 
-                for item in ocr.texts:
-                    fname = item.get("filename", "unknown")
-                    text = item.get("text", "")
+                # 1件分（ファイル名行＋本文）を1要素にまとめて一括で足す
+                # （最後は "\n" で join するので結果は2行に分けた場合と同じ）
+                lines.extend(
+                    [
+                        f"（{item.get('filename', 'unknown')}）\n{text}"
+                        for item in ocr_texts
+                        if isinstance(item, dict) and (text := item.get("text", ""))
+                    ]
+                )
+
+        # 7.6 documents meta（明示要求がある場合のみ）
+        meta = getattr(generation_context, "meta", None)
+        documents_meta = meta.get("documents_meta") if isinstance(meta, dict) else None
+
+        if documents_meta and should_include_documents(
+            user_input=user_input,
+            generation_context=generation_context,
+        ):
+            lines.append("【添付文書の内容】")
+            lines.append(
+                "以下はユーザーが明示的に要求したため提示される文書内容です。"
+                "解釈・評価・結論付けは行わず、事実として扱ってください。"
+            )
+
+            for item in documents_meta:
+                doc = item.get("document_meta") if isinstance(item, dict) else None
+                if not doc:
+                    continue
+
+                # ★ 正式APIで文字列化（executor 側の実装次第で失敗しうるのはここだけ）
+                fragment = getattr(doc, "to_prompt_fragment", None)
+                if callable(fragment):
+                    try:
+                        text = fragment()
+                    except Exception:
+                        continue
                     if text:
-                        lines.append(f"（{fname}）")
                         lines.append(text)
-        except Exception:
-            pass
-        
-        # 7.6 documents meta（明示要求がある場合のみ）
-        try:
-            if should_include_documents(
-                user_input=user_input,
-                generation_context=generation_context,
-            ):
-                meta = getattr(generation_context, "meta", {})
-                documents_meta = meta.get("documents_meta")
-
-                if documents_meta:
-                    lines.append("【添付文書の内容】")
-                    lines.append(
-                        "以下はユーザーが明示的に要求したため提示される文書内容です。"
-                        "解釈・評価・結論付けは行わず、事実として扱ってください。"
-                    )
-
-                    for item in documents_meta:
-                        doc = item.get("document_meta")
-                        if not doc:
-                            continue
-
-                        # ★ 正式APIで文字列化
-                        fragment = getattr(doc, "to_prompt_fragment", None)
-                        if callable(fragment):
-                            text = fragment()
-                            if text:
-                                lines.append(text)
-        except Exception:
-            pass
 
         # 8. Temporal Axis
-        axis = self._resolve_temporal_axis(generation_context)
-        lines.append("【時間軸】")
-        lines.extend(self._build_temporal_constraints_lines(axis))
-
-        lines.append("終始、世界内の話者として自然な対話を維持してください。")
+        # （締めの1行も含めて軸ごとの定数を1回で足す）
+        lines.extend(self._build_temporal_section_lines(axis))
 
         return "\n".join(lines)
 
@@ -433,6 +578,8 @@ class PromptBuilder:
         self,
         user_input: str,
         messages: List[Dict[str, str]],
+        *,
+        axis: str,
     ) -> str:
         lines: List[str] = []
 
@@ -443,34 +590,25 @@ class PromptBuilder:
 
         if messages:
             lines.append("【これまでの会話】")
-            for msg in messages:
-                role = msg.get("role")
-                content = msg.get("content")
-                if not role or not content:
-                    continue
-
-                if role == "user":
-                    label = "相手"
-                elif role in {"assistant", "ai"}:
-                    label = "あなた"
-                else:
-                    continue
-
-                lines.append(f"{label}: {content}")
-
-        if self.intent.kind == "metaphor":
-            lines.append("※次の発言は比喩です。")
+            # ※ 1件1行の f-string + 最後に1回の join のままにする
+            #   （部品ごとの "".join や io.StringIO より速いことを確認済み）
+            lines.extend(
+                [
+                    f"{label}: {content}"
+                    for msg in messages
+                    if (label := _ROLE_LABEL.get(msg.get("role")))
+                    and (content := msg.get("content"))
+                ]
+            )
 
-        if self.intent.kind == "consultation":
-            lines.append("※相手は相談しています。")
+        # 注記は比較の連鎖ではなく表引きで決める
+        kind_note = _INTENT_KIND_NOTES.get(self.intent.kind)
+        if kind_note:
+            lines.append(kind_note)
 
-        axis = self._resolve_temporal_axis(None)
-        if axis == "past":
-            lines.append("※過去参照の話題です。")
-        elif axis == "future":
-            lines.append("※今後・予定の話題です。")
-        elif axis == "if":
-            lines.append("※仮定（if）の話題です。")
+        axis_note = _USER_AXIS_NOTES.get(axis)
+        if axis_note:
+            lines.append(axis_note)
 
         lines.append(user_input)
 
@@ -20,10 +20,56 @@ group_decision.py
 
 from __future__ import annotations
 
-from typing import Dict
+from functools import lru_cache
+from typing import Dict, Tuple
+
 from core.group_state import GroupState
 
 
+# ==================================================
+# 不変部分（参加者が同じなら毎ターン同じ文字列になる）
+# ==================================================
+
+@lru_cache(maxsize=32)
+def _participants_text(participants: Tuple[str, ...]) -> str:
+    return ", ".join(participants)
+
+
+@lru_cache(maxsize=32)
+def _decision_system_prompt(participants_text: str) -> str:
+    """
+    判断用 system prompt（参加者一覧だけを差し込む定型文）。
+    """
+    return (
+        "You are a STRICT decision engine for a group conversation.\n"
+        "Your ONLY task is to decide which participants should speak next.\n"
+        "\n"
+        "IMPORTANT RULES:\n"
+        "- You MUST output JSON ONLY.\n"
+        "- You MUST NOT include explanations or natural language.\n"
+        "- You MUST choose speakers ONLY from the provided participant list.\n"
+        "- You MUST NOT invent narrators, guides, observers, or unnamed entities.\n"
+        "- If the user does not clearly address anyone, choose AT MOST ONE speaker.\n"
+        "- If no one should respond, return an empty list.\n"
+        "- The user is a participant but MUST NOT be selected as a speaker.\n"
+        "\n"
+        "Decision guidelines:\n"
+        "- Short acknowledgements or agreement usually continue the previous speaker.\n"
+        "- Simple agreement (e.g. \"I see\", \"That makes sense\") should NOT switch speakers.\n"
+        "- Do NOT switch speakers unless there is a clear conversational reason.\n"
+        "- If a character just expressed a mood, opinion, or atmosphere, they are the default responder.\n"
+        "- Silence should be chosen ONLY if responding would feel unnatural in conversation.\n"
+        "\n"
+        "Allowed speakers:\n"
+        f"{participants_text}\n"
+        "\n"
+        "Output format:\n"
+        "{\n"
+        '  \"speakers\": [\"character_id\"]\n'
+        "}\n"
+    )
+
+
 # ==================================================
 # Prompt Builder
 # ==================================================
@@ -51,51 +97,22 @@ def build_group_decision_prompt(
     participants = group_state.participants
     recent_turns = group_state.recent_turns[-3:]  # 直近のみ
 
-    participants_text = ", ".join(participants)
+    participants_text = _participants_text(tuple(participants))
 
-    recent_lines: list[str] = []
-    for turn in recent_turns:
-        for utt in turn.utterances:
-            recent_lines.append(f"{utt.speaker_id}: {utt.content}")
-
-    recent_block = (
-        "\n".join(recent_lines)
-        if recent_lines
-        else "(no recent utterances)"
-    )
+    # 空なら join が "" になるので、そのまま既定文言に落とす
+    recent_block = "\n".join(
+        [
+            f"{utt.speaker_id}: {utt.content}"
+            for turn in recent_turns
+            for utt in turn.utterances
+        ]
+    ) or "(no recent utterances)"
 
     # -------------------------
     # system prompt
     # -------------------------
 
-    system_prompt = (
-        "You are a STRICT decision engine for a group conversation.\n"
-        "Your ONLY task is to decide which participants should speak next.\n"
-        "\n"
-        "IMPORTANT RULES:\n"
-        "- You MUST output JSON ONLY.\n"
-        "- You MUST NOT include explanations or natural language.\n"
-        "- You MUST choose speakers ONLY from the provided participant list.\n"
-        "- You MUST NOT invent narrators, guides, observers, or unnamed entities.\n"
-        "- If the user does not clearly address anyone, choose AT MOST ONE speaker.\n"
-        "- If no one should respond, return an empty list.\n"
-        "- The user is a participant but MUST NOT be selected as a speaker.\n"
-        "\n"
-        "Decision guidelines:\n"
-        "- Short acknowledgements or agreement usually continue the previous speaker.\n"
-        "- Simple agreement (e.g. \"I see\", \"That makes sense\") should NOT switch speakers.\n"
-        "- Do NOT switch speakers unless there is a clear conversational reason.\n"
-        "- If a character just expressed a mood, opinion, or atmosphere, they are the default responder.\n"
-        "- Silence should be chosen ONLY if responding would feel unnatural in conversation.\n"
-        "\n"
-        "Allowed speakers:\n"
-        f"{participants_text}\n"
-        "\n"
-        "Output format:\n"
-        "{\n"
-        '  \"speakers\": [\"character_id\"]\n'
-        "}\n"
-    )
+    system_prompt = _decision_system_prompt(participants_text)
 
     # -------------------------
     # user prompt
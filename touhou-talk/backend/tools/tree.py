@@ -1,22 +1,39 @@
 import os
+import sys
 
 EXCLUDE_DIRS = {"__pycache__", ".git", ".venv", "venv", ".vscode", ".idea"}
 EXCLUDE_FILES = {".pyc"}
+EXCLUDE_FILE_EXTS = tuple(EXCLUDE_FILES)
 
 def should_exclude(name):
-    if name in EXCLUDE_DIRS:
-        return True
-    return any(name.endswith(ext) for ext in EXCLUDE_FILES)
+    return name in EXCLUDE_DIRS or name.endswith(EXCLUDE_FILE_EXTS)
+
+def list_entries(path):
+    # scandir の DirEntry は名前と種別を持っているので、エントリごとの stat が要らない
+    with os.scandir(path) as it:
+        return sorted(
+            (e for e in it if not should_exclude(e.name)), key=lambda e: e.name
+        )
 
 def build_tree(path, prefix=""):
-    entries = sorted(e for e in os.listdir(path) if not should_exclude(e))
-    for i, entry in enumerate(entries):
-        connector = "└── " if i == len(entries) - 1 else "├── "
-        print(prefix + connector + entry)
-        full = os.path.join(path, entry)
-        if os.path.isdir(full):
-            extension = "    " if i == len(entries) - 1 else "│   "
-            build_tree(full, prefix + extension)
+    # 再帰せず (エントリ列, prefix, 次の添字) のスタックで深さ優先に辿る
+    # 出力は溜めておき、最後に1回だけ書き出す
+    out = []
+    stack = [(list_entries(path), prefix, 0)]
+    while stack:
+        entries, prefix, i = stack.pop()
+        if i >= len(entries):
+            continue
+        stack.append((entries, prefix, i + 1))
+
+        entry = entries[i]
+        is_last = i == len(entries) - 1
+        connector = "└── " if is_last else "├── "
+        out.append(prefix + connector + entry.name + "\n")
+        if entry.is_dir():
+            extension = "    " if is_last else "│   "
+            stack.append((list_entries(entry.path), prefix + extension, 0))
+    sys.stdout.write("".join(out))
 
 if __name__ == "__main__":
     build_tree(".")